@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# generated by tools/build_calendar_index.py, do not edit
+
+WORKALENDAR_VERSION = "17.0.0"
+# country alpha2: (workalendar module, calendar class, weekend days (0 is monday))
+CALENDARS = {
+    "AO": ("workalendar.africa.angola", "Angola", (5, 6)),
+    "AR": ("workalendar.america.argentina", "Argentina", (5, 6)),
+    "AT": ("workalendar.europe.austria", "Austria", (5, 6)),
+    "AU": ("workalendar.oceania.australia", "Australia", (5, 6)),
+    "BB": ("workalendar.america.barbados", "Barbados", (5, 6)),
+    "BE": ("workalendar.europe.belgium", "Belgium", (5, 6)),
+    "BG": ("workalendar.europe.bulgaria", "Bulgaria", (5, 6)),
+    "BJ": ("workalendar.africa.benin", "Benin", (5, 6)),
+    "BR": ("workalendar.america.brazil", "Brazil", (5, 6)),
+    "BY": ("workalendar.europe.belarus", "Belarus", (5, 6)),
+    "CA": ("workalendar.america.canada", "Canada", (5, 6)),
+    "CH": ("workalendar.europe.switzerland", "Switzerland", (5, 6)),
+    "CI": ("workalendar.africa.ivory_coast", "IvoryCoast", (5, 6)),
+    "CL": ("workalendar.america.chile", "Chile", (5, 6)),
+    "CN": ("workalendar.asia.china", "China", (5, 6)),
+    "CO": ("workalendar.america.colombia", "Colombia", (5, 6)),
+    "CY": ("workalendar.europe.cyprus", "Cyprus", (5, 6)),
+    "CZ": ("workalendar.europe.czech_republic", "CzechRepublic", (5, 6)),
+    "DE": ("workalendar.europe.germany", "Germany", (5, 6)),
+    "DK": ("workalendar.europe.denmark", "Denmark", (5, 6)),
+    "DZ": ("workalendar.africa.algeria", "Algeria", (4, 5)),
+    "EE": ("workalendar.europe.estonia", "Estonia", (5, 6)),
+    "ES": ("workalendar.europe.spain", "Spain", (5, 6)),
+    "FI": ("workalendar.europe.finland", "Finland", (5, 6)),
+    "FR": ("workalendar.europe.france", "France", (5, 6)),
+    "GB": ("workalendar.europe.united_kingdom", "UnitedKingdom", (5, 6)),
+    "GE": ("workalendar.europe.georgia", "Georgia", (5, 6)),
+    "GG": ("workalendar.europe.guernsey", "Guernsey", (5, 6)),
+    "GR": ("workalendar.europe.greece", "Greece", (5, 6)),
+    "HK": ("workalendar.asia.hong_kong", "HongKong", (6,)),
+    "HR": ("workalendar.europe.croatia", "Croatia", (5, 6)),
+    "HU": ("workalendar.europe.hungary", "Hungary", (5, 6)),
+    "IE": ("workalendar.europe.ireland", "Ireland", (5, 6)),
+    "IL": ("workalendar.asia.israel", "Israel", (4, 5)),
+    "IS": ("workalendar.europe.iceland", "Iceland", (5, 6)),
+    "IT": ("workalendar.europe.italy", "Italy", (5, 6)),
+    "JP": ("workalendar.asia.japan", "Japan", (5, 6)),
+    "KE": ("workalendar.africa.kenya", "Kenya", (5, 6)),
+    "KR": ("workalendar.asia.south_korea", "SouthKorea", (5, 6)),
+    "KY": ("workalendar.europe.cayman_islands", "CaymanIslands", (5, 6)),
+    "KZ": ("workalendar.asia.kazakhstan", "Kazakhstan", (5, 6)),
+    "LT": ("workalendar.europe.lithuania", "Lithuania", (5, 6)),
+    "LU": ("workalendar.europe.luxembourg", "Luxembourg", (5, 6)),
+    "LV": ("workalendar.europe.latvia", "Latvia", (5, 6)),
+    "MC": ("workalendar.europe.monaco", "Monaco", (5, 6)),
+    "MG": ("workalendar.africa.madagascar", "Madagascar", (5, 6)),
+    "MH": ("workalendar.oceania.marshall_islands", "MarshallIslands", (5, 6)),
+    "MT": ("workalendar.europe.malta", "Malta", (5, 6)),
+    "MX": ("workalendar.america.mexico", "Mexico", (5, 6)),
+    "MY": ("workalendar.asia.malaysia", "Malaysia", (5, 6)),
+    "MZ": ("workalendar.africa.mozambique", "Mozambique", (5, 6)),
+    "NG": ("workalendar.africa.nigeria", "Nigeria", (5, 6)),
+    "NL": ("workalendar.europe.netherlands", "Netherlands", (5, 6)),
+    "NO": ("workalendar.europe.norway", "Norway", (5, 6)),
+    "NZ": ("workalendar.oceania.new_zealand", "NewZealand", (5, 6)),
+    "PA": ("workalendar.america.panama", "Panama", (5, 6)),
+    "PH": ("workalendar.asia.philippines", "Philippines", (5, 6)),
+    "PL": ("workalendar.europe.poland", "Poland", (5, 6)),
+    "PT": ("workalendar.europe.portugal", "Portugal", (5, 6)),
+    "PY": ("workalendar.america.paraguay", "Paraguay", (5, 6)),
+    "QA": ("workalendar.asia.qatar", "Qatar", (4, 5)),
+    "RO": ("workalendar.europe.romania", "Romania", (5, 6)),
+    "RS": ("workalendar.europe.serbia", "Serbia", (5, 6)),
+    "RU": ("workalendar.europe.russia", "Russia", (5, 6)),
+    "SE": ("workalendar.europe.sweden", "Sweden", (5, 6)),
+    "SG": ("workalendar.asia.singapore", "Singapore", (5, 6)),
+    "SI": ("workalendar.europe.slovenia", "Slovenia", (5, 6)),
+    "SK": ("workalendar.europe.slovakia", "Slovakia", (5, 6)),
+    "ST": ("workalendar.africa.sao_tome", "SaoTomeAndPrincipe", (5, 6)),
+    "SV": ("workalendar.america.el_salvador", "ElSalvador", (5, 6)),
+    "TN": ("workalendar.africa.tunisia", "Tunisia", (5, 6)),
+    "TR": ("workalendar.europe.turkey", "Turkey", (5, 6)),
+    "TW": ("workalendar.asia.taiwan", "Taiwan", (5, 6)),
+    "UA": ("workalendar.europe.ukraine", "Ukraine", (5, 6)),
+    "US": ("workalendar.usa.core", "UnitedStates", (5, 6)),
+    "ZA": ("workalendar.africa.south_africa", "SouthAfrica", (5, 6)),
+}
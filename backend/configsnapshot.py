@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from .frozendict import freeze
+
+
+class ConfigSnapshot:
+    """
+    Immutable versioned copy of module configuration
+
+    Snapshot is replaced (never updated) after each successful config write, so it can be
+    read without lock and its values shared without being copied.
+    """
+
+    __slots__ = ("version", "config")
+
+    def __init__(self, version, config):
+        """
+        Constructor
+
+        Args:
+            version (int): snapshot version, incremented after each config write
+            config (dict): module configuration
+        """
+        self.version = version
+        self.config = freeze(config)
+
+    def get(self, field, default=None):
+        """
+        Return config field value
+
+        Args:
+            field (str): field name
+            default (any, optional): value returned if field does not exist
+
+        Returns:
+            any: read-only field value
+        """
+        return self.config.get(field, default)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import heapq
+import logging
+import itertools
+import threading
+
+
+class EventScheduler:
+    """
+    One-shot events scheduler
+
+    Events are stored in a priority queue ordered by their absolute timestamp and a single
+    timer is armed for the earliest event, so pending events cost nothing until they are due.
+
+    Events overdue when timer fires (late timer, device suspended) are fired once, unless they
+    are overdue for more than max_lateness seconds (system time changed) and droppable. Names
+    of dropped events are given to dropped callback so they can be scheduled again.
+    """
+
+    def __init__(
+        self,
+        timer_factory,
+        max_lateness=3600.0,
+        max_delay=300.0,
+        clock=None,
+        dropped_callback=None,
+    ):
+        """
+        Constructor
+
+        Args:
+            timer_factory (function): function returning a timer (with start and cancel methods)
+                                      from delay and callback parameters
+            max_lateness (float, optional): overdue events older than this delay (in seconds)
+                                            are dropped. Defaults to 1 hour
+            max_delay (float, optional): max timer delay (in seconds). Timer is re-armed after
+                                         this delay so system time changes are taken into
+                                         account. Defaults to 5 minutes
+            clock (function, optional): function returning current timestamp. Defaults to
+                                        time.time
+            dropped_callback (function, optional): function called with list of dropped
+                                                   events names
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_lateness = max_lateness
+        self.max_delay = max_delay
+        self.__timer_factory = timer_factory
+        self.__clock = clock
+        self.__dropped_callback = dropped_callback
+        self.__heap = []
+        self.__events = {}
+        self.__counter = itertools.count()
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+    def schedule(self, name, timestamp, callback, droppable=True):
+        """
+        Schedule event. Event with same name already scheduled is replaced.
+
+        Args:
+            name (str): event name
+            timestamp (float): event timestamp
+            callback (function): function called (without parameter) when event is due
+            droppable (bool, optional): False to fire event even if it is overdue for more
+                                        than max_lateness. Defaults to True
+        """
+        with self.__lock:
+            self.__remove(name)
+            entry = [timestamp, next(self.__counter), name, callback, droppable]
+            self.__events[name] = entry
+            heapq.heappush(self.__heap, entry)
+            self.__arm()
+
+    def cancel(self, name):
+        """
+        Cancel event
+
+        Args:
+            name (str): event name
+
+        Returns:
+            bool: True if event was scheduled
+        """
+        with self.__lock:
+            removed = self.__remove(name)
+            self.__arm()
+            return removed
+
+    def get_events(self):
+        """
+        Return scheduled events
+
+        Returns:
+            dict: scheduled events timestamps by event name
+        """
+        with self.__lock:
+            return {name: entry[0] for name, entry in self.__events.items()}
+
+    def run_pending(self):
+        """
+        Fire due events and arm timer for next event
+        """
+        now = self.__now()
+        due_entries = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= now:
+                entry = heapq.heappop(self.__heap)
+                if entry[2] is None:
+                    # cancelled event
+                    continue
+                del self.__events[entry[2]]
+                due_entries.append(entry)
+            self.__arm()
+
+        dropped = []
+        for timestamp, _, name, callback, droppable in due_entries:
+            if droppable and now - timestamp > self.max_lateness:
+                self.logger.info(
+                    'Event "%s" dropped, overdue for %ss', name, int(now - timestamp)
+                )
+                dropped.append(name)
+                continue
+            try:
+                callback()
+            except Exception:
+                self.logger.exception('Error occured during event "%s"', name)
+
+        if dropped and self.__dropped_callback:
+            try:
+                self.__dropped_callback(dropped)
+            except Exception:
+                self.logger.exception("Error occured during dropped events callback")
+
+    def stop(self):
+        """
+        Cancel timer and all events
+        """
+        with self.__lock:
+            if self.__timer:
+                self.__timer.cancel()
+                self.__timer = None
+            self.__heap = []
+            self.__events = {}
+
+    def __now(self):
+        """
+        Return current timestamp
+        """
+        return self.__clock() if self.__clock else time.time()
+
+    def __remove(self, name):
+        """
+        Mark event as cancelled (lock must be acquired). Entry is popped from queue later.
+
+        Args:
+            name (str): event name
+
+        Returns:
+            bool: True if event was scheduled
+        """
+        entry = self.__events.pop(name, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        entry[3] = None
+        return True
+
+    def __arm(self):
+        """
+        Arm timer for earliest event (lock must be acquired)
+        """
+        if self.__timer:
+            self.__timer.cancel()
+            self.__timer = None
+
+        while self.__heap and self.__heap[0][2] is None:
+            heapq.heappop(self.__heap)
+        if not self.__heap:
+            return
+
+        delay = min(max(self.__heap[0][0] - self.__now(), 0.0), self.max_delay)
+        self.__timer = self.__timer_factory(delay, self.run_pending)
+        self.__timer.start()
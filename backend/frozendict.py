@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict
+
+    It can be shared between consumers without being copied: copy and deepcopy return
+    the instance itself. As a dict subclass it is still json serializable.
+    """
+
+    __slots__ = ()
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is read-only")
+
+    __setitem__ = __readonly
+    __delitem__ = __readonly
+    __ior__ = __readonly
+    clear = __readonly
+    pop = __readonly
+    popitem = __readonly
+    setdefault = __readonly
+    update = __readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict.__repr__(self)})"
+
+
+def freeze(value):
+    """
+    Return read-only deep copy of specified value
+
+    Dicts are converted to FrozenDict and lists to tuples, recursively.
+
+    Args:
+        value (any): value to freeze
+
+    Returns:
+        any: read-only value
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import mmap
+import struct
+import threading
+
+
+class GeoIndex:
+    """
+    Precomputed geographic grid index
+
+    World is split in square tiles of RESOLUTION degrees. Each tile stores the timezone and
+    the country found at this position, so both values are resolved with a single memory
+    read, without loading timezonefinder and reverse_geocode (and numpy/scipy).
+
+    Tiles crossing a timezone or a country border are flagged and must be resolved with
+    original libraries (polygon search).
+
+    File format (little endian)::
+
+        header: magic (4s), version (H), resolution (f), cols (H), rows (H),
+                timezones count (H), countries count (H)
+        timezones: for each timezone, name length (B) + utf8 name
+        countries: for each country, alpha2 (2s) + name length (B) + utf8 name
+        padding to 4 bytes
+        cells: rows*cols cells of timezone index (H) + country index (H)
+
+    Unknown timezone or country is stored as UNKNOWN index, border flag is the highest bit
+    of country index.
+
+    File is built with tools/build_geoindex.py script.
+    """
+
+    MAGIC = b"CGIX"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHfHHHH")
+    CELL = struct.Struct("<HH")
+    UNKNOWN_TIMEZONE = 0xFFFF
+    UNKNOWN_COUNTRY = 0x7FFF
+    BORDER_FLAG = 0x8000
+
+    def __init__(self, path):
+        """
+        Constructor
+
+        Args:
+            path (str): index file path
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__file = None
+        self.__data = None
+        self.__resolution = None
+        self.__cols = 0
+        self.__rows = 0
+        self.__cells_offset = 0
+        self.__timezones = []
+        self.__countries = []
+
+    def is_loaded(self):
+        """
+        Return True if index is loaded
+
+        Returns:
+            bool: True if index is loaded
+        """
+        return self.__data is not None
+
+    def load(self):
+        """
+        Map index file in memory. Data is only read from file when accessed.
+
+        Returns:
+            bool: True if index is loaded, False if file does not exist
+
+        Raises:
+            ValueError: if file is invalid
+        """
+        with self.__lock:
+            if self.__data is not None:
+                return True
+            if not os.path.exists(self.path):
+                return False
+
+            index_file = open(self.path, "rb")  # pylint: disable=consider-using-with
+            try:
+                data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.__parse(data)
+            except Exception:
+                index_file.close()
+                raise
+
+            self.__file = index_file
+            self.__data = data
+            return True
+
+    def close(self):
+        """
+        Unmap index file
+        """
+        with self.__lock:
+            if self.__data is not None:
+                self.__data.close()
+                self.__data = None
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def __parse(self, data):
+        """
+        Parse index header and string tables
+
+        Args:
+            data (mmap): index data
+        """
+        (
+            magic,
+            version,
+            resolution,
+            cols,
+            rows,
+            timezones_count,
+            countries_count,
+        ) = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f'Invalid geo index file "{self.path}"')
+
+        offset = self.HEADER.size
+        timezones = []
+        for _ in range(timezones_count):
+            length = data[offset]
+            timezones.append(data[offset + 1 : offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+
+        countries = []
+        for _ in range(countries_count):
+            alpha2 = data[offset : offset + 2].decode("ascii")
+            length = data[offset + 2]
+            name = data[offset + 3 : offset + 3 + length].decode("utf-8")
+            countries.append({"country": name, "alpha2": alpha2})
+            offset += 3 + length
+        offset += -offset % 4
+
+        if len(data) < offset + cols * rows * self.CELL.size:
+            raise ValueError(f'Truncated geo index file "{self.path}"')
+
+        self.__resolution = resolution
+        self.__cols = cols
+        self.__rows = rows
+        self.__cells_offset = offset
+        self.__timezones = timezones
+        self.__countries = countries
+
+    def lookup(self, latitude, longitude):
+        """
+        Return timezone and country at specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            dict: position infos or None if index is not available or if position is out of
+                  range (latitude not in [-90, 90] or longitude not in [-180, 180])::
+
+                {
+                    timezone (str): timezone name or None if unknown
+                    country (dict): country infos ({country, alpha2}) or None if unknown
+                    border (bool): True if position is on a border tile, in this case
+                                   values must be checked with polygon search
+                }
+
+        """
+        if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+            return None
+        if self.__data is None and not self.load():
+            return None
+
+        # clamp to last tile for positions on south pole and antimeridian
+        row = min(max(int((90.0 - latitude) / self.__resolution), 0), self.__rows - 1)
+        col = min(max(int((longitude + 180.0) / self.__resolution), 0), self.__cols - 1)
+        timezone_index, country_index = self.CELL.unpack_from(
+            self.__data,
+            self.__cells_offset + (row * self.__cols + col) * self.CELL.size,
+        )
+
+        border = bool(country_index & self.BORDER_FLAG)
+        country_index &= ~self.BORDER_FLAG
+        return {
+            "timezone": None
+            if timezone_index == self.UNKNOWN_TIMEZONE
+            else self.__timezones[timezone_index],
+            "country": None
+            if country_index == self.UNKNOWN_COUNTRY
+            else dict(self.__countries[country_index]),
+            "border": border,
+        }
+
+    @classmethod
+    def write(cls, path, resolution, timezones, countries, cells):
+        """
+        Write index file
+
+        Args:
+            path (str): index file path
+            resolution (float): tile size in degrees
+            timezones (list): list of timezone names
+            countries (list): list of (alpha2, country name) tuples
+            cells (list): flat list of (timezone index, country index, border) tuples, row by
+                          row starting from north-west corner
+        """
+        cols = int(round(360.0 / resolution))
+        rows = int(round(180.0 / resolution))
+        if len(cells) != cols * rows:
+            raise ValueError(f"Invalid cells count {len(cells)} (expected {cols * rows})")
+
+        data = bytearray(
+            cls.HEADER.pack(
+                cls.MAGIC,
+                cls.VERSION,
+                resolution,
+                cols,
+                rows,
+                len(timezones),
+                len(countries),
+            )
+        )
+        data += cls.__pack_names(timezones, countries)
+        data += bytes(-len(data) % 4)
+
+        for timezone_index, country_index, border in cells:
+            timezone_index = (
+                cls.UNKNOWN_TIMEZONE if timezone_index is None else timezone_index
+            )
+            country_index = (
+                cls.UNKNOWN_COUNTRY if country_index is None else country_index
+            )
+            if border:
+                country_index |= cls.BORDER_FLAG
+            data += cls.CELL.pack(timezone_index, country_index)
+
+        with open(path, "wb") as index_file:
+            index_file.write(data)
+
+    @staticmethod
+    def __pack_names(timezones, countries):
+        """
+        Pack timezones and countries names
+
+        Args:
+            timezones (list): list of timezone names
+            countries (list): list of (alpha2, country name) tuples
+
+        Returns:
+            bytes: packed names
+        """
+        data = b""
+        for timezone_name in timezones:
+            encoded = timezone_name.encode("utf-8")
+            data += struct.pack("<B", len(encoded)) + encoded
+        for alpha2, name in countries:
+            encoded = name.encode("utf-8")
+            data += alpha2.encode("ascii") + struct.pack("<B", len(encoded)) + encoded
+        return data
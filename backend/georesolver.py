@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import logging
+import threading
+from .lazyimport import LazyImport
+
+# heavy dependencies (numpy and scipy are pulled by reverse_geocode and timezonefinder)
+# are imported on first use to keep module import fast
+reverse_geocode = LazyImport("reverse_geocode")
+TimezoneFinder = LazyImport("timezonefinder", "TimezoneFinder")  # pylint: disable=invalid-name
+
+
+class GeoResolver:
+    """
+    Resolve timezone and country of positions
+
+    Positions are resolved using in order resolution cache, precomputed geo index and
+    finally timezonefinder polygons and reverse geocoding (slow).
+
+    Timezonefinder holds a lot of data, so it is only built when needed and released after
+    idle_timeout seconds of inactivity.
+    """
+
+    # closest timezone search (offshore positions): max search radius (in degrees) and
+    # default time allowed to search (in seconds)
+    CLOSEST_TIMEZONE_MAX_DELTA = 10
+    CLOSEST_TIMEZONE_TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        timer_factory,
+        geoindex,
+        resolution_cache,
+        idle_timeout=300.0,
+        in_memory=False,
+    ):
+        """
+        Constructor
+
+        Args:
+            timer_factory (function): function returning a timer (with start and cancel methods)
+                                      from delay and callback parameters
+            geoindex (GeoIndex): precomputed timezone and country grid index
+            resolution_cache (ResolutionCache): cache of resolved positions
+            idle_timeout (float, optional): delay (in seconds) before releasing unused
+                                            timezonefinder. Defaults to 5 minutes
+            in_memory (bool, optional): load all timezonefinder data in memory. Defaults
+                                        to False
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.geoindex = geoindex
+        self.resolution_cache = resolution_cache
+        self.idle_timeout = idle_timeout
+        self.in_memory = in_memory
+        self.__timer_factory = timer_factory
+        self.__timezonefinder = None
+        self.__timezonefinder_timer = None
+        self.__timezonefinder_lock = threading.Lock()
+
+    def resolve_timezone(self, position, timeout=None):
+        """
+        Resolve timezone at specified position
+
+        Args:
+            position (dict): position to resolve
+            timeout (float, optional): closest timezone search timeout (see search_timezone)
+
+        Returns:
+            str: timezone name or None if not found
+        """
+        latitude, longitude = position["latitude"], position["longitude"]
+        cached = self.resolution_cache.get(latitude, longitude)
+        if cached and cached.get("timezone"):
+            self.logger.debug("Timezone found in cache: %s", cached["timezone"])
+            return cached["timezone"]
+
+        indexed = self.lookup_geoindex(position)
+        if indexed and indexed["timezone"]:
+            current_timezone = indexed["timezone"]
+        else:
+            current_timezone = self.search_timezone(position, timeout)
+
+        if current_timezone:
+            self.resolution_cache.update(latitude, longitude, timezone=current_timezone)
+        return current_timezone
+
+    def resolve_country(self, position):
+        """
+        Resolve country at specified position
+
+        Args:
+            position (dict): position to resolve
+
+        Returns:
+            dict: country infos::
+
+                {
+                    country (str): country label (None if not found)
+                    alpha2 (str): country code (None if not found)
+                }
+
+        """
+        latitude, longitude = position["latitude"], position["longitude"]
+        cached = self.resolution_cache.get(latitude, longitude)
+        if cached and cached.get("country"):
+            self.logger.debug("Country found in cache: %s", cached["country"])
+            return cached["country"]
+
+        country = {"country": None, "alpha2": None}
+        indexed = self.lookup_geoindex(position)
+        if indexed and indexed["country"]:
+            country = indexed["country"]
+        else:
+            # search country
+            coordinates = ((latitude, longitude),)
+            # need a tuple
+            geo = reverse_geocode.search(coordinates)
+            self.logger.debug("Found country infos from position %s: %s", position, geo)
+            if geo and len(geo) > 0 and "country_code" in geo[0] and "country" in geo[0]:
+                country["alpha2"] = geo[0]["country_code"]
+                country["country"] = geo[0]["country"]
+
+        if country["alpha2"]:
+            self.resolution_cache.update(latitude, longitude, country=country)
+        return country
+
+    def resolve_positions(self, positions):
+        """
+        Resolve timezone and country of many positions at once
+
+        Nothing is cached. Countries are searched with a single reverse geocoding call and
+        timezones with a single timezonefinder instance. Closest timezone searches of all
+        offshore positions share CLOSEST_TIMEZONE_TIMEOUT.
+
+        Args:
+            positions (list): list of positions ({latitude, longitude})
+
+        Returns:
+            list: resolved positions in same order::
+
+                [
+                    {
+                        latitude (float),
+                        longitude (float),
+                        timezone (str): timezone name or None if not found,
+                        country (dict): country infos ({country, alpha2}),
+                    },
+                    ...
+                ]
+
+        """
+        results = []
+        for position in positions:
+            cached = self.resolution_cache.get(position["latitude"], position["longitude"]) or {}
+            indexed = self.lookup_geoindex(position) or {}
+            results.append(
+                {
+                    "latitude": position["latitude"],
+                    "longitude": position["longitude"],
+                    "timezone": cached.get("timezone") or indexed.get("timezone"),
+                    "country": cached.get("country")
+                    or indexed.get("country")
+                    or {"country": None, "alpha2": None},
+                }
+            )
+
+        self.__search_countries([result for result in results if not result["country"]["alpha2"]])
+        self.__search_timezones([result for result in results if not result["timezone"]])
+
+        return results
+
+    def __search_countries(self, results):
+        """
+        Search countries of specified positions with a single reverse geocoding call
+
+        Args:
+            results (list): list of resolve_positions results to fill
+        """
+        if not results:
+            return
+
+        try:
+            coordinates = tuple(
+                (result["latitude"], result["longitude"]) for result in results
+            )
+            geos = reverse_geocode.search(coordinates)
+            for result, geo in zip(results, geos):
+                if geo and "country_code" in geo and "country" in geo:
+                    result["country"] = {
+                        "country": geo["country"],
+                        "alpha2": geo["country_code"],
+                    }
+        except Exception:
+            self.logger.exception("Unable to search countries of positions")
+
+    def __search_timezones(self, results):
+        """
+        Search timezones of specified positions with a single timezonefinder instance
+
+        Args:
+            results (list): list of resolve_positions results to fill
+        """
+        if not results:
+            return
+
+        deadline = time.monotonic() + self.CLOSEST_TIMEZONE_TIMEOUT
+        try:
+            timezonefinder = self.get_timezonefinder()
+            for result in results:
+                try:
+                    result["timezone"] = timezonefinder.timezone_at(
+                        lat=result["latitude"], lng=result["longitude"]
+                    )
+                    if result["timezone"] is None:
+                        result["timezone"], _ = self.search_closest_timezone(
+                            timezonefinder,
+                            result,
+                            max(deadline - time.monotonic(), 0.0),
+                        )
+                except ValueError:
+                    self.logger.warning(
+                        "Coordinates out of bounds: %s, %s",
+                        result["latitude"],
+                        result["longitude"],
+                    )
+        except Exception:
+            self.logger.exception("Error occured searching timezones of positions")
+        finally:
+            self.__schedule_timezonefinder_release()
+
+    def search_timezone(self, position, timeout=None):
+        """
+        Search timezone at specified position using timezonefinder polygons
+
+        Args:
+            position (dict): position to search timezone at
+            timeout (float, optional): maximum time (in seconds) allowed to search closest
+                                       timezone when no timezone is found at position.
+                                       Defaults to CLOSEST_TIMEZONE_TIMEOUT
+
+        Returns:
+            str: timezone name or None if not found
+        """
+        try:
+            # try to find timezone at position
+            timezonefinder = self.get_timezonefinder()
+            current_timezone = timezonefinder.timezone_at(
+                lat=position["latitude"], lng=position["longitude"]
+            )
+            if current_timezone is None:
+                # extend search to closest position
+                current_timezone, delta_degree = self.search_closest_timezone(
+                    timezonefinder,
+                    position,
+                    self.CLOSEST_TIMEZONE_TIMEOUT if timeout is None else timeout,
+                )
+                self.logger.debug(
+                    "Closest timezone search returned %s (searched %s degrees around)",
+                    current_timezone,
+                    delta_degree,
+                )
+            return current_timezone
+        except ValueError:
+            # the coordinates were out of bounds
+            self.logger.exception("Coordinates out of bounds")
+        except Exception:
+            self.logger.exception("Error occured searching timezone at position")
+        finally:
+            self.__schedule_timezonefinder_release()
+
+        return None
+
+    def search_closest_timezone(self, timezonefinder, position, timeout):
+        """
+        Search closest timezone widening search radius degree by degree until a timezone is
+        found, CLOSEST_TIMEZONE_MAX_DELTA is reached or next step would exceed timeout.
+
+        Searched area (and so CPU cost) grows with square of radius, next step duration is
+        estimated from previous one.
+
+        Args:
+            timezonefinder (TimezoneFinder): timezonefinder instance
+            position (dict): position to search timezone around
+            timeout (float): time allowed to search (in seconds)
+
+        Returns:
+            tuple: search result::
+
+                (
+                    timezone (str): closest timezone name or None if not found,
+                    delta_degree (int): searched radius in degrees (0 if nothing searched),
+                )
+
+        """
+        deadline = time.monotonic() + timeout
+        searched_delta = 0
+        step_duration = 0.0
+        for delta_degree in range(1, self.CLOSEST_TIMEZONE_MAX_DELTA + 1):
+            step_start = time.monotonic()
+            if searched_delta:
+                estimated_duration = (
+                    step_duration * (delta_degree / searched_delta) ** 2
+                )
+                if step_start + estimated_duration > deadline:
+                    self.logger.debug(
+                        "Stop closest timezone search at %s degrees (deadline reached)",
+                        searched_delta,
+                    )
+                    break
+
+            current_timezone = timezonefinder.closest_timezone_at(
+                lat=position["latitude"],
+                lng=position["longitude"],
+                delta_degree=delta_degree,
+            )
+            step_duration = time.monotonic() - step_start
+            searched_delta = delta_degree
+            if current_timezone:
+                return current_timezone, searched_delta
+
+        return None, searched_delta
+
+    def lookup_geoindex(self, position):
+        """
+        Search position in precomputed geo index
+
+        Args:
+            position (dict): position to search
+
+        Returns:
+            dict: geo index result (see GeoIndex.lookup) or None if index is not available
+                  or if position is on a border tile (polygon search is needed)
+        """
+        try:
+            indexed = self.geoindex.lookup(position["latitude"], position["longitude"])
+        except Exception:
+            self.logger.exception("Unable to search position in geo index")
+            return None
+
+        self.logger.debug("Geo index result for position %s: %s", position, indexed)
+        if not indexed or indexed["border"]:
+            return None
+        return indexed
+
+    def get_timezonefinder(self):
+        """
+        Return timezonefinder instance, building it if necessary
+
+        Returns:
+            TimezoneFinder: timezonefinder instance
+        """
+        with self.__timezonefinder_lock:
+            if self.__timezonefinder_timer:
+                self.__timezonefinder_timer.cancel()
+                self.__timezonefinder_timer = None
+
+            if self.__timezonefinder is None:
+                self.logger.debug("Load timezonefinder (in_memory=%s)", self.in_memory)
+                self.__timezonefinder = TimezoneFinder(in_memory=self.in_memory)
+
+            return self.__timezonefinder
+
+    def __schedule_timezonefinder_release(self):
+        """
+        Schedule timezonefinder release after idle timeout
+        """
+        with self.__timezonefinder_lock:
+            if self.__timezonefinder is None:
+                return
+            if self.__timezonefinder_timer:
+                self.__timezonefinder_timer.cancel()
+            self.__timezonefinder_timer = self.__timer_factory(
+                self.idle_timeout, self.release_timezonefinder
+            )
+            self.__timezonefinder_timer.start()
+
+    def release_timezonefinder(self):
+        """
+        Release timezonefinder instance to free memory
+        """
+        with self.__timezonefinder_lock:
+            if self.__timezonefinder_timer:
+                self.__timezonefinder_timer.cancel()
+                self.__timezonefinder_timer = None
+
+            if self.__timezonefinder is not None:
+                self.logger.debug("Release timezonefinder")
+                self.__timezonefinder = None
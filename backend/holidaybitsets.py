@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import logging
+import struct
+import datetime
+import threading
+
+
+class HolidayBitsets:
+    """
+    Persistent holidays of a year stored as bitsets, per country and year
+
+    Each year is stored as a 366 bits integer. Bit N is set if day N+1 of year (1st january
+    is bit 0) is a holiday, so checking a day is a memory lookup.
+
+    File format (little endian)::
+
+        header: magic (4s), version (H), entries count (H)
+        entries: for each entry, alpha2 (2s) + year (H) + bitset (46s)
+
+    """
+
+    MAGIC = b"CHBS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHH")
+    ENTRY = struct.Struct("<2sH46s")
+    BITSET_SIZE = 46
+
+    def __init__(self, cleep_filesystem, path):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            path (str): file path
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.path = path
+        self.__bitsets = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__bitsets)
+
+    def __contains__(self, key):
+        return key in self.__bitsets
+
+    @staticmethod
+    def build(days):
+        """
+        Build bitset of specified days
+
+        Args:
+            days (iterable): dates of the same year
+
+        Returns:
+            int: bitset
+        """
+        bitset = 0
+        for day in days:
+            bitset |= 1 << (day.timetuple().tm_yday - 1)
+        return bitset
+
+    @staticmethod
+    def is_set(bitset, day):
+        """
+        Check if specified day is set in bitset
+
+        Args:
+            bitset (int): bitset of day year
+            day (date): date
+
+        Returns:
+            bool: True if day is set
+        """
+        return bool(bitset >> (day.timetuple().tm_yday - 1) & 1)
+
+    @staticmethod
+    def build_weekdays(year, weekdays):
+        """
+        Build bitset of all days of specified year falling on specified weekdays
+
+        Args:
+            year (int): year
+            weekdays (list): weekdays (0 is monday)
+
+        Returns:
+            int: bitset
+        """
+        first_weekday = datetime.date(year, 1, 1).weekday()
+        bitset = 0
+        for weekday in weekdays:
+            first_index = (weekday - first_weekday) % 7
+            for index in range(first_index, HolidayBitsets.get_year_size(year), 7):
+                bitset |= 1 << index
+        return bitset
+
+    @staticmethod
+    def get_year_size(year):
+        """
+        Return number of days of specified year
+
+        Args:
+            year (int): year
+
+        Returns:
+            int: 365 or 366
+        """
+        return datetime.date(year, 12, 31).timetuple().tm_yday
+
+    def get(self, alpha2, year):
+        """
+        Return bitset of specified country and year
+
+        Args:
+            alpha2 (str): country code
+            year (int): year
+
+        Returns:
+            int: bitset or None if not stored
+        """
+        return self.__bitsets.get((alpha2, year))
+
+    def set(self, alpha2, year, bitset):
+        """
+        Store bitset of specified country and year (in memory, see save)
+
+        Args:
+            alpha2 (str): country code
+            year (int): year
+            bitset (int): bitset
+
+        Returns:
+            bool: True if stored bitsets changed
+        """
+        with self.__lock:
+            if self.__bitsets.get((alpha2, year)) == bitset:
+                return False
+            self.__bitsets[(alpha2, year)] = bitset
+            return True
+
+    def retain(self, alpha2, years):
+        """
+        Remove bitsets of other countries or years
+
+        Args:
+            alpha2 (str): country code to keep
+            years (list): years to keep
+
+        Returns:
+            bool: True if stored bitsets changed
+        """
+        with self.__lock:
+            keys = [
+                key
+                for key in self.__bitsets
+                if key[0] != alpha2 or key[1] not in years
+            ]
+            for key in keys:
+                del self.__bitsets[key]
+            return len(keys) > 0
+
+    def load(self):
+        """
+        Load bitsets from file. Invalid content is ignored.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        fd = None
+        try:
+            fd = self.cleep_filesystem.open(self.path, "rb")
+            data = fd.read()
+            magic, version, count = self.HEADER.unpack_from(data, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                self.logger.debug('Ignore invalid holidays file "%s"', self.path)
+                return
+
+            bitsets = {}
+            for index in range(count):
+                alpha2, year, bitset = self.ENTRY.unpack_from(
+                    data, self.HEADER.size + index * self.ENTRY.size
+                )
+                bitsets[(alpha2.decode("ascii"), year)] = int.from_bytes(
+                    bitset, "little"
+                )
+        except Exception:
+            self.logger.exception('Unable to read holidays file "%s"', self.path)
+            return
+        finally:
+            if fd is not None:
+                self.cleep_filesystem.close(fd)
+
+        with self.__lock:
+            self.__bitsets = bitsets
+        self.logger.debug("%s holidays bitsets loaded", len(bitsets))
+
+    def save(self):
+        """
+        Save bitsets to file
+
+        File is written to a temporary file then moved so it is never partially written.
+        Whole save is serialized with bitsets updates, so concurrent saves can't interleave.
+
+        Returns:
+            bool: True if bitsets saved successfully
+        """
+        with self.__lock:
+            entries = sorted(self.__bitsets.items())
+            data = bytearray(self.HEADER.pack(self.MAGIC, self.VERSION, len(entries)))
+            for (alpha2, year), bitset in entries:
+                data += self.ENTRY.pack(
+                    alpha2.encode("ascii"),
+                    year,
+                    bitset.to_bytes(self.BITSET_SIZE, "little"),
+                )
+
+            path_tmp = f"{self.path}.tmp"
+            fd = None
+            try:
+                fd = self.cleep_filesystem.open(path_tmp, "wb")
+                fd.write(bytes(data))
+                fd.flush()
+                self.cleep_filesystem.close(fd)
+                fd = None
+                if not self.cleep_filesystem.move(path_tmp, self.path):
+                    self.logger.error('Unable to move holidays file to "%s"', self.path)
+                    return False
+                return True
+            except Exception:
+                self.logger.exception('Unable to write holidays file "%s"', self.path)
+                return False
+            finally:
+                if fd is not None:
+                    self.cleep_filesystem.close(fd)
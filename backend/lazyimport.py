@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import importlib
+import threading
+
+
+class LazyImport:
+    """
+    Proxy that imports a module (or one of its attributes) on first use
+
+    Heavy libraries (numpy, scipy through reverse_geocode or timezonefinder) are only
+    needed by a few commands, so their import cost is delayed until really needed
+    instead of being paid at each Cleep boot.
+
+    Usage::
+
+        requests = LazyImport("requests")
+        TimezoneFinder = LazyImport("timezonefinder", "TimezoneFinder")
+
+        requests.post(...)      # imports requests module
+        TimezoneFinder()        # imports timezonefinder and instanciates class
+    """
+
+    def __init__(self, module_name, attribute_name=None):
+        """
+        Constructor
+
+        Args:
+            module_name (str): full name of module to import
+            attribute_name (str, optional): module attribute to return instead of module itself
+        """
+        self.__module_name = module_name
+        self.__attribute_name = attribute_name
+        self.__target = None
+        self.__lock = threading.Lock()
+
+    def is_loaded(self):
+        """
+        Return True if target was already imported
+
+        Returns:
+            bool: True if import was already performed
+        """
+        return self.__target is not None
+
+    def load(self):
+        """
+        Import target (only once)
+
+        Returns:
+            any: imported module or module attribute
+
+        Raises:
+            ImportError: if module cannot be imported
+            AttributeError: if attribute does not exist in module
+        """
+        if self.__target is None:
+            with self.__lock:
+                if self.__target is None:
+                    target = importlib.import_module(self.__module_name)
+                    if self.__attribute_name:
+                        target = getattr(target, self.__attribute_name)
+                    self.__target = target
+
+        return self.__target
+
+    def __getattr__(self, name):
+        if name.startswith("_LazyImport__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self.__module_name
+        if self.__attribute_name:
+            name = f"{name}.{self.__attribute_name}"
+        return f"<LazyImport {name} loaded={self.is_loaded()}>"
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """
+    Thread safe bounded cache evicting least recently used entries
+    """
+
+    def __init__(self, max_size):
+        """
+        Constructor
+
+        Args:
+            max_size (int): maximum number of entries
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be greater than 0")
+        self.max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        """
+        Return cached value and mark it as recently used
+
+        Args:
+            key (any): entry key
+            default (any, optional): value returned if key is not cached
+
+        Returns:
+            any: cached value or default value
+        """
+        with self.__lock:
+            if key not in self.__entries:
+                return default
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+    def set(self, key, value):
+        """
+        Cache value, evicting least recently used entry if cache is full
+
+        Args:
+            key (any): entry key
+            value (any): value to cache
+        """
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Remove entry from cache
+
+        Args:
+            key (any): entry key
+            default (any, optional): value returned if key is not cached
+
+        Returns:
+            any: removed value or default value
+        """
+        with self.__lock:
+            return self.__entries.pop(key, default)
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def items(self):
+        """
+        Return cached entries from least to most recently used
+
+        Returns:
+            list: list of (key, value) tuples
+        """
+        with self.__lock:
+            return list(self.__entries.items())
@@ -2,30 +2,44 @@
 # -*- coding: utf-8 -*-
 import os
 import time
-import copy
-import importlib
 import re
 import datetime
-import requests
-import reverse_geocode
-from timezonefinder import TimezoneFinder
-from pytz import utc, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pytz import timezone
 from tzlocal import get_localzone
-from pycountry_convert import (
-    country_alpha2_to_continent_code,
-    convert_continent_code_to_continent_name,
-)
 from cleep.core import CleepModule
-from cleep.exception import CommandError, InvalidParameter, MissingParameter
+from cleep.exception import CommandError, InvalidParameter
 from cleep.libs.configs.hostname import Hostname
-from cleep.libs.internals.sun import Sun
 from cleep.libs.internals.console import Console
 from cleep.libs.configs.cleepconf import CleepConf
+from .lazyimport import LazyImport
+from .geoindex import GeoIndex
+from .georesolver import GeoResolver
+from .resolutioncache import ResolutionCache
+from .systemtimezone import SystemTimezone
+from .timestampcheckpoint import TimestampCheckpoint, TimestampFile
+from .eventscheduler import EventScheduler
+from .timesubscriptions import TimeSubscriptions
+from .timeticker import TimeTicker
+from .lrucache import LruCache
+from .holidaybitsets import HolidayBitsets
+from .workingdays import WorkingDays
+from .positionjobs import PositionJobs
+from .configsnapshot import ConfigSnapshot
+from .suntimes import SunTimes
+from .solar import SOLAR_EVENTS_NAMES
+from .timemixin import TimeMixin
+from .sunmixin import SunMixin
+from .positionmixin import PositionMixin
+from .workingdaysmixin import WorkingDaysMixin
+
+requests = LazyImport("requests")
 
 __all__ = ["Parameters"]
 
 
-class Parameters(CleepModule):
+class Parameters(TimeMixin, SunMixin, PositionMixin, WorkingDaysMixin, CleepModule):
     """
     Parameters application.
 
@@ -73,10 +87,64 @@ class Parameters(CleepModule):
         "timestamp": 0,
     }
 
+    # config fields read by module getters from in-memory config snapshot (read-only values),
+    # other fields are read from config as usual
+    CONFIG_SNAPSHOT_FIELDS = ("position", "country", "timezone", "timestamp")
     SYSTEM_ZONEINFO_DIR = "/usr/share/zoneinfo/"
     SYSTEM_LOCALTIME = "/etc/localtime"
     SYSTEM_TIMEZONE = "/etc/timezone"
     SET_DATE_CMD = "date +%s -s @%(timestamp)s"
+    # delay (in seconds) before releasing unused timezonefinder data
+    TIMEZONEFINDER_IDLE_TIMEOUT = 300.0
+    # load all timezonefinder data in memory (faster but uses much more memory)
+    # instead of reading it from files when needed
+    TIMEZONEFINDER_IN_MEMORY = False
+    # precomputed timezone and country grid index (built with tools/build_geoindex.py)
+    GEOINDEX_FILE = os.path.join(os.path.dirname(__file__), "geoindex.bin")
+    # cache of resolved positions (precision in degrees, ~1km)
+    RESOLUTION_CACHE_FILE = "parameters.resolutions.json"
+    RESOLUTION_CACHE_PRECISION = 0.01
+    RESOLUTION_CACHE_SIZE = 100
+    # allowed time events resolutions (in seconds). 60 seconds resolution is served by
+    # parameters.time.now event, others by parameters.time.tick event
+    TIME_EVENTS_RESOLUTIONS = [1, 10, 60]
+    # resolution always subscribed (clock device, time formatters and UI rely on
+    # parameters.time.now event). Set to None to send time events only on demand
+    TIME_EVENTS_DEFAULT_RESOLUTION = 60
+    # lease (in seconds) of time events subscriptions: subscriber must renew its
+    # subscription before, otherwise it is dropped (subscriber may have stopped)
+    TIME_SUBSCRIPTION_LEASE = 300.0
+    # number of yearly sun tables kept in memory and max days returned by get_sun_times
+    SUN_TABLES_CACHE_SIZE = 3
+    SUN_TIMES_MAX_DAYS = 366
+    # max number of timestamps handled by get_solar_position (a week at 1 minute resolution)
+    SOLAR_POSITION_MAX_SAMPLES = 10080
+    # number of yearly holidays calendars (per country and year) kept in memory
+    HOLIDAYS_CACHE_SIZE = 4
+    # holidays of current and next years are precomputed in background (with lowest
+    # priority) and stored as bitsets in this file
+    HOLIDAY_BITSETS_FILE = "parameters.holidays"
+    HOLIDAYS_JOB_NICENESS = 19
+    # max number of days checked by bulk non working days commands
+    NON_WORKING_DAYS_MAX_DAYS = 366
+    # weekend days (0 is monday) of countries without calendar
+    DEFAULT_WEEKEND_DAYS = (5, 6)
+    # max number of days (range or working days) handled by working days commands
+    WORKING_DAYS_MAX_DAYS = 3660
+    # scheduled events (sunrise, sunset...) overdue for more than this delay (in seconds) are
+    # not fired (system time changed)
+    EVENTS_MAX_LATENESS = 3600.0
+    # local time (hour, minute) of daily sun times refresh
+    SUN_REFRESH_TIME = (0, 5)
+    # last known timestamp (used to restore time when NTP fails) is saved every interval
+    # seconds (and at stop) in a small file instead of main config file. Set file to None
+    # to save it in config file
+    TIMESTAMP_CHECKPOINT_INTERVAL = 900.0
+    TIMESTAMP_CHECKPOINT_FILE = "parameters.timestamp"
+    # stages of set_position jobs (see get_position_job command)
+    POSITION_JOB_STAGES = ["resolve", "timezone", "country", "sun", "time"]
+    # max number of positions resolved by resolve_positions command
+    RESOLVE_POSITIONS_MAX = 1000
 
     def __init__(self, bootstrap, debug_enabled):
         """
@@ -86,20 +154,81 @@ class Parameters(CleepModule):
             bootstrap (dict): bootstrap objects
             debug_enabled (bool): flag to set debug level to logger
         """
+        # config snapshot (config can be accessed during module init)
+        self.__config_snapshot = None
+        self.__config_lock = threading.RLock()
+
         # init
         CleepModule.__init__(self, bootstrap, debug_enabled)
+        TimeMixin.__init__(self)
+        SunMixin.__init__(self)
 
         # members
         self.hostname = Hostname(self.cleep_filesystem)
-        self.sun = Sun()
-        self.sunset = None
-        self.sunrise = None
-        self.suns = {"sunset": 0, "sunset_iso": "", "sunrise": 0, "sunrise_iso": ""}
-        self.timezonefinder = TimezoneFinder()
+        self.sun_tables = LruCache(self.SUN_TABLES_CACHE_SIZE)
+        self.solar = SunTimes(self.sun_tables)
+        self.holidays_cache = LruCache(self.HOLIDAYS_CACHE_SIZE)
+        self.working_days_cache = LruCache(self.HOLIDAYS_CACHE_SIZE)
+        self.holiday_bitsets = HolidayBitsets(
+            self.cleep_filesystem,
+            os.path.join(self.CONFIG_DIR, self.HOLIDAY_BITSETS_FILE),
+        )
+        self.working_days = WorkingDays(
+            self._get_country_code,
+            self.holiday_bitsets,
+            self.holidays_cache,
+            self.working_days_cache,
+            default_weekend_days=self.DEFAULT_WEEKEND_DAYS,
+        )
+        self.resolution_cache = ResolutionCache(
+            self.cleep_filesystem,
+            os.path.join(self.CONFIG_DIR, self.RESOLUTION_CACHE_FILE),
+            precision=self.RESOLUTION_CACHE_PRECISION,
+            max_size=self.RESOLUTION_CACHE_SIZE,
+        )
+        self.geo_resolver = GeoResolver(
+            self.__create_timer,
+            GeoIndex(self.GEOINDEX_FILE),
+            self.resolution_cache,
+            idle_timeout=self.TIMEZONEFINDER_IDLE_TIMEOUT,
+            in_memory=self.TIMEZONEFINDER_IN_MEMORY,
+        )
+        self.system_timezone = SystemTimezone(
+            self.cleep_filesystem,
+            self.SYSTEM_ZONEINFO_DIR,
+            self.SYSTEM_LOCALTIME,
+            self.SYSTEM_TIMEZONE,
+        )
         self.timezone_name = None
         self.timezone = None
-        self.time_task = None
-        self.__clock_uuid = None
+        self.time_subscriptions = TimeSubscriptions()
+        if self.TIME_EVENTS_DEFAULT_RESOLUTION:
+            self.time_subscriptions.add(self.TIME_EVENTS_DEFAULT_RESOLUTION)
+        self.time_ticker = TimeTicker(
+            self.__create_timer,
+            self.time_subscriptions,
+            self.__run_minute_task,
+            self._send_time_tick,
+            # sun events are scheduled again after clock jump
+            clock_jump_callback=lambda jump: self.set_sun(),
+        )
+        self.event_scheduler = EventScheduler(
+            self.__create_timer,
+            max_lateness=self.EVENTS_MAX_LATENESS,
+            dropped_callback=self._on_events_dropped,
+        )
+        self.timestamp_file = (
+            TimestampFile(
+                self.cleep_filesystem,
+                os.path.join(self.CONFIG_DIR, self.TIMESTAMP_CHECKPOINT_FILE),
+            )
+            if self.TIMESTAMP_CHECKPOINT_FILE
+            else None
+        )
+        self.timestamp_checkpoint = TimestampCheckpoint(
+            self.__save_timestamp, self.TIMESTAMP_CHECKPOINT_INTERVAL
+        )
+        self._clock_uuid = None
         self.cleep_conf = CleepConf(self.cleep_filesystem)
         # code from https://stackoverflow.com/a/106223
         self.__hostname_pattern = (
@@ -107,24 +236,67 @@ class Parameters(CleepModule):
             r"([A-Za-z0-9]|[A-Za-z0-9][A-Za-z0-9\-]*[A-Za-z0-9])$"
         )
         self.rpc_url = bootstrap.get("rpc_config", {}).get("url")
+        self.position_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="parameters-position"
+        )
+        self.resolution_executor = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="parameters-resolution"
+        )
+        self.holidays_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="parameters-holidays",
+            initializer=self._lower_thread_priority,
+        )
+        self.position_jobs = PositionJobs(
+            self.position_executor,
+            self._run_position_pipeline,
+            self.POSITION_JOB_STAGES,
+            progress_callback=lambda progress: self.position_progress_event.send(
+                params=progress
+            ),
+            update_callback=lambda job: self.position_update_event.send(params=job),
+        )
+        self.__skipped_updates = {"timezone": 0, "country": 0, "hostname": 0}
+        self.__skipped_updates_lock = threading.Lock()
 
         # events
         self.time_now_event = self._get_event("parameters.time.now")
         self.time_sunrise_event = self._get_event("parameters.time.sunrise")
         self.time_sunset_event = self._get_event("parameters.time.sunset")
+        self.time_solar_events = {
+            name: self._get_event(f"parameters.time.{name.replace('_', '')}")
+            for name in SOLAR_EVENTS_NAMES
+            if name not in ("sunrise", "sunset")
+        }
+        self.time_solar_events.update(
+            {"sunrise": self.time_sunrise_event, "sunset": self.time_sunset_event}
+        )
+        self.time_tick_event = self._get_event("parameters.time.tick")
+        self.time_offsetchanged_event = self._get_event(
+            "parameters.time.offsetchanged"
+        )
         self.hostname_update_event = self._get_event("parameters.hostname.update")
         self.country_update_event = self._get_event("parameters.country.update")
+        self.position_progress_event = self._get_event("parameters.position.progress")
+        self.position_update_event = self._get_event("parameters.position.update")
 
     def _configure(self):
         """
         Configure module
         """
+        # config is fully loaded now
+        self.__refresh_config_snapshot()
+
         # add clock device if not already added
         if self._get_device_count() < 1:
             self.logger.debug("Add default devices")
             clock = {"type": "clock", "name": "Clock"}
             self._add_device(clock)
 
+        # load already resolved positions and precomputed holidays
+        self.resolution_cache.load()
+        self.holiday_bitsets.load()
+
         # prepare country
         country = self._get_config_field("country")
         if not country:
@@ -141,14 +313,17 @@ class Parameters(CleepModule):
         devices = self.get_module_devices()
         for device_uuid, device in devices.items():
             if device["type"] == "clock":
-                self.__clock_uuid = device_uuid
+                self._clock_uuid = device_uuid
+
+        # precompute holidays in background
+        self._submit_precompute_holidays()
 
     def _on_start(self):
         """
         Module starts
         """
         # restore last saved timestamp if system time seems very old (NTP error)
-        saved_timestamp = self._get_config_field("timestamp")
+        saved_timestamp = self.__load_timestamp()
         if (int(time.time()) - saved_timestamp) < 0:
             # it seems NTP sync failed, configure system with lastest stored time
             self.logger.info(
@@ -157,22 +332,163 @@ class Parameters(CleepModule):
                 datetime.datetime.fromtimestamp(saved_timestamp).isoformat(),
             )
             self._set_system_time(saved_timestamp)
+            # sun events were scheduled with invalid time
+            self.set_sun()
 
-        # launch time task (synced to current seconds)
-        self.time_task = self.task_factory.create_task(60.0, self._time_task)
-        seconds = 60 - (int(time.time()) % 60)
-        if seconds == 60:
-            self.time_task.start()
-        else:
-            timer = self.task_factory.create_timer(seconds, self.time_task.start)
-            timer.start()
+        # launch time task (synced to minute boundaries)
+        self.time_ticker.start()
 
     def _on_stop(self):
         """
         Module stops
         """
-        if self.time_task:
-            self.time_task.stop()
+        self.time_ticker.stop()
+        self.event_scheduler.stop()
+        self.timestamp_checkpoint.flush()
+        self.position_executor.shutdown(wait=False)
+        self.resolution_executor.shutdown(wait=False)
+        self.holidays_executor.shutdown(wait=False)
+        self.geo_resolver.release_timezonefinder()
+
+    def __create_timer(self, delay, callback):
+        """
+        Create timer (helpers timer factory)
+
+        Args:
+            delay (float): timer delay (in seconds)
+            callback (function): function called when timer fires
+
+        Returns:
+            Timer: timer (not started)
+        """
+        return self.task_factory.create_timer(delay, callback)
+
+    def _get_config_field(self, field):
+        """
+        Return config field value
+
+        Fields of CONFIG_SNAPSHOT_FIELDS are read from in-memory config snapshot (no lock,
+        no copy), other fields (devices...) are read from config and can be modified.
+
+        Args:
+            field (str): field name
+
+        Returns:
+            any: field value. Snapshot values are read-only (dicts are FrozenDict, lists
+                 are tuples)
+        """
+        if field not in self.CONFIG_SNAPSHOT_FIELDS:
+            return CleepModule._get_config_field(self, field)
+
+        snapshot = self.__config_snapshot
+        if snapshot is None:
+            snapshot = self.__refresh_config_snapshot()
+        return snapshot.get(field)
+
+    def _set_config_field(self, field, value):
+        """
+        Save config field and refresh config snapshot
+
+        Args:
+            field (str): field name
+            value (any): field value
+
+        Returns:
+            bool: True if config saved successfully
+        """
+        with self.__config_lock:
+            saved = CleepModule._set_config_field(self, field, value)
+            if saved:
+                self.__refresh_config_snapshot()
+            return saved
+
+    def _update_config(self, config):
+        """
+        Save config fields and refresh config snapshot
+
+        Args:
+            config (dict): config fields to update
+
+        Returns:
+            bool: True if config saved successfully
+        """
+        with self.__config_lock:
+            saved = CleepModule._update_config(self, config)
+            if saved:
+                self.__refresh_config_snapshot()
+            return saved
+
+    def _add_device(self, data):
+        """
+        Add device and refresh config snapshot
+
+        Args:
+            data (dict): device data
+
+        Returns:
+            dict: added device or None if error occured
+        """
+        with self.__config_lock:
+            device = CleepModule._add_device(self, data)
+            self.__refresh_config_snapshot()
+            return device
+
+    def _update_device(self, device_uuid, data):
+        """
+        Update device and refresh config snapshot
+
+        Args:
+            device_uuid (str): device uuid
+            data (dict): device data
+
+        Returns:
+            bool: True if device updated
+        """
+        with self.__config_lock:
+            updated = CleepModule._update_device(self, device_uuid, data)
+            self.__refresh_config_snapshot()
+            return updated
+
+    def _delete_device(self, device_uuid):
+        """
+        Delete device and refresh config snapshot
+
+        Args:
+            device_uuid (str): device uuid
+
+        Returns:
+            bool: True if device deleted
+        """
+        with self.__config_lock:
+            deleted = CleepModule._delete_device(self, device_uuid)
+            self.__refresh_config_snapshot()
+            return deleted
+
+    def get_config_version(self):
+        """
+        Return version of config snapshot, incremented after each config write
+
+        Returns:
+            int: config version
+        """
+        snapshot = self.__config_snapshot
+        return snapshot.version if snapshot is not None else 0
+
+    def __refresh_config_snapshot(self):
+        """
+        Replace config snapshot with a new version built from current config
+
+        Returns:
+            ConfigSnapshot: new snapshot
+        """
+        with self.__config_lock:
+            previous = self.__config_snapshot
+            snapshot = ConfigSnapshot(
+                previous.version + 1 if previous is not None else 1,
+                CleepModule._get_config(self),
+            )
+            self.__config_snapshot = snapshot
+            return snapshot
 
     def get_module_config(self):
         """
@@ -206,65 +522,10 @@ class Parameters(CleepModule):
 
         for device in devices.values():
             if device["type"] == "clock":
-                data = self.__format_time()
-                data.update(
-                    {"sunrise": self.suns["sunrise"], "sunset": self.suns["sunset"]}
-                )
-                device.update(data)
+                device.update(self._get_time_snapshot().event)
 
         return devices
 
-    def __format_time(self):
-        """
-        Return time with different splitted infos
-
-        Returns:
-            dict: time data::
-
-                {
-                    timestamp (int): current timestamp
-                    iso (string): current datetime in iso 8601 format
-                    year (int)
-                    month (int)
-                    day (int)
-                    hour (int)
-                    minute (int)
-                    weekday (int): 0=monday, 1=tuesday... 6=sunday
-                    weekday_literal (string): english literal weekday value (monday, tuesday, ...)
-                }
-
-        """
-        # current time
-        utc_now = utc.localize(datetime.datetime.utcnow())
-        local_now = utc_now.astimezone(self.timezone)
-        weekday = local_now.weekday()
-        if weekday == 0:
-            weekday_literal = "monday"
-        elif weekday == 1:
-            weekday_literal = "tuesday"
-        elif weekday == 2:
-            weekday_literal = "wednesday"
-        elif weekday == 3:
-            weekday_literal = "thursday"
-        elif weekday == 4:
-            weekday_literal = "friday"
-        elif weekday == 5:
-            weekday_literal = "saturday"
-        elif weekday == 6:
-            weekday_literal = "sunday"
-
-        return {
-            "timestamp": datetime.datetime.timestamp(utc_now),
-            "iso": local_now.isoformat(),
-            "year": local_now.year,
-            "month": local_now.month,
-            "day": local_now.day,
-            "hour": local_now.hour,
-            "minute": local_now.minute,
-            "weekday": weekday,
-            "weekday_literal": weekday_literal,
-        }
-
     def _set_system_time(self, timestamp):
         """
         Set system time with specified value
@@ -279,63 +540,38 @@ class Parameters(CleepModule):
         if resp["returncode"] != 0 or resp["killed"]:
             self.logger.warning("Error configuring system time")
 
-    def _time_task(self):
+    def __run_minute_task(self):
         """
-        Time task used to refresh time
+        Run time task (called each minute by time ticker)
         """
-        now_formatted = self.__format_time()
-        self.logger.trace("now_formatted: %s", now_formatted)
-
-        # send now event
-        now_event_params = copy.deepcopy(now_formatted)
-        now_event_params.update(
-            {"sunrise": self.suns["sunrise"], "sunset": self.suns["sunset"]}
-        )
-        self.time_now_event.send(params=now_event_params, device_id=self.__clock_uuid)
-
-        # send sunrise event
-        if self.sunrise:
-            if (
-                now_formatted["hour"] == self.sunrise.hour
-                and now_formatted["minute"] == self.sunrise.minute
-            ):
-                self.time_sunrise_event.send(device_id=self.__clock_uuid)
-
-        # send sunset event
-        if self.sunset:
-            if (
-                now_formatted["hour"] == self.sunset.hour
-                and now_formatted["minute"] == self.sunset.minute
-            ):
-                self.time_sunset_event.send(device_id=self.__clock_uuid)
-
-        # update sun times after midnight
-        if now_formatted["hour"] == 0 and now_formatted["minute"] == 5:
-            self.set_sun()
-
-        self._set_config_field("timestamp", now_formatted["timestamp"])
+        self._time_task()
 
-    def get_time(self):
+    def __load_timestamp(self):
         """
-        Return current time
+        Return last saved timestamp
 
         Returns:
-            dict: current time::
+            float: last saved timestamp (0 if none)
+        """
+        # config field is still read to handle timestamp saved by previous versions
+        saved_timestamp = self._get_config_field("timestamp") or 0
+        if self.timestamp_file:
+            saved_timestamp = max(saved_timestamp, self.timestamp_file.read() or 0)
+        return saved_timestamp
 
-                {
-                    timestamp (int): current timestamp
-                    iso (string): current datetime in iso 8601 format
-                    year (int)
-                    month (int)
-                    day (int)
-                    hour (int)
-                    minute (int)
-                    weekday (int): 0=monday, 1=tuesday... 6=sunday
-                    weekday_literal (string): english literal weekday value (monday, tuesday, ...)
-                }
+    def __save_timestamp(self, timestamp):
+        """
+        Persist timestamp checkpoint
+
+        Args:
+            timestamp (float): timestamp to save
 
+        Returns:
+            bool: True if timestamp saved successfully
         """
-        return self.__format_time()
+        if self.timestamp_file:
+            return self.timestamp_file.write(timestamp)
+        return self._set_config_field("timestamp", timestamp)
 
     def set_hostname(self, hostname):
         """
@@ -354,6 +590,9 @@ class Parameters(CleepModule):
         if re.match(self.__hostname_pattern, hostname) is None:
             raise InvalidParameter("Hostname is not valid")
 
+        if self._is_unchanged("hostname", self.hostname.get_hostname(), hostname):
+            return True
+
         # update hostname
         res = self.hostname.set_hostname(hostname)
 
@@ -363,344 +602,122 @@ class Parameters(CleepModule):
 
         return res
 
-    def get_hostname(self):
-        """
-        Return raspi hostname
-
-        Returns:
-            string: raspberry pi hostname
-        """
-        return self.hostname.get_hostname()
-
-    def set_position(self, latitude, longitude):
+    def _is_unchanged(self, name, current_value, new_value):
         """
-        Set device position
+        Check if update changes current value. If not, update is counted as skipped.
 
         Args:
-            latitude (float): latitude
-            longitude (float): longitude
-
-        Raises:
-            CommandError: if error occured during position saving
-        """
-        if latitude is None:
-            raise MissingParameter('Parameter "latitude" is missing')
-        if not isinstance(latitude, float):
-            raise InvalidParameter('Parameter "latitude" is invalid')
-        if longitude is None:
-            raise MissingParameter('Parameter "longitude" is missing')
-        if not isinstance(longitude, float):
-            raise InvalidParameter('Parameter "longitude" is invalid')
-
-        # save new position
-        position = {"latitude": latitude, "longitude": longitude}
-
-        if not self._set_config_field("position", position):
-            raise CommandError("Unable to save position")
-
-        # reset python time to take into account last modifications before
-        # computing new times
-        time.tzset()
-
-        # and update related stuff
-        self.set_timezone()
-        self.set_country()
-        self.set_sun()
-
-        # send now event
-        self._time_task()
-
-    def get_position(self):
-        """
-        Return device position
+            name (str): updated value name (timezone, country or hostname)
+            current_value (any): current value
+            new_value (any): new value
 
         Returns:
-            dict: position coordinates::
-
-                {
-                    latitude (float),
-                    longitude (float)
-                }
-
+            bool: True if value is unchanged and update must be skipped
         """
-        return self._get_config_field("position")
+        if current_value != new_value:
+            return False
 
-    def get_sun(self):
+        self.logger.debug('Skip %s update, value "%s" is unchanged', name, new_value)
+        with self.__skipped_updates_lock:
+            self.__skipped_updates[name] += 1
+        return True
+
+    def get_skipped_updates(self):
         """
-        Compute sun times
+        Return number of updates skipped because value was unchanged
 
         Returns:
-            dict: sunset/sunrise timestamps::
+            dict: number of skipped updates::
 
                 {
-                    sunrise (int),
-                    sunset (int)
+                    timezone (int),
+                    country (int),
+                    hostname (int)
                 }
 
         """
-        return self.suns
-
-    def set_sun(self):
-        """ "
-        Compute sun times (sunrise and sunset) according to configured position
-        """
-        # get position
-        position = self._get_config_field("position")
-
-        # compute sun times
-        self.sunset = None
-        self.sunrise = None
-        if position["latitude"] != 0 and position["longitude"] != 0:
-            self.sun.set_position(position["latitude"], position["longitude"])
-            self.sunset = self.sun.sunset().astimezone(self.timezone)
-            self.sunrise = self.sun.sunrise().astimezone(self.timezone)
-            self.logger.debug("Found sunrise:%s sunset:%s", self.sunrise, self.sunset)
-
-            # save times
-            self.suns["sunrise"] = int(self.sunrise.strftime("%s"))
-            self.suns["sunrise_iso"] = self.sunrise.isoformat()
-            self.suns["sunset"] = int(self.sunset.strftime("%s"))
-            self.suns["sunset_iso"] = self.sunset.isoformat()
-
-    def set_country(self):
-        """
-        Compute country (and associated alpha) from current internal position
-
-        Warning:
-            This function can take some time to find country info on slow device like raspi 1st generation (~15secs)
-        """
-        # get position
-        position = self._get_config_field("position")
-        if not position["latitude"] and not position["longitude"]:
-            self.logger.debug(
-                "Unable to set country from unspecified position (%s)", position
-            )
-            return
-
-        # get country from position
-        country = {"country": None, "alpha2": None}
-        try:
-            # search country
-            coordinates = ((position["latitude"], position["longitude"]),)
-            # need a tuple
-            geo = reverse_geocode.search(coordinates)
-            self.logger.debug("Found country infos from position %s: %s", position, geo)
-            if (
-                geo
-                and len(geo) > 0
-                and "country_code" in geo[0]
-                and "country" in geo[0]
-            ):
-                country["alpha2"] = geo[0]["country_code"]
-                country["country"] = geo[0]["country"]
-
-            # save new country
-            if not self._set_config_field("country", country):
-                raise CommandError("Unable to save country")
-
-            # send event
-            self.country_update_event.send(params=country)
-
-        except CommandError:
-            raise
-
-        except Exception:
-            self.logger.exception("Unable to find country for position %s:", position)
-
-    def get_country(self):
-        """
-        Get country from position
-
-        Returns:
-            dict: return country infos::
-
-            {
-                country (string): country label
-                alpha2 (string): country code
-            }
-
-        """
-        return self._get_config_field("country")
-
-    def set_timezone(self):
-        """
-        Set timezone according to coordinates
-
-        Returns:
-            bool: True if function succeed, False otherwise
-
-        Raises:
-            CommandError: if unable to save timezone
-        """
-        # get position
-        position = self._get_config_field("position")
-        if not position["latitude"] and not position["longitude"]:
-            self.logger.warning(
-                "Unable to set timezone from unspecified position (%s)", position
-            )
-            return False
-
-        # compute timezone
-        current_timezone = None
-        try:
-            # try to find timezone at position
-            current_timezone = self.timezonefinder.timezone_at(
-                lat=position["latitude"], lng=position["longitude"]
-            )
-            if current_timezone is None:
-                # extend search to closest position
-                # TODO increase delta_degree to extend research, careful it use more CPU !
-                current_timezone = self.timezonefinder.closest_timezone_at(
-                    lat=position["latitude"], lng=position["longitude"]
-                )
-        except ValueError:
-            # the coordinates were out of bounds
-            self.logger.exception("Coordinates out of bounds")
-        except Exception:
-            self.logger.exception("Error occured searching timezone at position")
-        if not current_timezone:
-            self.logger.warning(
-                "Unable to set device timezone because it was not found"
-            )
-            return False
-
-        # save timezone value
-        self.logger.debug("Save new timezone: %s", current_timezone)
-        if not self._set_config_field("timezone", current_timezone):
-            raise CommandError("Unable to save timezone")
-
-        # configure system timezone
-        zoneinfo = os.path.join(self.SYSTEM_ZONEINFO_DIR, current_timezone)
-        self.logger.debug("Checking zoneinfo file: %s", zoneinfo)
-        if not os.path.exists(zoneinfo):
-            raise CommandError(
-                f'No system file found for "{current_timezone}" timezone'
-            )
-        self.logger.debug('zoneinfo file "%s" exists', zoneinfo)
-        self.cleep_filesystem.rm(self.SYSTEM_LOCALTIME)
-
-        self.logger.debug(
-            'Writing timezone "%s" in "%s"', current_timezone, self.SYSTEM_TIMEZONE
-        )
-        if not self.cleep_filesystem.write_data(
-            self.SYSTEM_TIMEZONE, f"{current_timezone}"
-        ):
-            self.logger.error(
-                'Unable to write timezone data on "%s". System timezone is not configured!',
-                self.SYSTEM_TIMEZONE,
-            )
-            return False
-
-        # launch timezone update in background
-        self.logger.debug("Updating system timezone")
-        command = Console()
-        res = command.command("dpkg-reconfigure -f noninteractive tzdata", timeout=60.0)
-        self.logger.debug("Timezone update command result: %s", res)
-        if res["returncode"] != 0:
-            self.logger.error("Error reconfiguring system timezone: %s", res["stderr"])
-            return False
-
-        # propagate changes to cleep
-        self.timezone = timezone(current_timezone)
-        self._time_task()
-
-        return True
+        with self.__skipped_updates_lock:
+            return dict(self.__skipped_updates)
 
-    def get_timezone(self):
+    def get_hostname(self):
         """
-        Return timezone
+        Return raspi hostname
 
         Returns:
-            string: current timezone name
+            string: raspberry pi hostname
         """
-        return self._get_config_field("timezone")
+        return self.hostname.get_hostname()
 
-    def get_non_working_days(self, year=None):
+    def _parse_days_range(self, start_date, end_date, max_days):
         """
-        Return non working days of current year
+        Check and parse iso days range parameters
 
         Args:
-            year (int, optional): get non working day for specified year. If not specified use current year. Defaults to None.
+            start_date (str): first day (iso format YYYY-MM-DD)
+            end_date (str): last day included (iso format YYYY-MM-DD)
+            max_days (int): max number of days of range
 
         Returns:
-            list: list of non working days of the year. List can be empty if error occured::
-
-            [
-                {
-                    datetime (string): non working day (date in iso format YYYY-MM-DD)
-                    label (string): english name of non working day
-                },
-                ...
-            ]
+            tuple: first and last days (date)
 
+        Raises:
+            InvalidParameter: if dates are invalid or range is too large
         """
         self._check_parameters(
             [
                 {
-                    "name": "year",
-                    "type": int,
-                    "value": year,
-                    "none": True,
-                }
+                    "name": "start_date",
+                    "type": str,
+                    "value": start_date,
+                },
+                {
+                    "name": "end_date",
+                    "type": str,
+                    "value": end_date,
+                },
             ]
         )
-
         try:
-            country = self._get_config_field("country")
-            continent_code = country_alpha2_to_continent_code(country["alpha2"])
-            continent_name = convert_continent_code_to_continent_name(
-                continent_code
-            ).lower()
-            continent_name = (
-                continent_name.lower().replace("south", "").replace("north", "").strip()
-            )
+            start = datetime.date.fromisoformat(start_date)
+            end = datetime.date.fromisoformat(end_date)
+        except ValueError as error:
+            raise InvalidParameter("Dates must be in iso format (YYYY-MM-DD)") from error
+        if end < start:
+            raise InvalidParameter('Parameter "end_date" must be after "start_date"')
+        if (end - start).days >= max_days:
+            raise InvalidParameter(f"Date range must not exceed {max_days} days")
 
-            workalendar = importlib.import_module(f"workalendar.{continent_name}")
-            fixed_country = "".join(
-                [part.capitalize() for part in country["country"].split()]
-            )
-            _class = getattr(workalendar, fixed_country)
-            _instance = _class()
-            year = year or datetime.datetime.now().year
-            holidays = _instance.holidays(year)
-            return [(date.isoformat(), label) for (date, label) in holidays]
-        except Exception:
-            self.logger.exception("Unable to get non working days:")
-            return []
+        return start, end
 
-    def is_non_working_day(self, day):
+    def _parse_day(self, name, value):
         """
-        Check if specified day is non working day according to current locale configuration
+        Check and parse iso day parameter
 
         Args:
-            day (str): day to check (must be iso format XXXX-MM-DD)
+            name (str): parameter name
+            value (str): parameter value
 
         Returns:
-            bool: True if specified day is a non working day, False otherwise
+            date: parsed day
+
+        Raises:
+            InvalidParameter: if day is invalid
         """
         self._check_parameters(
             [
                 {
-                    "name": "day",
+                    "name": name,
                     "type": str,
-                    "value": day,
-                }
+                    "value": value,
+                },
             ]
         )
-
-        year = datetime.date.fromisoformat(day).year
-        non_working_days = self.get_non_working_days(year=year)
-        return any(a_day == day for (a_day, label) in non_working_days)
-
-    def is_today_non_working_day(self):
-        """
-        Check if today is non working day according to current locale configuration
-
-        Returns:
-            bool: True if specified day is a non working day, False otherwise
-        """
-        today = datetime.date.today()
-        return self.is_non_working_day(today.isoformat())
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError as error:
+            raise InvalidParameter(
+                f'Parameter "{name}" must be in iso format (YYYY-MM-DD)'
+            ) from error
 
     def get_auth_accounts(self):
         """
@@ -752,7 +769,7 @@ class Parameters(CleepModule):
             self.cleep_conf.add_auth_account(account, password)
             self.__reload_rpcserver_auth()
         except Exception as error:
-            raise CommandError(str(error))
+            raise CommandError(str(error)) from error
 
     def delete_auth_account(self, account):
         """
@@ -780,7 +797,7 @@ class Parameters(CleepModule):
             self.cleep_conf.delete_auth_account(account)
             self.__reload_rpcserver_auth()
         except Exception as error:
-            raise CommandError(str(error))
+            raise CommandError(str(error)) from error
 
     def enable_auth(self):
         """
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class ParametersPositionProgressEvent(Event):
+    """
+    Parameters.position.progress event
+    """
+
+    EVENT_NAME = "parameters.position.progress"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["job_id", "stage", "progress"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
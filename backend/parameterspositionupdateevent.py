@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class ParametersPositionUpdateEvent(Event):
+    """
+    Parameters.position.update event
+    """
+
+    EVENT_NAME = "parameters.position.update"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = [
+        "job_id",
+        "status",
+        "stage",
+        "position",
+        "timezone",
+        "country",
+        "sun",
+        "error",
+    ]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
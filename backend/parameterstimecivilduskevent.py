@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class ParametersTimeCivilDuskEvent(Event):
+    """
+    Parameters.time.civildusk event
+    """
+
+    EVENT_NAME = "parameters.time.civildusk"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = []
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class ParametersTimeOffsetChangedEvent(Event):
+    """
+    Parameters.time.offsetchanged event
+    """
+
+    EVENT_NAME = "parameters.time.offsetchanged"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["timezone", "offset", "previous_offset"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
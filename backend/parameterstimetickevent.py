@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class ParametersTimeTickEvent(Event):
+    """
+    Parameters.time.tick event
+    """
+
+    EVENT_NAME = "parameters.time.tick"
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ["timestamp", "iso", "resolutions"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import copy
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+
+
+class PositionJobs:
+    """
+    Background position update jobs
+
+    Each job runs pipeline in executor. Pipeline reports its stages so job state and progress
+    can be followed. Only last jobs are kept in history.
+    """
+
+    # number of jobs kept in history
+    HISTORY = 10
+
+    def __init__(
+        self,
+        executor,
+        pipeline,
+        stages,
+        progress_callback=None,
+        update_callback=None,
+    ):
+        """
+        Constructor
+
+        Args:
+            executor (Executor): executor running jobs
+            pipeline (function): function called with job position and a function to call
+                                 with each stage name when it starts. It returns dict of
+                                 resolved values stored in job (timezone, country, sun)
+            stages (list): ordered pipeline stages names
+            progress_callback (function, optional): function called with progress infos
+                                                    ({job_id, stage, progress}) at each stage
+            update_callback (function, optional): function called with job at job end
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stages = stages
+        self.__executor = executor
+        self.__pipeline = pipeline
+        self.__progress_callback = progress_callback
+        self.__update_callback = update_callback
+        self.__jobs = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def submit(self, position):
+        """
+        Create job and run it in background
+
+        Args:
+            position (dict): position to apply
+
+        Returns:
+            str: job id
+        """
+        job_id = str(uuid.uuid4())
+        with self.__lock:
+            self.__jobs[job_id] = {
+                "job_id": job_id,
+                "status": "pending",
+                "stage": None,
+                "position": position,
+                "timezone": None,
+                "country": None,
+                "sun": None,
+                "error": None,
+            }
+            while len(self.__jobs) > self.HISTORY:
+                self.__jobs.popitem(last=False)
+        self.__executor.submit(self.run, job_id)
+
+        return job_id
+
+    def run(self, job_id):
+        """
+        Run job pipeline
+
+        Args:
+            job_id (str): job id
+        """
+        try:
+            job = self.update(job_id, status="running")
+            values = self.__pipeline(
+                job["position"], lambda stage: self.__start_stage(job_id, stage)
+            )
+            job = self.update(job_id, status="done", stage=None, **values)
+        except Exception as error:
+            self.logger.exception("Error occured updating position")
+            job = self.update(job_id, status="failed", error=str(error))
+
+        if not self.__update_callback:
+            return
+        try:
+            self.__update_callback(job)
+        except Exception:
+            # job runs in executor, error would be lost in its future
+            self.logger.exception("Unable to send position update event for job %s", job_id)
+
+    def __start_stage(self, job_id, stage):
+        """
+        Update job stage and report progress
+
+        Args:
+            job_id (str): job id
+            stage (str): stage name
+        """
+        self.update(job_id, stage=stage)
+        if self.__progress_callback:
+            self.__progress_callback(
+                {
+                    "job_id": job_id,
+                    "stage": stage,
+                    "progress": int(self.stages.index(stage) * 100 / len(self.stages)),
+                }
+            )
+
+    def update(self, job_id, **values):
+        """
+        Update job
+
+        Args:
+            job_id (str): job id
+            values (dict): job values to update
+
+        Returns:
+            dict: copy of updated job
+        """
+        with self.__lock:
+            job = self.__jobs.get(job_id)
+            if job is None:
+                # job removed from history, keep it for caller
+                job = {"job_id": job_id}
+            job.update(values)
+            return copy.deepcopy(job)
+
+    def get(self, job_id):
+        """
+        Return job
+
+        Args:
+            job_id (str): job id
+
+        Returns:
+            dict: copy of job or None if job does not exist
+        """
+        with self.__lock:
+            job = self.__jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
@@ -0,0 +1,442 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import copy
+from pytz import utc, timezone
+from cleep.exception import CommandError, InvalidParameter, MissingParameter
+from .utcoffsetcache import UtcOffsetCache
+
+
+class PositionMixin:
+    """
+    Parameters position commands: device position and timezone and country resolved from it
+    """
+
+    def set_position(self, latitude, longitude):
+        """
+        Set device position
+
+        Position is saved immediately, related stuff (timezone, country, sun times) is updated
+        in background. Each step sends parameters.position.progress event and
+        parameters.position.update event is sent at the end.
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            str: job id (see get_position_job)
+
+        Raises:
+            CommandError: if error occured during position saving
+        """
+        if latitude is None:
+            raise MissingParameter('Parameter "latitude" is missing')
+        if not isinstance(latitude, float):
+            raise InvalidParameter('Parameter "latitude" is invalid')
+        if longitude is None:
+            raise MissingParameter('Parameter "longitude" is missing')
+        if not isinstance(longitude, float):
+            raise InvalidParameter('Parameter "longitude" is invalid')
+
+        # save new position
+        position = {"latitude": latitude, "longitude": longitude}
+
+        if not self._set_config_field("position", position):
+            raise CommandError("Unable to save position")
+        self.sun_tables.clear()
+
+        # and update related stuff in background
+        return self.position_jobs.submit(position)
+
+    def _run_position_pipeline(self, position, start_stage):
+        """
+        Update position related stuff (position job pipeline)
+
+        Timezone and country are resolved concurrently, sun times are computed in resolved
+        timezone, then all are applied together.
+
+        Args:
+            position (dict): new position
+            start_stage (function): function to call with each stage name when it starts
+
+        Returns:
+            dict: applied timezone, country and sun times
+        """
+        # reset python time to take into account last modifications before
+        # computing new times
+        time.tzset()
+
+        start_stage("resolve")
+        timezone_name, country, sun_times = self.__resolve_position(position)
+
+        start_stage("timezone")
+        if timezone_name:
+            self.__apply_timezone(timezone_name)
+        else:
+            self.logger.warning("Unable to set device timezone because it was not found")
+
+        start_stage("country")
+        if country:
+            self.__apply_country(country)
+
+        start_stage("sun")
+        self._apply_sun(sun_times)
+
+        # send now event
+        start_stage("time")
+        self._time_task()
+
+        return {
+            "timezone": self.get_timezone(),
+            "country": self.get_country(),
+            "sun": copy.deepcopy(self.get_sun()),
+        }
+
+    def __resolve_position(self, position):
+        """
+        Resolve timezone and country of specified position concurrently, then compute sun
+        times of current day in resolved timezone (device timezone if not found)
+
+        Args:
+            position (dict): position to resolve
+
+        Returns:
+            tuple: resolved values::
+
+                (
+                    timezone (str): timezone name or None if not found,
+                    country (dict): country infos or None if not found,
+                    sun times (dict): solar events timestamps (see SunTimes.compute_day),
+                )
+
+        """
+        if not position["latitude"] and not position["longitude"]:
+            self.logger.warning(
+                "Unable to resolve timezone and country from unspecified position (%s)",
+                position,
+            )
+            return None, None, self.solar.compute_day(position, self.timezone or utc)
+
+        timezone_future = self.resolution_executor.submit(
+            self.geo_resolver.resolve_timezone, position
+        )
+        country_future = self.resolution_executor.submit(
+            self.geo_resolver.resolve_country, position
+        )
+
+        # "today" depends on timezone of position, not on current device one
+        timezone_name = timezone_future.result()
+        sun_times = self.solar.compute_day(
+            position, timezone(timezone_name) if timezone_name else self.timezone or utc
+        )
+
+        country = None
+        try:
+            country = country_future.result()
+        except Exception:
+            self.logger.exception("Unable to find country for position %s:", position)
+
+        return timezone_name, country, sun_times
+
+    def get_position_job(self, job_id):
+        """
+        Return set_position job state
+
+        Args:
+            job_id (str): job id returned by set_position
+
+        Returns:
+            dict: job infos::
+
+                {
+                    job_id (str): job id
+                    status (str): pending, running, done or failed
+                    stage (str): current stage (resolve, timezone, country, sun or time), None if not running
+                    position (dict): requested position
+                    timezone (str): resolved timezone (when done)
+                    country (dict): resolved country (when done)
+                    sun (dict): computed sun times (when done)
+                    error (str): error message (when failed)
+                }
+
+        Raises:
+            InvalidParameter: if job does not exist
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "job_id",
+                    "type": str,
+                    "value": job_id,
+                },
+            ]
+        )
+
+        job = self.position_jobs.get(job_id)
+        if job is None:
+            raise InvalidParameter(f'Job "{job_id}" does not exist')
+        return job
+
+    def resolve_positions(self, positions):
+        """
+        Resolve timezone, country and today sun times of many positions at once
+
+        Nothing is saved nor applied to device. Countries are searched with a single reverse
+        geocoding call and timezones with a single timezonefinder instance. Closest timezone
+        searches of all offshore positions share GeoResolver.CLOSEST_TIMEZONE_TIMEOUT.
+
+        Args:
+            positions (list): list of positions::
+
+                [
+                    {
+                        latitude (float),
+                        longitude (float)
+                    },
+                    ...
+                ]
+
+        Returns:
+            list: resolved positions in same order::
+
+                [
+                    {
+                        latitude (float),
+                        longitude (float),
+                        timezone (str): timezone name or None if not found,
+                        country (dict): country infos ({country, alpha2}),
+                        sun (dict): today solar events in position timezone: utc
+                                    timestamp (int) and local iso datetime (<event>_iso)
+                                    of each event of SOLAR_EVENTS_NAMES (astronomical_dawn,
+                                    ..., sunrise, ..., sunset, ..., astronomical_dusk).
+                                    Values are None if event does not occur or if position
+                                    is unspecified
+                    },
+                    ...
+                ]
+
+        Raises:
+            InvalidParameter: if positions are invalid
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "positions",
+                    "type": list,
+                    "value": positions,
+                    "empty": False,
+                },
+            ]
+        )
+        if len(positions) > self.RESOLVE_POSITIONS_MAX:
+            raise InvalidParameter(
+                f'Parameter "positions" must contain at most {self.RESOLVE_POSITIONS_MAX} positions'
+            )
+        for position in positions:
+            if (
+                not isinstance(position, dict)
+                or not all(
+                    isinstance(position.get(key), (int, float))
+                    and not isinstance(position.get(key), bool)
+                    for key in ("latitude", "longitude")
+                )
+                or not -90 <= position["latitude"] <= 90
+                or not -180 <= position["longitude"] <= 180
+            ):
+                raise InvalidParameter(f'Parameter "positions" has invalid position {position}')
+
+        results = self.geo_resolver.resolve_positions(positions)
+
+        # sun times of all positions are computed in a single pass
+        local_timezones = [
+            timezone(result["timezone"]) if result["timezone"] else utc for result in results
+        ]
+        for result, local_timezone, sun_times in zip(
+            results, local_timezones, self.solar.compute_positions(results, local_timezones)
+        ):
+            result["sun"] = self.solar.format(sun_times, UtcOffsetCache(local_timezone))
+
+        return results
+
+    def get_position(self):
+        """
+        Return device position
+
+        Returns:
+            dict: position coordinates::
+
+                {
+                    latitude (float),
+                    longitude (float)
+                }
+
+        """
+        return self._get_config_field("position")
+
+    def set_country(self):
+        """
+        Compute country (and associated alpha) from current internal position
+
+        Warning:
+            This function can take some time to find country info on slow device like raspi 1st generation (~15secs)
+        """
+        # get position
+        position = self._get_config_field("position")
+        if not position["latitude"] and not position["longitude"]:
+            self.logger.debug(
+                "Unable to set country from unspecified position (%s)", position
+            )
+            return
+
+        # get country from position
+        try:
+            country = self.geo_resolver.resolve_country(position)
+        except Exception:
+            self.logger.exception("Unable to find country for position %s:", position)
+            return
+
+        self.__apply_country(country)
+
+    def __apply_country(self, country):
+        """
+        Save country and broadcast it
+
+        Args:
+            country (dict): country infos
+
+        Raises:
+            CommandError: if unable to save country
+        """
+        if self._is_unchanged("country", self._get_config_field("country"), country):
+            return
+
+        # save new country
+        if not self._set_config_field("country", country):
+            raise CommandError("Unable to save country")
+        self.working_days.clear()
+        self._submit_precompute_holidays()
+
+        # send event
+        self.country_update_event.send(params=country)
+
+    def get_country(self):
+        """
+        Get country from position
+
+        Returns:
+            dict: return country infos::
+
+            {
+                country (string): country label
+                alpha2 (string): country code
+            }
+
+        """
+        return self._get_config_field("country")
+
+    def _get_country_code(self):
+        """
+        Return configured country code
+
+        Returns:
+            str: country code (alpha2) or None if country is not configured
+        """
+        return (self._get_config_field("country") or {}).get("alpha2")
+
+    def set_timezone(self, timeout=None):
+        """
+        Set timezone according to coordinates
+
+        Args:
+            timeout (float, optional): maximum time (in seconds) allowed to search closest
+                                       timezone when position is offshore. Defaults to
+                                       GeoResolver.CLOSEST_TIMEZONE_TIMEOUT
+
+        Returns:
+            bool: True if function succeed, False otherwise
+
+        Raises:
+            CommandError: if unable to save timezone
+        """
+        # get position
+        position = self._get_config_field("position")
+        if not position["latitude"] and not position["longitude"]:
+            self.logger.warning(
+                "Unable to set timezone from unspecified position (%s)", position
+            )
+            return False
+
+        # compute timezone
+        current_timezone = self.geo_resolver.resolve_timezone(position, timeout)
+        if not current_timezone:
+            self.logger.warning(
+                "Unable to set device timezone because it was not found"
+            )
+            return False
+
+        return self.__apply_timezone(current_timezone)
+
+    def __apply_timezone(self, current_timezone):
+        """
+        Save timezone and configure system with it
+
+        Args:
+            current_timezone (str): timezone name
+
+        Returns:
+            bool: True if timezone is applied, False otherwise
+
+        Raises:
+            CommandError: if unable to save timezone
+        """
+        if self._is_unchanged(
+            "timezone", self.__get_applied_timezone(), current_timezone
+        ):
+            return True
+
+        # save timezone value
+        self.logger.debug("Save new timezone: %s", current_timezone)
+        if not self._set_config_field("timezone", current_timezone):
+            raise CommandError("Unable to save timezone")
+
+        # configure system timezone
+        zoneinfo = self.system_timezone.get_zoneinfo(current_timezone)
+        if not zoneinfo:
+            raise CommandError(
+                f'No system file found for "{current_timezone}" timezone'
+            )
+        if not self.system_timezone.apply(current_timezone, zoneinfo):
+            return False
+
+        # propagate changes to cleep
+        time.tzset()
+        self.timezone = timezone(current_timezone)
+        self._schedule_sun_events()
+        self._time_task()
+
+        return True
+
+    def __get_applied_timezone(self):
+        """
+        Return timezone applied to cleep and to system
+
+        Returns:
+            str: timezone name or None if timezone is not the same in config, cleep and system
+        """
+        timezone_name = self._get_config_field("timezone")
+        if not timezone_name or not self.timezone or self.timezone.zone != timezone_name:
+            return None
+        if not self.system_timezone.is_applied(timezone_name):
+            return None
+
+        return timezone_name
+
+    def get_timezone(self):
+        """
+        Return timezone
+
+        Returns:
+            string: current timezone name
+        """
+        return self._get_config_field("timezone")
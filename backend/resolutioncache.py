@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import copy
+import threading
+from .lrucache import LruCache
+
+
+class ResolutionCache:
+    """
+    Persistent cache of position resolutions (timezone and country)
+
+    Positions are quantized according to precision (in degrees) so close positions share the
+    same entry. Cache is bounded and evicts least recently used positions.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cleep_filesystem, path, precision=0.01, max_size=100):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            path (str): cache file path
+            precision (float, optional): quantization step in degrees. Defaults to 0.01 (~1km)
+            max_size (int, optional): maximum number of cached positions. Defaults to 100
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.path = path
+        self.precision = precision
+        self.__cache = LruCache(max_size)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def get_key(self, latitude, longitude):
+        """
+        Return cache key of specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            str: quantized position key
+        """
+        return (
+            f"{int(round(latitude / self.precision))}"
+            f":{int(round(longitude / self.precision))}"
+        )
+
+    def get(self, latitude, longitude):
+        """
+        Return cached resolution of specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            dict: cached values (timezone and/or country) or None if position is not cached
+        """
+        entry = self.__cache.get(self.get_key(latitude, longitude))
+        return copy.deepcopy(entry) if entry is not None else None
+
+    def update(self, latitude, longitude, **values):
+        """
+        Update cached resolution of specified position and persist cache if it changed
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            values (dict): values to cache (timezone=..., country=...)
+
+        Returns:
+            bool: True if cache changed
+        """
+        key = self.get_key(latitude, longitude)
+        with self.__lock:
+            entry = self.__cache.get(key) or {}
+            if all(entry.get(name) == value for name, value in values.items()):
+                return False
+
+            entry = dict(entry, **copy.deepcopy(values))
+            self.__cache.set(key, entry)
+            self.save()
+            return True
+
+    def clear(self):
+        """
+        Clear cache
+        """
+        self.__cache.clear()
+        self.save()
+
+    def load(self):
+        """
+        Load cache from file. Invalid or outdated content is ignored.
+        """
+        try:
+            content = self.cleep_filesystem.read_json(self.path)
+        except Exception:
+            self.logger.exception('Unable to read resolution cache "%s"', self.path)
+            return
+
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != self.VERSION
+            or content.get("precision") != self.precision
+            or not isinstance(content.get("entries"), list)
+        ):
+            self.logger.debug('Ignore invalid resolution cache "%s"', self.path)
+            return
+
+        self.__cache.clear()
+        for key, entry in content["entries"]:
+            self.__cache.set(key, entry)
+        self.logger.debug("%s resolutions loaded", len(self.__cache))
+
+    def save(self):
+        """
+        Save cache to file
+
+        Returns:
+            bool: True if cache saved successfully
+        """
+        content = {
+            "version": self.VERSION,
+            "precision": self.precision,
+            "entries": self.__cache.items(),
+        }
+        if not self.cleep_filesystem.write_json(self.path, content):
+            self.logger.warning('Unable to save resolution cache "%s"', self.path)
+            return False
+        return True
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+import datetime
+from .lazyimport import LazyImport
+
+numpy = LazyImport("numpy")
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+# julian day of unix epoch
+EPOCH_JULIAN_DAY = 2440587.5
+# sun zenith (in degrees) at sunrise and sunset (refraction and sun radius included)
+SUNRISE_ZENITH = 90.833
+# solar events: name, sun zenith (in degrees) and -1 for morning event or 1 for evening
+SOLAR_EVENTS = (
+    ("astronomical_dawn", 108.0, -1),
+    ("nautical_dawn", 102.0, -1),
+    ("civil_dawn", 96.0, -1),
+    ("sunrise", SUNRISE_ZENITH, -1),
+    ("golden_hour_end", 84.0, -1),
+    ("golden_hour_start", 84.0, 1),
+    ("sunset", SUNRISE_ZENITH, 1),
+    ("civil_dusk", 96.0, 1),
+    ("nautical_dusk", 102.0, 1),
+    ("astronomical_dusk", 108.0, 1),
+)
+# all solar events names in chronological order
+SOLAR_EVENTS_NAMES = tuple(
+    [name for name, _, side in SOLAR_EVENTS if side < 0]
+    + ["solar_noon"]
+    + [name for name, _, side in SOLAR_EVENTS if side > 0]
+)
+
+
+def compute_solar_terms(day_numbers, longitude):
+    """
+    Compute solar declination and equation of time for many days at once (NOAA algorithm)
+
+    Terms are computed at approximate solar noon of each day at specified longitude.
+
+    Args:
+        day_numbers (numpy.ndarray): days since 1970-01-01
+        longitude (float): longitude (in degrees, east positive)
+
+    Returns:
+        tuple: declination (radians) and equation of time (minutes) arrays
+    """
+    julian_days = day_numbers + 0.5 - longitude / 360.0 + EPOCH_JULIAN_DAY
+    return compute_solar_terms_at(julian_days)
+
+
+def compute_solar_terms_at(julian_days):
+    """
+    Compute solar declination and equation of time at many instants at once (NOAA
+    algorithm)
+
+    Args:
+        julian_days (numpy.ndarray): julian days
+
+    Returns:
+        tuple: declination (radians) and equation of time (minutes) arrays
+    """
+    century = (julian_days - 2451545.0) / 36525.0
+
+    mean_longitude = numpy.radians(
+        (280.46646 + century * (36000.76983 + century * 0.0003032)) % 360.0
+    )
+    mean_anomaly = numpy.radians(
+        357.52911 + century * (35999.05029 - 0.0001537 * century)
+    )
+    eccentricity = 0.016708634 - century * (0.000042037 + 0.0000001267 * century)
+    center = (
+        numpy.sin(mean_anomaly) * (1.914602 - century * (0.004817 + 0.000014 * century))
+        + numpy.sin(2.0 * mean_anomaly) * (0.019993 - 0.000101 * century)
+        + numpy.sin(3.0 * mean_anomaly) * 0.000289
+    )
+    omega = numpy.radians(125.04 - 1934.136 * century)
+    apparent_longitude = numpy.radians(
+        numpy.degrees(mean_longitude) + center - 0.00569 - 0.00478 * numpy.sin(omega)
+    )
+    mean_obliquity = 23.0 + (
+        26.0 + (21.448 - century * (46.815 + century * (0.00059 - century * 0.001813))) / 60.0
+    ) / 60.0
+    obliquity = numpy.radians(mean_obliquity + 0.00256 * numpy.cos(omega))
+
+    declination = numpy.arcsin(numpy.sin(obliquity) * numpy.sin(apparent_longitude))
+    var_y = numpy.tan(obliquity / 2.0) ** 2
+    equation_of_time = 4.0 * numpy.degrees(
+        var_y * numpy.sin(2.0 * mean_longitude)
+        - 2.0 * eccentricity * numpy.sin(mean_anomaly)
+        + 4.0 * eccentricity * var_y * numpy.sin(mean_anomaly) * numpy.cos(2.0 * mean_longitude)
+        - 0.5 * var_y * var_y * numpy.sin(4.0 * mean_longitude)
+        - 1.25 * eccentricity * eccentricity * numpy.sin(2.0 * mean_anomaly)
+    )
+
+    return declination, equation_of_time
+
+
+def compute_hour_angles(latitude, declination, zenith):
+    """
+    Compute hour angles when sun reaches specified zenith
+
+    Args:
+        latitude (float): latitude (in degrees)
+        declination (numpy.ndarray): solar declinations (radians)
+        zenith (float): sun zenith (in degrees)
+
+    Returns:
+        numpy.ndarray: hour angles in degrees (NaN if sun does not reach zenith this day)
+    """
+    latitude = numpy.radians(latitude)
+    cos_hour_angle = numpy.cos(numpy.radians(zenith)) / (
+        numpy.cos(latitude) * numpy.cos(declination)
+    ) - numpy.tan(latitude) * numpy.tan(declination)
+    with numpy.errstate(invalid="ignore"):
+        return numpy.degrees(numpy.arccos(cos_hour_angle))
+
+
+def compute_solar_positions(timestamps, latitude, longitude):
+    """
+    Compute sun position at many instants at once
+
+    Elevation is the geometric elevation (atmospheric refraction is not taken into
+    account).
+
+    Args:
+        timestamps (list|numpy.ndarray): utc timestamps
+        latitude (float): latitude (in degrees)
+        longitude (float): longitude (in degrees, east positive)
+
+    Returns:
+        tuple: azimuth (degrees clockwise from north) and elevation (degrees) arrays
+    """
+    timestamps = numpy.asarray(timestamps, dtype=numpy.float64)
+    declination, equation_of_time = compute_solar_terms_at(
+        timestamps / 86400.0 + EPOCH_JULIAN_DAY
+    )
+    true_solar_time = (timestamps % 86400.0) / 60.0 + equation_of_time + 4.0 * longitude
+    hour_angle = numpy.radians(true_solar_time / 4.0 - 180.0)
+    latitude = numpy.radians(latitude)
+
+    cos_zenith = numpy.sin(latitude) * numpy.sin(declination) + numpy.cos(
+        latitude
+    ) * numpy.cos(declination) * numpy.cos(hour_angle)
+    elevation = 90.0 - numpy.degrees(numpy.arccos(numpy.clip(cos_zenith, -1.0, 1.0)))
+    azimuth = (
+        numpy.degrees(
+            numpy.arctan2(
+                numpy.sin(hour_angle),
+                numpy.cos(hour_angle) * numpy.sin(latitude)
+                - numpy.tan(declination) * numpy.cos(latitude),
+            )
+        )
+        + 180.0
+    ) % 360.0
+
+    return azimuth, elevation
+
+
+def compute_solar_events(day_numbers, latitude, longitude):
+    """
+    Compute all solar events (twilights, sunrise, sunset, golden hour and solar noon) of many
+    days in a single pass
+
+    Declination, equation of time and solar noon are computed once and shared by all
+    events, hour angles are computed once per zenith (dawn and dusk share it).
+
+    Args:
+        day_numbers (numpy.ndarray): days since 1970-01-01
+        latitude (float|numpy.ndarray): latitude (or latitude of each day)
+        longitude (float|numpy.ndarray): longitude (or longitude of each day)
+
+    Returns:
+        dict: utc timestamps arrays by event name (NaN if event does not occur this day)
+    """
+    declination, equation_of_time = compute_solar_terms(day_numbers, longitude)
+    # solar noon in utc minutes since 1970-01-01
+    noon = day_numbers * 1440.0 + 720.0 - 4.0 * longitude - equation_of_time
+
+    events = {"solar_noon": noon * 60.0}
+    hour_angles = {}
+    for name, zenith, side in SOLAR_EVENTS:
+        if zenith not in hour_angles:
+            hour_angles[zenith] = compute_hour_angles(latitude, declination, zenith)
+        events[name] = (noon + side * 4.0 * hour_angles[zenith]) * 60.0
+
+    return events
+
+
+def compute_positions_solar_events(latitudes, longitudes, days):
+    """
+    Compute solar events of many positions in a single vectorized pass, each position at
+    its own day
+
+    Args:
+        latitudes (list): latitudes
+        longitudes (list): longitudes
+        days (list): day (date) of each position
+
+    Returns:
+        list: for each position, utc timestamp (or None if event does not occur this day) by
+              event name (see SOLAR_EVENTS_NAMES)
+    """
+    events = compute_solar_events(
+        numpy.array([day.toordinal() - EPOCH_ORDINAL for day in days], dtype=numpy.float64),
+        numpy.asarray(latitudes, dtype=numpy.float64),
+        numpy.asarray(longitudes, dtype=numpy.float64),
+    )
+    return [
+        {
+            name: None if numpy.isnan(events[name][index]) else float(events[name][index])
+            for name in SOLAR_EVENTS_NAMES
+        }
+        for index in range(len(days))
+    ]
+
+
+def compute_day_solar_terms(julian_day):
+    """
+    Compute solar declination and equation of time at a single instant (NOAA algorithm)
+
+    Same computation as compute_solar_terms_at with math module, so computing a single day
+    does not import numpy.
+
+    Args:
+        julian_day (float): julian day
+
+    Returns:
+        tuple: declination (radians) and equation of time (minutes)
+    """
+    century = (julian_day - 2451545.0) / 36525.0
+
+    mean_longitude = math.radians(
+        (280.46646 + century * (36000.76983 + century * 0.0003032)) % 360.0
+    )
+    mean_anomaly = math.radians(357.52911 + century * (35999.05029 - 0.0001537 * century))
+    eccentricity = 0.016708634 - century * (0.000042037 + 0.0000001267 * century)
+    center = (
+        math.sin(mean_anomaly) * (1.914602 - century * (0.004817 + 0.000014 * century))
+        + math.sin(2.0 * mean_anomaly) * (0.019993 - 0.000101 * century)
+        + math.sin(3.0 * mean_anomaly) * 0.000289
+    )
+    omega = math.radians(125.04 - 1934.136 * century)
+    apparent_longitude = math.radians(
+        math.degrees(mean_longitude) + center - 0.00569 - 0.00478 * math.sin(omega)
+    )
+    mean_obliquity = 23.0 + (
+        26.0 + (21.448 - century * (46.815 + century * (0.00059 - century * 0.001813))) / 60.0
+    ) / 60.0
+    obliquity = math.radians(mean_obliquity + 0.00256 * math.cos(omega))
+
+    declination = math.asin(math.sin(obliquity) * math.sin(apparent_longitude))
+    var_y = math.tan(obliquity / 2.0) ** 2
+    equation_of_time = 4.0 * math.degrees(
+        var_y * math.sin(2.0 * mean_longitude)
+        - 2.0 * eccentricity * math.sin(mean_anomaly)
+        + 4.0 * eccentricity * var_y * math.sin(mean_anomaly) * math.cos(2.0 * mean_longitude)
+        - 0.5 * var_y * var_y * math.sin(4.0 * mean_longitude)
+        - 1.25 * eccentricity * eccentricity * math.sin(2.0 * mean_anomaly)
+    )
+
+    return declination, equation_of_time
+
+
+def compute_day_solar_events(latitude, longitude, day):
+    """
+    Compute solar events of a single day
+
+    Scalar version of compute_solar_events (math module only): sun times of current day are
+    computed at each boot, numpy is only imported for sun tables and sun positions.
+
+    Args:
+        latitude (float): latitude
+        longitude (float): longitude
+        day (date): day
+
+    Returns:
+        dict: utc timestamp (or None if event does not occur this day) by event name
+    """
+    day_number = day.toordinal() - EPOCH_ORDINAL
+    declination, equation_of_time = compute_day_solar_terms(
+        day_number + 0.5 - longitude / 360.0 + EPOCH_JULIAN_DAY
+    )
+    # solar noon in utc minutes since 1970-01-01
+    noon = day_number * 1440.0 + 720.0 - 4.0 * longitude - equation_of_time
+    latitude = math.radians(latitude)
+
+    events = {"solar_noon": noon * 60.0}
+    for name, zenith, side in SOLAR_EVENTS:
+        cos_hour_angle = math.cos(math.radians(zenith)) / (
+            math.cos(latitude) * math.cos(declination)
+        ) - math.tan(latitude) * math.tan(declination)
+        if not -1.0 <= cos_hour_angle <= 1.0:
+            # sun does not reach zenith this day
+            events[name] = None
+            continue
+        hour_angle = math.degrees(math.acos(cos_hour_angle))
+        events[name] = (noon + side * 4.0 * hour_angle) * 60.0
+
+    return {name: events[name] for name in SOLAR_EVENTS_NAMES}
+
+
+class SunTable:
+    """
+    Solar events of a whole year at a position
+
+    All days are computed at once with vectorized NOAA algorithm, then any day is read in
+    constant time. Times are utc timestamps, NaN when event does not occur this day (polar
+    day or night).
+    """
+
+    def __init__(self, latitude, longitude, year):
+        """
+        Constructor
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            year (int): year
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.year = year
+        self.__first_ordinal = datetime.date(year, 1, 1).toordinal()
+        days_count = datetime.date(year + 1, 1, 1).toordinal() - self.__first_ordinal
+        day_numbers = numpy.arange(days_count, dtype=numpy.float64) + (
+            self.__first_ordinal - EPOCH_ORDINAL
+        )
+
+        self.events = compute_solar_events(day_numbers, latitude, longitude)
+
+    def __len__(self):
+        return len(self.events["solar_noon"])
+
+    def get_day(self, day):
+        """
+        Return solar events of specified day
+
+        Args:
+            day (date): day of table year
+
+        Returns:
+            dict: utc timestamp (or None if event does not occur this day) by event name
+                  (see SOLAR_EVENTS_NAMES)
+
+        Raises:
+            ValueError: if day is not in table year
+        """
+        if day.year != self.year:
+            raise ValueError(f"Day {day} is not in {self.year}")
+        index = day.toordinal() - self.__first_ordinal
+        day_events = {}
+        for name in SOLAR_EVENTS_NAMES:
+            value = self.events[name][index]
+            day_events[name] = None if numpy.isnan(value) else float(value)
+        return day_events
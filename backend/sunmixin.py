@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import datetime
+import functools
+from pytz import utc
+from cleep.exception import CommandError
+from .suntimes import SunTimes
+from .solar import SOLAR_EVENTS_NAMES, compute_solar_positions
+
+
+class SunMixin:
+    """
+    Parameters sun commands: solar events (twilights, sunrise, sunset...) at configured
+    position, their scheduling and sun position
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.sunset = None
+        self.sunrise = None
+        self.sun_times = dict.fromkeys(SOLAR_EVENTS_NAMES)
+        self.suns = {}
+        for name in SOLAR_EVENTS_NAMES:
+            self.suns.update({name: 0, f"{name}_iso": ""})
+
+    def get_sun(self):
+        """
+        Return today solar events
+
+        Returns:
+            dict: solar events timestamps (0 if event does not occur today) and local
+                  datetimes in iso 8601 format (<event>_iso)::
+
+                {
+                    astronomical_dawn (int): sun 18 degrees below horizon (morning)
+                    nautical_dawn (int): sun 12 degrees below horizon (morning)
+                    civil_dawn (int): sun 6 degrees below horizon (morning)
+                    sunrise (int)
+                    golden_hour_end (int): sun 6 degrees above horizon (morning)
+                    solar_noon (int)
+                    golden_hour_start (int): sun 6 degrees above horizon (evening)
+                    sunset (int)
+                    civil_dusk (int): sun 6 degrees below horizon (evening)
+                    nautical_dusk (int): sun 12 degrees below horizon (evening)
+                    astronomical_dusk (int): sun 18 degrees below horizon (evening)
+                    ...
+                }
+
+        """
+        return self.suns
+
+    def get_sun_times(self, start_date, end_date):
+        """
+        Return sun times of each day of specified range at configured position
+
+        Args:
+            start_date (str): first day (iso format YYYY-MM-DD)
+            end_date (str): last day included (iso format YYYY-MM-DD)
+
+        Returns:
+            list: solar events of each day (see get_sun), None values if event does not occur
+                  this day::
+
+                [
+                    {
+                        date (str): day (iso format)
+                        sunrise (int): sunrise timestamp
+                        sunrise_iso (str): sunrise datetime in iso 8601 format
+                        sunset (int): sunset timestamp
+                        sunset_iso (str): sunset datetime in iso 8601 format
+                        ...
+                    },
+                    ...
+                ]
+
+        Raises:
+            InvalidParameter: if dates are invalid or range is too large
+        """
+        start, end = self._parse_days_range(start_date, end_date, self.SUN_TIMES_MAX_DAYS)
+
+        return self.solar.get_days(
+            self._get_config_field("position"), start, end, self._get_utc_offsets()
+        )
+
+    def get_solar_position(self, timestamps):
+        """
+        Return sun position at configured position for each specified timestamp
+
+        All positions are computed at once, so a whole day at 1 minute resolution can be
+        sampled with a single call.
+
+        Args:
+            timestamps (list): utc timestamps (int or float)
+
+        Returns:
+            list: sun position at each timestamp (same order)::
+
+                [
+                    {
+                        timestamp (int|float): timestamp
+                        azimuth (float): azimuth in degrees (clockwise from north)
+                        elevation (float): elevation in degrees (negative below horizon)
+                    },
+                    ...
+                ]
+
+        Raises:
+            InvalidParameter: if timestamps are invalid
+            CommandError: if position is not configured
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "timestamps",
+                    "type": list,
+                    "value": timestamps,
+                    "validator": lambda val: 0 < len(val) <= self.SOLAR_POSITION_MAX_SAMPLES
+                    and all(
+                        isinstance(timestamp, (int, float))
+                        and not isinstance(timestamp, bool)
+                        for timestamp in val
+                    ),
+                    "message": 'Parameter "timestamps" must be a list of 1 to '
+                    f"{self.SOLAR_POSITION_MAX_SAMPLES} timestamps",
+                },
+            ]
+        )
+        position = self._get_config_field("position")
+        if not SunTimes.is_specified(position):
+            raise CommandError("Position is not configured")
+
+        azimuths, elevations = compute_solar_positions(
+            timestamps,
+            position["latitude"],
+            position["longitude"],
+        )
+        return [
+            {"timestamp": timestamp, "azimuth": azimuth, "elevation": elevation}
+            for timestamp, azimuth, elevation in zip(
+                timestamps, azimuths.round(3).tolist(), elevations.round(3).tolist()
+            )
+        ]
+
+    def set_sun(self):
+        """
+        Compute today solar events (twilights, sunrise, sunset...) according to configured
+        position
+        """
+        position = self._get_config_field("position")
+        self._apply_sun(self.solar.compute_day(position, self.timezone or utc))
+
+    def _apply_sun(self, sun_times):
+        """
+        Store solar events in configured timezone
+
+        Args:
+            sun_times (dict): solar events timestamps (see SunTimes.compute_day)
+        """
+        self.sun_times = sun_times
+        self.sunrise = None
+        self.sunset = None
+        if sun_times["sunrise"] is not None:
+            self.sunrise = datetime.datetime.fromtimestamp(
+                sun_times["sunrise"], self.timezone
+            )
+        if sun_times["sunset"] is not None:
+            self.sunset = datetime.datetime.fromtimestamp(
+                sun_times["sunset"], self.timezone
+            )
+        self.logger.debug("Found sunrise:%s sunset:%s", self.sunrise, self.sunset)
+
+        # save times (0 if event does not occur today)
+        for name, value in self.solar.format(sun_times, self._get_utc_offsets()).items():
+            self.suns[name] = value or (0 if name in sun_times else "")
+
+        self._schedule_sun_events()
+
+    def _schedule_sun_events(self):
+        """
+        Schedule today next solar events and sun times refresh event
+        """
+        now = time.time()
+        for name in SOLAR_EVENTS_NAMES:
+            # events of current day only, next ones are scheduled after refresh
+            timestamp = self.sun_times.get(name)
+            if timestamp is not None and timestamp > now:
+                self.event_scheduler.schedule(
+                    name, timestamp, functools.partial(self.__on_solar_event, name)
+                )
+            else:
+                self.event_scheduler.cancel(name)
+
+        # refresh is never dropped, otherwise no sun event would be scheduled anymore
+        self.event_scheduler.schedule(
+            "sun",
+            self.__get_next_sun_refresh(now),
+            self.__on_sun_refresh,
+            droppable=False,
+        )
+
+    def __get_next_sun_refresh(self, now):
+        """
+        Return timestamp of next sun times refresh (SUN_REFRESH_TIME local time)
+
+        Args:
+            now (float): current timestamp
+
+        Returns:
+            float: next sun times refresh timestamp
+        """
+        local_now = self._get_utc_offsets().to_local(now)
+        day = local_now.date()
+        while True:
+            refresh = self.timezone.localize(
+                datetime.datetime.combine(day, datetime.time(*self.SUN_REFRESH_TIME))
+            ).timestamp()
+            if refresh > now:
+                return refresh
+            day += datetime.timedelta(days=1)
+
+    def _on_events_dropped(self, names):
+        """
+        Scheduled events dropped because system time jumped forward, schedule sun events
+        again
+
+        Args:
+            names (list): dropped events names
+        """
+        self.logger.info("Events %s dropped, schedule sun events again", names)
+        self.set_sun()
+
+    def __on_solar_event(self, name):
+        """
+        Solar event scheduled
+
+        Args:
+            name (str): solar event name
+        """
+        self.time_solar_events[name].send(device_id=self._clock_uuid)
+
+    def __on_sun_refresh(self):
+        """
+        Sun times refresh event scheduled
+        """
+        self.set_sun()
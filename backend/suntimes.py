@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import datetime
+from .solar import (
+    SunTable,
+    SOLAR_EVENTS_NAMES,
+    compute_day_solar_events,
+    compute_positions_solar_events,
+)
+
+
+class SunTimes:
+    """
+    Solar events (twilights, sunrise, sunset...) of positions
+
+    Current day of a single position is computed without numpy. Ranges of days use yearly
+    sun tables (kept in specified cache) and many positions are computed in a single
+    vectorized pass.
+
+    Position with 0 latitude or longitude is considered unspecified: its events are all None.
+    """
+
+    def __init__(self, tables_cache):
+        """
+        Constructor
+
+        Args:
+            tables_cache (LruCache): yearly sun tables cache
+        """
+        self.tables_cache = tables_cache
+
+    @staticmethod
+    def is_specified(position):
+        """
+        Check if position is specified
+
+        Args:
+            position (dict): position
+
+        Returns:
+            bool: True if position is specified
+        """
+        return position["latitude"] != 0 and position["longitude"] != 0
+
+    def get_table(self, position, year):
+        """
+        Return sun table of specified year at specified position, computing it if necessary
+
+        Args:
+            position (dict): position
+            year (int): year
+
+        Returns:
+            SunTable: sun table
+        """
+        key = (position["latitude"], position["longitude"], year)
+        table = self.tables_cache.get(key)
+        if table is None:
+            table = SunTable(position["latitude"], position["longitude"], year)
+            self.tables_cache.set(key, table)
+        return table
+
+    def get_days(self, position, start, end, utc_offsets):
+        """
+        Return formatted solar events of each day of specified range
+
+        Args:
+            position (dict): position
+            start (date): first day
+            end (date): last day included
+            utc_offsets (UtcOffsetCache): utc offsets of local timezone
+
+        Returns:
+            list: formatted solar events (see format) with day (date) in iso format
+        """
+        days = []
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            day = datetime.date.fromordinal(ordinal)
+            times = self.get_table(position, day.year).get_day(day)
+            days.append({"date": day.isoformat(), **self.format(times, utc_offsets)})
+        return days
+
+    def compute_day(self, position, local_timezone):
+        """
+        Compute current day solar events at specified position
+
+        Args:
+            position (dict): position
+            local_timezone (tzinfo): timezone used to get current day
+
+        Returns:
+            dict: utc timestamp (or None if event does not occur) by event name (see
+                  SOLAR_EVENTS_NAMES)
+        """
+        if not self.is_specified(position):
+            return dict.fromkeys(SOLAR_EVENTS_NAMES)
+
+        today = datetime.datetime.fromtimestamp(time.time(), local_timezone).date()
+        return compute_day_solar_events(position["latitude"], position["longitude"], today)
+
+    def compute_positions(self, positions, local_timezones):
+        """
+        Compute current day solar events of many positions in a single pass, each position
+        at its own current day
+
+        Args:
+            positions (list): positions
+            local_timezones (list): timezone of each position
+
+        Returns:
+            list: solar events (see compute_day) of each position
+        """
+        specified = [
+            index for index, position in enumerate(positions) if self.is_specified(position)
+        ]
+        sun_times = [dict.fromkeys(SOLAR_EVENTS_NAMES) for _ in positions]
+        if not specified:
+            return sun_times
+
+        now = time.time()
+        solar_events = compute_positions_solar_events(
+            [positions[index]["latitude"] for index in specified],
+            [positions[index]["longitude"] for index in specified],
+            [
+                datetime.datetime.fromtimestamp(now, local_timezones[index]).date()
+                for index in specified
+            ],
+        )
+        for index, events in zip(specified, solar_events):
+            sun_times[index] = events
+        return sun_times
+
+    @staticmethod
+    def format(times, utc_offsets):
+        """
+        Format solar events with local iso datetimes
+
+        Args:
+            times (dict): utc timestamps (or None) by event name
+            utc_offsets (UtcOffsetCache): utc offsets of local timezone
+
+        Returns:
+            dict: for each event, timestamp (int) and iso datetime (<event>_iso)
+        """
+        formatted = {}
+        for name, timestamp in times.items():
+            if timestamp is None:
+                formatted[name] = None
+                formatted[f"{name}_iso"] = None
+                continue
+            formatted[name] = int(timestamp)
+            formatted[f"{name}_iso"] = utc_offsets.to_local(int(timestamp)).isoformat()
+        return formatted
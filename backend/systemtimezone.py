@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import logging
+from cleep.libs.internals.console import Console
+
+
+class SystemTimezone:
+    """
+    Configure system timezone (/etc/localtime and /etc/timezone)
+
+    Timezone is switched without subprocess: new /etc/localtime symlink and /etc/timezone file
+    are created aside then renamed over current ones, so system always has a valid timezone
+    configuration. Tzdata package reconfiguration (slow) is only used as fallback.
+    """
+
+    def __init__(
+        self,
+        cleep_filesystem,
+        zoneinfo_dir="/usr/share/zoneinfo/",
+        localtime="/etc/localtime",
+        timezone_file="/etc/timezone",
+    ):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            zoneinfo_dir (str, optional): system zoneinfo directory
+            localtime (str, optional): system localtime file
+            timezone_file (str, optional): system timezone file
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.zoneinfo_dir = zoneinfo_dir
+        self.localtime = localtime
+        self.timezone_file = timezone_file
+
+    def get_zoneinfo(self, timezone_name):
+        """
+        Return zoneinfo file of specified timezone
+
+        Args:
+            timezone_name (str): timezone name
+
+        Returns:
+            str: zoneinfo file path or None if it does not exist
+        """
+        zoneinfo = os.path.join(self.zoneinfo_dir, timezone_name)
+        self.logger.debug("Checking zoneinfo file: %s", zoneinfo)
+        return zoneinfo if os.path.exists(zoneinfo) else None
+
+    def is_applied(self, timezone_name):
+        """
+        Check if specified timezone is system one
+
+        Args:
+            timezone_name (str): timezone name
+
+        Returns:
+            bool: True if system localtime targets timezone zoneinfo file
+        """
+        zoneinfo = os.path.join(self.zoneinfo_dir, timezone_name)
+        return os.path.realpath(self.localtime) == os.path.realpath(zoneinfo)
+
+    def apply(self, timezone_name, zoneinfo):
+        """
+        Configure system with specified timezone
+
+        Args:
+            timezone_name (str): timezone name
+            zoneinfo (str): timezone zoneinfo file path
+
+        Returns:
+            bool: True if system timezone is configured, False otherwise
+        """
+        return self.__switch(timezone_name, zoneinfo) or self.__reconfigure(timezone_name)
+
+    def __switch(self, timezone_name, zoneinfo):
+        """
+        Switch system timezone files
+
+        Args:
+            timezone_name (str): timezone name
+            zoneinfo (str): timezone zoneinfo file path
+
+        Returns:
+            bool: True if system timezone is switched, False otherwise
+        """
+        localtime_tmp = f"{self.localtime}.tmp"
+        timezone_tmp = f"{self.timezone_file}.tmp"
+        try:
+            self.logger.debug('Linking "%s" to "%s"', self.localtime, zoneinfo)
+            if not self.cleep_filesystem.ln(
+                zoneinfo, localtime_tmp, force=True
+            ) or not self.cleep_filesystem.move(localtime_tmp, self.localtime):
+                self.logger.warning('Unable to switch "%s"', self.localtime)
+                return False
+
+            self.logger.debug(
+                'Writing timezone "%s" in "%s"', timezone_name, self.timezone_file
+            )
+            if not self.cleep_filesystem.write_data(
+                timezone_tmp, f"{timezone_name}"
+            ) or not self.cleep_filesystem.move(timezone_tmp, self.timezone_file):
+                self.logger.warning('Unable to switch "%s"', self.timezone_file)
+                return False
+        except Exception:
+            self.logger.exception("Error switching system timezone")
+            return False
+
+        return True
+
+    def __reconfigure(self, timezone_name):
+        """
+        Configure system timezone using tzdata package reconfiguration (slow)
+
+        Args:
+            timezone_name (str): timezone name
+
+        Returns:
+            bool: True if system timezone is configured, False otherwise
+        """
+        self.cleep_filesystem.rm(self.localtime)
+
+        self.logger.debug(
+            'Writing timezone "%s" in "%s"', timezone_name, self.timezone_file
+        )
+        if not self.cleep_filesystem.write_data(
+            self.timezone_file, f"{timezone_name}"
+        ):
+            self.logger.error(
+                'Unable to write timezone data on "%s". System timezone is not configured!',
+                self.timezone_file,
+            )
+            return False
+
+        # launch timezone update in background
+        self.logger.debug("Updating system timezone")
+        command = Console()
+        res = command.command("dpkg-reconfigure -f noninteractive tzdata", timeout=60.0)
+        self.logger.debug("Timezone update command result: %s", res)
+        if res["returncode"] != 0:
+            self.logger.error("Error reconfiguring system timezone: %s", res["stderr"])
+            return False
+
+        return True
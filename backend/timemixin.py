@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+from cleep.exception import InvalidParameter
+from .timesnapshot import TimeSnapshot, get_minute_key
+from .utcoffsetcache import UtcOffsetCache, EPOCH
+
+
+class TimeMixin:
+    """
+    Parameters time commands: current time, time events (sent by time ticker) and their
+    subscriptions
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__time_snapshot = None
+        self.__utc_offsets = None
+        self.__last_utc_offset = None
+
+    def _get_time_snapshot(self):
+        """
+        Return time snapshot of current minute, computing it only if necessary
+
+        Returns:
+            TimeSnapshot: current time snapshot
+        """
+        utc_now = datetime.datetime.utcnow()
+        snapshot = self.__time_snapshot
+        if snapshot is None or not snapshot.is_valid(
+            get_minute_key(utc_now),
+            self._get_utc_offsets(),
+            self.suns["sunrise"],
+            self.suns["sunset"],
+        ):
+            snapshot = self.__build_time_snapshot(utc_now)
+        return snapshot
+
+    def __build_time_snapshot(self, utc_now):
+        """
+        Compute and store new time snapshot
+
+        Args:
+            utc_now (datetime): naive utc datetime
+
+        Returns:
+            TimeSnapshot: new time snapshot
+        """
+        snapshot = TimeSnapshot(
+            utc_now,
+            self._get_utc_offsets(),
+            self.suns["sunrise"],
+            self.suns["sunset"],
+        )
+        self.__time_snapshot = snapshot
+        return snapshot
+
+    def _get_utc_offsets(self):
+        """
+        Return utc offset cache of local timezone, rebuilding it if timezone changed
+
+        Returns:
+            UtcOffsetCache: utc offset cache
+        """
+        utc_offsets = self.__utc_offsets
+        if utc_offsets is None or utc_offsets.timezone is not self.timezone:
+            utc_offsets = UtcOffsetCache(self.timezone)
+            self.__utc_offsets = utc_offsets
+        return utc_offsets
+
+    def __check_utc_offset(self, utc_offsets, offset):
+        """
+        Send offset changed event if utc offset of local timezone changed since last tick
+        (DST transition). Timezone changes are not reported.
+
+        Args:
+            utc_offsets (UtcOffsetCache): utc offset cache of local timezone
+            offset (int): current utc offset (in seconds)
+        """
+        previous = self.__last_utc_offset
+        self.__last_utc_offset = (utc_offsets, offset)
+        if previous is None or previous[0] is not utc_offsets or previous[1] == offset:
+            return
+
+        self.logger.info(
+            "UTC offset of %s changed from %s to %s",
+            utc_offsets.zone,
+            previous[1],
+            offset,
+        )
+        self.time_offsetchanged_event.send(
+            params={
+                "timezone": utc_offsets.zone,
+                "offset": offset,
+                "previous_offset": previous[1],
+            },
+            device_id=self._clock_uuid,
+        )
+
+    def _send_time_tick(self, timestamp, resolutions):
+        """
+        Send time tick event
+
+        Args:
+            timestamp (int): tick timestamp
+            resolutions (list): subscribed resolutions reached by this tick
+        """
+        self.time_tick_event.send(
+            params={
+                "timestamp": timestamp,
+                "iso": self._get_utc_offsets().to_local(timestamp).isoformat(),
+                "resolutions": resolutions,
+            },
+            device_id=self._clock_uuid,
+        )
+
+    def _time_task(self):
+        """
+        Time task used to refresh time
+        """
+        utc_now = datetime.datetime.utcnow()
+        if self.time_subscriptions.has_resolution(60):
+            snapshot = self.__build_time_snapshot(utc_now)
+            self.logger.trace("now_formatted: %s", snapshot.time)
+
+            # send now event
+            self.time_now_event.send(params=snapshot.event, device_id=self._clock_uuid)
+            utc_offsets = snapshot.utc_offsets
+            offset = snapshot.offset
+            timestamp = snapshot.time["timestamp"]
+        else:
+            # nobody listens time event, do not build its payload
+            timestamp = (utc_now - EPOCH).total_seconds()
+            utc_offsets = self._get_utc_offsets()
+            offset = utc_offsets.get_offset(timestamp)
+
+        # send offset changed event
+        self.__check_utc_offset(utc_offsets, offset)
+
+        self.timestamp_checkpoint.update(timestamp)
+
+    def subscribe_time_events(self, resolution=60):
+        """
+        Subscribe to time events
+
+        Time events are sent by a single time task at the smallest subscribed resolution:
+        parameters.time.now event each minute and parameters.time.tick event for smaller
+        resolutions (only when subscribed).
+
+        Subscription is leased for TIME_SUBSCRIPTION_LEASE seconds and must be renewed with
+        renew_time_subscription before, otherwise it is dropped.
+
+        Args:
+            resolution (int, optional): time events resolution in seconds (1, 10 or 60).
+                                        Defaults to 60
+
+        Returns:
+            str: subscription id (to unsubscribe)
+
+        Raises:
+            InvalidParameter: if resolution is invalid
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "resolution",
+                    "type": int,
+                    "value": resolution,
+                    "validator": lambda val: val in self.TIME_EVENTS_RESOLUTIONS,
+                    "message": f'Parameter "resolution" must be one of {self.TIME_EVENTS_RESOLUTIONS}',
+                },
+            ]
+        )
+
+        subscription_id = self.time_subscriptions.add(
+            resolution, self.TIME_SUBSCRIPTION_LEASE
+        )
+        self.time_ticker.subscribed(resolution)
+
+        return subscription_id
+
+    def unsubscribe_time_events(self, subscription_id):
+        """
+        Unsubscribe from time events
+
+        Args:
+            subscription_id (str): subscription id returned by subscribe_time_events
+
+        Returns:
+            bool: True if unsubscribed
+
+        Raises:
+            InvalidParameter: if subscription does not exist
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "subscription_id",
+                    "type": str,
+                    "value": subscription_id,
+                },
+            ]
+        )
+
+        if not self.time_subscriptions.remove(subscription_id):
+            raise InvalidParameter(f'Subscription "{subscription_id}" does not exist')
+        return True
+
+    def renew_time_subscription(self, subscription_id):
+        """
+        Renew time events subscription lease
+
+        Args:
+            subscription_id (str): subscription id returned by subscribe_time_events
+
+        Returns:
+            bool: True if renewed
+
+        Raises:
+            InvalidParameter: if subscription does not exist or expired
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "subscription_id",
+                    "type": str,
+                    "value": subscription_id,
+                },
+            ]
+        )
+
+        if not self.time_subscriptions.renew(subscription_id):
+            raise InvalidParameter(f'Subscription "{subscription_id}" does not exist')
+        return True
+
+    def get_time(self):
+        """
+        Return current time
+
+        Returns:
+            dict: current time::
+
+                {
+                    timestamp (int): current timestamp
+                    iso (string): current datetime in iso 8601 format
+                    year (int)
+                    month (int)
+                    day (int)
+                    hour (int)
+                    minute (int)
+                    weekday (int): 0=monday, 1=tuesday... 6=sunday
+                    weekday_literal (string): english literal weekday value (monday, tuesday, ...)
+                }
+
+            Returned data is shared and read-only, it is refreshed every minute.
+        """
+        return self._get_time_snapshot().time
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from .frozendict import FrozenDict
+from .utcoffsetcache import EPOCH
+
+WEEKDAY_LITERALS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def get_minute_key(utc_now):
+    """
+    Return key identifying the minute of specified datetime
+
+    Args:
+        utc_now (datetime): naive utc datetime
+
+    Returns:
+        int: number of minutes since 0001-01-01
+    """
+    return utc_now.toordinal() * 1440 + utc_now.hour * 60 + utc_now.minute
+
+
+class TimeSnapshot:
+    """
+    Immutable time infos computed once per minute
+
+    Payloads are read-only mappings so they can be shared by time event, get_time command
+    and clock device without being copied.
+    """
+
+    __slots__ = (
+        "minute_key",
+        "utc_offsets",
+        "offset",
+        "sunrise",
+        "sunset",
+        "time",
+        "event",
+    )
+
+    def __init__(self, utc_now, utc_offsets, sunrise, sunset):
+        """
+        Constructor
+
+        Args:
+            utc_now (datetime): naive utc datetime
+            utc_offsets (UtcOffsetCache): utc offset cache of local timezone
+            sunrise (int): sunrise timestamp
+            sunset (int): sunset timestamp
+        """
+        timestamp = (utc_now - EPOCH).total_seconds()
+        local_now = utc_offsets.to_local(timestamp)
+        weekday = local_now.weekday()
+
+        self.minute_key = get_minute_key(utc_now)
+        self.utc_offsets = utc_offsets
+        self.offset = utc_offsets.get_offset(timestamp)
+        self.sunrise = sunrise
+        self.sunset = sunset
+        self.time = FrozenDict(
+            timestamp=timestamp,
+            iso=local_now.isoformat(),
+            year=local_now.year,
+            month=local_now.month,
+            day=local_now.day,
+            hour=local_now.hour,
+            minute=local_now.minute,
+            weekday=weekday,
+            weekday_literal=WEEKDAY_LITERALS[weekday],
+        )
+        self.event = FrozenDict(self.time, sunrise=sunrise, sunset=sunset)
+
+    def is_valid(self, minute_key, utc_offsets, sunrise, sunset):
+        """
+        Return True if snapshot can be reused
+
+        Args:
+            minute_key (int): current minute key (see get_minute_key)
+            utc_offsets (UtcOffsetCache): utc offset cache of current local timezone
+            sunrise (int): current sunrise timestamp
+            sunset (int): current sunset timestamp
+
+        Returns:
+            bool: True if snapshot was computed during the same minute with same parameters
+        """
+        return (
+            self.minute_key == minute_key
+            and self.utc_offsets is utc_offsets
+            and self.sunrise == sunrise
+            and self.sunset == sunset
+        )
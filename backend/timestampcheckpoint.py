@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import time
+import struct
+import logging
+import threading
+
+
+class TimestampCheckpoint:
+    """
+    Write-behind checkpoint of last known timestamp
+
+    Timestamp is updated in memory and only persisted (using writer function) every
+    interval seconds or when flush is explicitly called (at module stop).
+    """
+
+    def __init__(self, writer, interval):
+        """
+        Constructor
+
+        Args:
+            writer (function): function called with timestamp to persist it. It must return
+                               True if timestamp was saved successfully
+            interval (float): minimum delay (in seconds) between 2 writes
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.interval = interval
+        self.__writer = writer
+        self.__timestamp = None
+        self.__dirty = False
+        self.__last_flush = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def get(self):
+        """
+        Return last known timestamp
+
+        Returns:
+            float: last timestamp or None if never updated
+        """
+        return self.__timestamp
+
+    def update(self, timestamp):
+        """
+        Update timestamp, persist it if interval is elapsed since last write
+
+        Args:
+            timestamp (float): current timestamp
+
+        Returns:
+            bool: True if timestamp was persisted
+        """
+        with self.__lock:
+            self.__timestamp = timestamp
+            self.__dirty = True
+            if time.monotonic() - self.__last_flush < self.interval:
+                return False
+            return self.__flush()
+
+    def flush(self):
+        """
+        Persist timestamp if it changed since last write
+
+        Returns:
+            bool: True if timestamp is persisted
+        """
+        with self.__lock:
+            return self.__flush()
+
+    def __flush(self):
+        """
+        Persist timestamp (lock must be acquired)
+
+        Returns:
+            bool: True if timestamp is persisted
+        """
+        if not self.__dirty:
+            return True
+
+        # do not retry before next interval, even if write failed
+        self.__last_flush = time.monotonic()
+        if not self.__writer(self.__timestamp):
+            self.logger.warning("Unable to save timestamp checkpoint")
+            return False
+
+        self.__dirty = False
+        return True
+
+
+class TimestampFile:
+    """
+    Fixed-size file storing a single timestamp
+
+    File content is overwritten in place (8 bytes), which is lighter than rewriting the
+    whole json configuration file.
+    """
+
+    FORMAT = struct.Struct("<d")
+
+    def __init__(self, cleep_filesystem, path):
+        """
+        Constructor
+
+        Args:
+            cleep_filesystem (CleepFilesystem): CleepFilesystem instance
+            path (str): file path
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.path = path
+
+    def read(self):
+        """
+        Read timestamp from file
+
+        Returns:
+            float: stored timestamp or None if file does not exist or is invalid
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        fd = None
+        try:
+            fd = self.cleep_filesystem.open(self.path, "rb")
+            (timestamp,) = self.FORMAT.unpack(fd.read(self.FORMAT.size))
+            return timestamp
+        except Exception:
+            self.logger.exception('Unable to read timestamp file "%s"', self.path)
+            return None
+        finally:
+            if fd is not None:
+                self.cleep_filesystem.close(fd)
+
+    def write(self, timestamp):
+        """
+        Write timestamp to file, in place if file already exists
+
+        Args:
+            timestamp (float): timestamp to store
+
+        Returns:
+            bool: True if timestamp was written
+        """
+        mode = "r+b" if os.path.exists(self.path) else "wb"
+        fd = None
+        try:
+            fd = self.cleep_filesystem.open(self.path, mode)
+            fd.seek(0)
+            fd.write(self.FORMAT.pack(timestamp))
+            fd.flush()
+            return True
+        except Exception:
+            self.logger.exception('Unable to write timestamp file "%s"', self.path)
+            return False
+        finally:
+            if fd is not None:
+                self.cleep_filesystem.close(fd)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import uuid
+import threading
+
+
+class TimeSubscriptions:
+    """
+    Thread safe registry of time events subscriptions
+
+    Each subscription requests time events at a resolution (in seconds). Registry gives the
+    resolutions currently requested so a single tick source can serve all subscribers.
+
+    Subscription can be leased for a limited time: subscriber must renew it before its lease
+    expires, otherwise it is ignored and removed on next purge. This way a subscriber that
+    stopped without unsubscribing does not keep time events running forever.
+    """
+
+    def __init__(self, clock=None):
+        """
+        Constructor
+
+        Args:
+            clock (function, optional): function returning current time used for leases.
+                                        Defaults to time.monotonic
+        """
+        # subscription id: (resolution, lease duration, expiration)
+        self.__subscriptions = {}
+        self.__clock = clock or time.monotonic
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__subscriptions)
+
+    def add(self, resolution, lease=None):
+        """
+        Add subscription
+
+        Args:
+            resolution (int): time events resolution (in seconds)
+            lease (float, optional): subscription lease duration (in seconds). Subscription
+                                     never expires if None. Defaults to None
+
+        Returns:
+            str: subscription id
+        """
+        subscription_id = str(uuid.uuid4())
+        expiration = None if lease is None else self.__clock() + lease
+        with self.__lock:
+            self.__subscriptions[subscription_id] = (resolution, lease, expiration)
+        return subscription_id
+
+    def renew(self, subscription_id):
+        """
+        Renew subscription lease
+
+        Args:
+            subscription_id (str): subscription id
+
+        Returns:
+            bool: True if subscription exists and is not expired
+        """
+        now = self.__clock()
+        with self.__lock:
+            subscription = self.__subscriptions.get(subscription_id)
+            if subscription is None or self.__is_expired(subscription, now):
+                return False
+            resolution, lease, _ = subscription
+            expiration = None if lease is None else now + lease
+            self.__subscriptions[subscription_id] = (resolution, lease, expiration)
+            return True
+
+    def remove(self, subscription_id):
+        """
+        Remove subscription
+
+        Args:
+            subscription_id (str): subscription id
+
+        Returns:
+            bool: True if subscription existed
+        """
+        with self.__lock:
+            return self.__subscriptions.pop(subscription_id, None) is not None
+
+    def purge(self):
+        """
+        Remove expired subscriptions
+
+        Returns:
+            list: ids of removed subscriptions
+        """
+        now = self.__clock()
+        with self.__lock:
+            expired = [
+                subscription_id
+                for subscription_id, subscription in self.__subscriptions.items()
+                if self.__is_expired(subscription, now)
+            ]
+            for subscription_id in expired:
+                del self.__subscriptions[subscription_id]
+        return expired
+
+    def get_resolutions(self):
+        """
+        Return resolutions currently subscribed (expired subscriptions are ignored)
+
+        Returns:
+            set: set of resolutions (in seconds)
+        """
+        now = self.__clock()
+        with self.__lock:
+            return {
+                subscription[0]
+                for subscription in self.__subscriptions.values()
+                if not self.__is_expired(subscription, now)
+            }
+
+    def has_resolution(self, resolution):
+        """
+        Return True if specified resolution is subscribed
+
+        Args:
+            resolution (int): resolution (in seconds)
+
+        Returns:
+            bool: True if at least one not expired subscription uses this resolution
+        """
+        return resolution in self.get_resolutions()
+
+    @staticmethod
+    def __is_expired(subscription, now):
+        """
+        Return True if subscription lease expired
+
+        Args:
+            subscription (tuple): subscription (resolution, lease, expiration)
+            now (float): current time
+
+        Returns:
+            bool: True if expired
+        """
+        return subscription[2] is not None and subscription[2] <= now
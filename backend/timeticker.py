@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+import time
+import logging
+import threading
+
+
+class TimeTicker:
+    """
+    Single time task serving all time events subscriptions
+
+    Task runs on boundaries of smallest subscribed resolution (minute if no smaller resolution
+    is subscribed). Minute callback is called each minute and tick callback with subscribed
+    resolutions smaller than a minute whose boundary is reached.
+
+    Next run delay is computed from absolute time at each run, so task execution duration and
+    timer lateness are not accumulated. System time changes between two runs (NTP sync, time
+    restored at startup) are detected comparing elapsed system and monotonic times.
+    """
+
+    # timer can be fired a bit before its deadline, tolerance (in seconds) to consider
+    # deadline is reached
+    TOLERANCE = 0.05
+    # system time change (in seconds) between two runs considered as clock jump
+    CLOCK_JUMP_THRESHOLD = 30.0
+
+    def __init__(
+        self,
+        timer_factory,
+        subscriptions,
+        minute_callback,
+        tick_callback,
+        clock_jump_callback=None,
+    ):
+        """
+        Constructor
+
+        Args:
+            timer_factory (function): function returning a timer (with start and cancel methods)
+                                      from delay and callback parameters
+            subscriptions (TimeSubscriptions): time events subscriptions
+            minute_callback (function): function called (without parameter) each minute
+            tick_callback (function): function called with tick timestamp (int) and list of
+                                      reached subscribed resolutions
+            clock_jump_callback (function, optional): function called with system time
+                                                      change (in seconds) when clock jumped
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.subscriptions = subscriptions
+        self.__timer_factory = timer_factory
+        self.__minute_callback = minute_callback
+        self.__tick_callback = tick_callback
+        self.__clock_jump_callback = clock_jump_callback
+        self.__timer = None
+        self.__stopped = False
+        self.__resolution = None
+        self.__last_second = None
+        self.__last_clocks = None
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """
+        Start time task
+        """
+        with self.__lock:
+            self.__stopped = False
+        self.schedule()
+
+    def stop(self):
+        """
+        Stop time task
+        """
+        with self.__lock:
+            self.__stopped = True
+            if self.__timer:
+                self.__timer.cancel()
+
+    def subscribed(self, resolution):
+        """
+        Schedule time task again if specified resolution is smaller than current one
+
+        Args:
+            resolution (int): newly subscribed resolution (in seconds)
+        """
+        if self.__timer and resolution < self.__resolution:
+            # tick faster right now
+            self.schedule()
+
+    def schedule(self):
+        """
+        Schedule next run on next boundary of smallest subscribed resolution
+        """
+        with self.__lock:
+            if self.__stopped:
+                return
+            if self.__timer:
+                self.__timer.cancel()
+
+            resolution = min(self.subscriptions.get_resolutions() | {60})
+            now = time.time()
+            current = math.floor(now + self.TOLERANCE)
+            next_tick = (current // resolution + 1) * resolution
+            self.__resolution = resolution
+            self.__timer = self.__timer_factory(next_tick - now, self.run)
+            self.__timer.start()
+
+    def run(self):
+        """
+        Run minute callback (each minute) and send time ticks of subscribed resolutions, then
+        schedule next run
+        """
+        self.__check_clock_jump()
+        second = math.floor(time.time() + self.TOLERANCE)
+        last_second = self.__last_second
+        self.__last_second = second
+
+        def is_reached(resolution):
+            # boundary of resolution crossed since last run (handles late runs)
+            return last_second is None or second // resolution != last_second // resolution
+
+        try:
+            expired = self.subscriptions.purge()
+            if expired:
+                self.logger.debug("Expired time subscriptions removed: %s", expired)
+
+            if is_reached(60):
+                self.__minute_callback()
+
+            resolutions = [
+                resolution
+                for resolution in sorted(self.subscriptions.get_resolutions())
+                if resolution < 60 and is_reached(resolution)
+            ]
+            if resolutions:
+                self.__tick_callback(second, resolutions)
+        except Exception:
+            self.logger.exception("Error occured during time task")
+        finally:
+            self.schedule()
+
+    def __check_clock_jump(self):
+        """
+        Detect system time change since last run comparing elapsed system time with elapsed
+        monotonic time
+        """
+        now = time.time()
+        monotonic_now = time.monotonic()
+        last_clocks = self.__last_clocks
+        self.__last_clocks = (now, monotonic_now)
+        if last_clocks is None or not self.__clock_jump_callback:
+            return
+
+        jump = (now - last_clocks[0]) - (monotonic_now - last_clocks[1])
+        if abs(jump) > self.CLOCK_JUMP_THRESHOLD:
+            self.logger.info("System time changed by %ss", int(jump))
+            try:
+                self.__clock_jump_callback(jump)
+            except Exception:
+                self.logger.exception("Error occured handling clock jump")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import bisect
+import datetime
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class UtcOffsetCache:
+    """
+    UTC offset cache of a timezone
+
+    UTC offset of a timezone only changes at DST transitions (a few times a year), so the
+    transition table of the timezone is extracted once and the offset in use is kept until
+    the next transition. Local time is then computed with simple arithmetic instead of a
+    pytz conversion.
+    """
+
+    def __init__(self, local_timezone):
+        """
+        Constructor
+
+        Args:
+            local_timezone (tzinfo): pytz timezone
+        """
+        self.timezone = local_timezone
+        self.__transitions = []
+        self.__infos = []
+        # (start, end, offset, tzinfo) of selected offset, replaced in a single assignment
+        # so concurrent callers never see a partially updated window
+        self.__window = (float("inf"), float("-inf"), None, None)
+        self.__build()
+
+    @property
+    def zone(self):
+        """
+        Timezone name
+        """
+        return getattr(self.timezone, "zone", str(self.timezone))
+
+    def __build(self):
+        """
+        Build transition table from pytz timezone data
+        """
+        transition_times = getattr(self.timezone, "_utc_transition_times", None)
+        transition_infos = getattr(self.timezone, "_transition_info", None)
+        if not transition_times or not transition_infos:
+            # static timezone (UTC or fixed offset): no transition
+            utc_offset = self.timezone.utcoffset(EPOCH)
+            self.__transitions = [float("-inf")]
+            self.__infos = [(int(utc_offset.total_seconds()), self.timezone)]
+            return
+
+        tzinfos = getattr(self.timezone, "_tzinfos", {})
+        for transition_time, transition_info in zip(transition_times, transition_infos):
+            # first transition is datetime.min (all times before first real transition)
+            self.__transitions.append(
+                (transition_time - EPOCH).total_seconds()
+                if self.__transitions
+                else float("-inf")
+            )
+            utc_offset = int(transition_info[0].total_seconds())
+            tzinfo = tzinfos.get(transition_info) or datetime.timezone(
+                datetime.timedelta(seconds=utc_offset)
+            )
+            self.__infos.append((utc_offset, tzinfo))
+
+    def __select(self, timestamp):
+        """
+        Return offset window in use at specified timestamp, selecting it if needed
+
+        Args:
+            timestamp (float): utc timestamp
+
+        Returns:
+            tuple: window (start, end, offset, tzinfo)
+        """
+        window = self.__window
+        if window[0] <= timestamp < window[1]:
+            return window
+
+        index = max(bisect.bisect_right(self.__transitions, timestamp) - 1, 0)
+        end = (
+            self.__transitions[index + 1]
+            if index + 1 < len(self.__transitions)
+            else float("inf")
+        )
+        offset, tzinfo = self.__infos[index]
+        window = (self.__transitions[index], end, offset, tzinfo)
+        self.__window = window
+        return window
+
+    def get_offset(self, timestamp):
+        """
+        Return UTC offset at specified timestamp
+
+        Args:
+            timestamp (float): utc timestamp
+
+        Returns:
+            int: UTC offset in seconds
+        """
+        return self.__select(timestamp)[2]
+
+    def get_next_transition(self, timestamp):
+        """
+        Return timestamp of next offset change after specified timestamp
+
+        Args:
+            timestamp (float): utc timestamp
+
+        Returns:
+            float: utc timestamp of next transition or None if offset does not change anymore
+        """
+        end = self.__select(timestamp)[1]
+        return None if end == float("inf") else end
+
+    def to_local(self, timestamp):
+        """
+        Return local datetime of specified timestamp
+
+        Args:
+            timestamp (float): utc timestamp
+
+        Returns:
+            datetime: timezone aware local datetime
+        """
+        _, _, offset, tzinfo = self.__select(timestamp)
+        return (EPOCH + datetime.timedelta(seconds=timestamp + offset)).replace(
+            tzinfo=tzinfo
+        )
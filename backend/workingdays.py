@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import logging
+import importlib
+from .holidaybitsets import HolidayBitsets
+from .calendarindex import CALENDARS
+
+
+class WorkingDays:
+    """
+    Holidays and working days of configured country
+
+    Holidays are computed by workalendar calendar of country, cached per country and year and
+    persisted as bitsets (see HolidayBitsets). Working days are stored as bitsets too, so
+    working days arithmetic only counts bits.
+    """
+
+    def __init__(
+        self,
+        country_getter,
+        holiday_bitsets,
+        holidays_cache,
+        working_days_cache,
+        default_weekend_days=(5, 6),
+    ):
+        """
+        Constructor
+
+        Args:
+            country_getter (function): function returning configured country code (alpha2)
+            holiday_bitsets (HolidayBitsets): persistent holidays bitsets
+            holidays_cache (LruCache): holidays cache (per country and year)
+            working_days_cache (LruCache): working days bitsets cache (per country and year)
+            default_weekend_days (tuple, optional): weekend days (0 is monday) of countries
+                                                    without calendar. Defaults to (5, 6)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.holiday_bitsets = holiday_bitsets
+        self.holidays_cache = holidays_cache
+        self.working_days_cache = working_days_cache
+        self.default_weekend_days = default_weekend_days
+        self.__country_getter = country_getter
+
+    def clear(self):
+        """
+        Clear cached holidays and working days (country changed)
+        """
+        self.holidays_cache.clear()
+        self.working_days_cache.clear()
+
+    def get_holidays(self, year):
+        """
+        Return holidays of specified year, computing them if necessary
+
+        Args:
+            year (int): year
+
+        Returns:
+            tuple: holidays (tuple of (iso day, label) tuples) and set of holidays iso days
+                   (both empty if no calendar available for country). None if error occured
+        """
+        key = (self.__country_getter(), year)
+        holidays = self.holidays_cache.get(key)
+        if holidays is not None:
+            return holidays
+
+        if key[0] not in CALENDARS:
+            self.logger.info('No calendar available for country "%s"', key[0])
+            return (), frozenset()
+
+        try:
+            module_name, class_name, _ = CALENDARS[key[0]]
+            workalendar = importlib.import_module(module_name)
+            _class = getattr(workalendar, class_name)
+            _instance = _class()
+            days = tuple(
+                (date.isoformat(), label) for (date, label) in _instance.holidays(year)
+            )
+        except Exception:
+            self.logger.exception("Unable to get non working days:")
+            return None
+
+        holidays = (days, frozenset(day for (day, _) in days))
+        self.holidays_cache.set(key, holidays)
+        return holidays
+
+    def get_holidays_bitset(self, year):
+        """
+        Return holidays bitset of specified year, computing and persisting it if necessary
+
+        Args:
+            year (int): year
+
+        Returns:
+            int: holidays bitset (see HolidayBitsets). None if error occured
+        """
+        alpha2 = self.__country_getter()
+        if not alpha2:
+            return 0
+        bitset = self.holiday_bitsets.get(alpha2, year)
+        if bitset is not None:
+            return bitset
+
+        holidays = self.get_holidays(year)
+        if holidays is None:
+            return None
+        if not holidays[1]:
+            return 0
+        bitset = HolidayBitsets.build(
+            datetime.date.fromisoformat(day) for day in holidays[1]
+        )
+        if self.holiday_bitsets.set(alpha2, year, bitset):
+            self.holiday_bitsets.save()
+        return bitset
+
+    def check_non_working_days(self, dates):
+        """
+        Check if specified days are holidays. Holidays of each year are computed once.
+
+        Args:
+            dates (list): list of dates
+
+        Returns:
+            list: list of booleans (True if day is a non working day)
+        """
+        bitsets = {
+            year: self.get_holidays_bitset(year) or 0
+            for year in {date.year for date in dates}
+        }
+        return [HolidayBitsets.is_set(bitsets[date.year], date) for date in dates]
+
+    def precompute(self):
+        """
+        Compute and persist holidays bitsets of current and next years. Bitsets of other
+        countries and past years are dropped.
+        """
+        try:
+            alpha2 = self.__country_getter()
+            if not alpha2:
+                return
+
+            year = datetime.date.today().year
+            if self.holiday_bitsets.retain(alpha2, [year, year + 1]):
+                self.holiday_bitsets.save()
+            for a_year in (year, year + 1):
+                self.get_holidays_bitset(a_year)
+        except Exception:
+            self.logger.exception("Unable to precompute holidays:")
+
+    def add_working_days(self, start, days):
+        """
+        Return day after specified number of working days
+
+        Args:
+            start (date): start day
+            days (int): number of working days to add. 0 returns start day
+
+        Returns:
+            date: working day or None if no working day found before max year
+        """
+        if days == 0:
+            return start
+
+        # skip days before start day
+        year = start.year
+        working_days = self.get_working_days_bitset(year) >> start.timetuple().tm_yday
+        first_ordinal = start.toordinal() + 1
+        # each year has working days, so loop ends before days count
+        while year <= start.year + days:
+            count = bin(working_days).count("1")
+            if count >= days:
+                # drop first working days, result is then the lowest set bit
+                for _ in range(days - 1):
+                    working_days &= working_days - 1
+                index = (working_days & -working_days).bit_length() - 1
+                return datetime.date.fromordinal(first_ordinal + index)
+
+            days -= count
+            year += 1
+            if year > datetime.MAXYEAR:
+                break
+            working_days = self.get_working_days_bitset(year)
+            first_ordinal = datetime.date(year, 1, 1).toordinal()
+
+        return None
+
+    def count_working_days(self, start, end):
+        """
+        Count working days of specified range
+
+        Args:
+            start (date): first day
+            end (date): last day included
+
+        Returns:
+            int: number of working days
+        """
+        count = 0
+        for year in range(start.year, end.year + 1):
+            first = start.timetuple().tm_yday if year == start.year else 1
+            last = (
+                end.timetuple().tm_yday
+                if year == end.year
+                else HolidayBitsets.get_year_size(year)
+            )
+            mask = (1 << (last - first + 1)) - 1
+            working_days = (self.get_working_days_bitset(year) >> (first - 1)) & mask
+            count += bin(working_days).count("1")
+
+        return count
+
+    def get_working_days_bitset(self, year):
+        """
+        Return working days bitset of specified year
+
+        Args:
+            year (int): year
+
+        Returns:
+            int: bitset of working days (see HolidayBitsets). Bitset is not cached if
+                 holidays are not available (only weekends are excluded)
+        """
+        alpha2 = self.__country_getter()
+        key = (alpha2, year)
+        bitset = self.working_days_cache.get(key)
+        if bitset is not None:
+            return bitset
+
+        weekend_days = (
+            CALENDARS[alpha2][2] if alpha2 in CALENDARS else self.default_weekend_days
+        )
+        holidays = self.get_holidays_bitset(year)
+        non_working_days = HolidayBitsets.build_weekdays(year, weekend_days) | (
+            holidays or 0
+        )
+        year_days = (1 << HolidayBitsets.get_year_size(year)) - 1
+        bitset = year_days & ~non_working_days
+        if holidays is not None:
+            # do not keep incomplete bitset, holidays will be computed again next time
+            self.working_days_cache.set(key, bitset)
+        return bitset
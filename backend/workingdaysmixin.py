@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import datetime
+import threading
+from cleep.exception import CommandError, InvalidParameter
+
+
+class WorkingDaysMixin:
+    """
+    Parameters working days commands: non working days (weekends and holidays) of configured
+    country
+    """
+
+    def get_non_working_days(self, year=None):
+        """
+        Return non working days of current year
+
+        Args:
+            year (int, optional): get non working day for specified year. If not specified use current year. Defaults to None.
+
+        Returns:
+            list: list of non working days of the year. List can be empty if error occured::
+
+            [
+                {
+                    datetime (string): non working day (date in iso format YYYY-MM-DD)
+                    label (string): english name of non working day
+                },
+                ...
+            ]
+
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "year",
+                    "type": int,
+                    "value": year,
+                    "none": True,
+                }
+            ]
+        )
+
+        year = year or datetime.datetime.now().year
+        holidays = self.working_days.get_holidays(year)
+        return list(holidays[0]) if holidays else []
+
+    def is_non_working_day(self, day):
+        """
+        Check if specified day is non working day according to current locale configuration
+
+        Args:
+            day (str): day to check (must be iso format XXXX-MM-DD)
+
+        Returns:
+            bool: True if specified day is a non working day, False otherwise
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "day",
+                    "type": str,
+                    "value": day,
+                }
+            ]
+        )
+
+        date = datetime.date.fromisoformat(day)
+        return self.working_days.check_non_working_days([date])[0]
+
+    def are_non_working_days(self, days):
+        """
+        Check if specified days are non working days according to current locale
+        configuration
+
+        Holidays of each year are computed once whatever the number of days.
+
+        Args:
+            days (list): days to check (iso format YYYY-MM-DD)
+
+        Returns:
+            list: list of booleans (True if day is a non working day), in days order
+
+        Raises:
+            InvalidParameter: if days are invalid
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "days",
+                    "type": list,
+                    "value": days,
+                    "validator": lambda val: 0
+                    < len(val)
+                    <= self.NON_WORKING_DAYS_MAX_DAYS,
+                    "message": 'Parameter "days" must be a list of 1 to '
+                    f"{self.NON_WORKING_DAYS_MAX_DAYS} days",
+                },
+            ]
+        )
+        try:
+            dates = [datetime.date.fromisoformat(day) for day in days]
+        except (TypeError, ValueError) as error:
+            raise InvalidParameter("Days must be in iso format (YYYY-MM-DD)") from error
+
+        return self.working_days.check_non_working_days(dates)
+
+    def get_non_working_days_range(self, start_date, end_date):
+        """
+        Check each day of specified range according to current locale configuration
+
+        Range can cross year boundaries, holidays of each year are computed once.
+
+        Args:
+            start_date (str): first day (iso format YYYY-MM-DD)
+            end_date (str): last day included (iso format YYYY-MM-DD)
+
+        Returns:
+            list: list of booleans (True if day is a non working day), one per day from
+                  start_date to end_date
+
+        Raises:
+            InvalidParameter: if dates are invalid or range is too large
+        """
+        start, end = self._parse_days_range(start_date, end_date, self.NON_WORKING_DAYS_MAX_DAYS)
+
+        return self.working_days.check_non_working_days(
+            [
+                datetime.date.fromordinal(ordinal)
+                for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            ]
+        )
+
+    def _submit_precompute_holidays(self):
+        """
+        Precompute holidays in background, unless module is stopped
+        """
+        try:
+            self.holidays_executor.submit(self.working_days.precompute)
+        except RuntimeError:
+            # executor is shut down
+            self.logger.debug("Module stopped, holidays are not precomputed")
+
+    def _lower_thread_priority(self):
+        """
+        Lower priority of current thread (on linux priority is per thread)
+        """
+        try:
+            os.setpriority(
+                os.PRIO_PROCESS, threading.get_native_id(), self.HOLIDAYS_JOB_NICENESS
+            )
+        except (AttributeError, OSError):
+            self.logger.debug("Unable to lower holidays job priority")
+
+    def is_today_non_working_day(self):
+        """
+        Check if today is non working day according to current locale configuration
+
+        Returns:
+            bool: True if specified day is a non working day, False otherwise
+        """
+        today = datetime.date.today()
+        return self.is_non_working_day(today.isoformat())
+
+    def next_working_day(self, day):
+        """
+        Return first working day after specified day (weekends and holidays excluded)
+
+        Args:
+            day (str): day (iso format YYYY-MM-DD)
+
+        Returns:
+            str: next working day (iso format YYYY-MM-DD)
+
+        Raises:
+            InvalidParameter: if day is invalid
+        """
+        return self.add_working_days(day, 1)
+
+    def add_working_days(self, day, days):
+        """
+        Return day after specified number of working days (weekends and holidays excluded)
+
+        Args:
+            day (str): start day (iso format YYYY-MM-DD)
+            days (int): number of working days to add. 0 returns specified day
+
+        Returns:
+            str: working day (iso format YYYY-MM-DD)
+
+        Raises:
+            InvalidParameter: if parameters are invalid
+            CommandError: if no working day found
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "days",
+                    "type": int,
+                    "value": days,
+                    "validator": lambda val: 0 <= val <= self.WORKING_DAYS_MAX_DAYS,
+                    "message": 'Parameter "days" must be between 0 and '
+                    f"{self.WORKING_DAYS_MAX_DAYS}",
+                },
+            ]
+        )
+        start = self._parse_day("day", day)
+
+        working_day = self.working_days.add_working_days(start, days)
+        if working_day is None:
+            raise CommandError("No working day found")
+        return working_day.isoformat()
+
+    def count_working_days(self, start_date, end_date):
+        """
+        Count working days (weekends and holidays excluded) of specified range
+
+        Args:
+            start_date (str): first day (iso format YYYY-MM-DD)
+            end_date (str): last day included (iso format YYYY-MM-DD)
+
+        Returns:
+            int: number of working days
+
+        Raises:
+            InvalidParameter: if dates are invalid or range is too large
+        """
+        start = self._parse_day("start_date", start_date)
+        end = self._parse_day("end_date", end_date)
+        if end < start:
+            raise InvalidParameter('Parameter "end_date" must be after "start_date"')
+        if (end - start).days >= self.WORKING_DAYS_MAX_DAYS:
+            raise InvalidParameter(
+                f"Date range must not exceed {self.WORKING_DAYS_MAX_DAYS} days"
+            )
+
+        return self.working_days.count_working_days(start, end)
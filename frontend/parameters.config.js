@@ -4,8 +4,8 @@
  */
 angular
 .module('Cleep')
-.directive('parametersConfigComponent', ['toastService', 'parametersService', 'cleepService', '$timeout',
-function(toast, parametersService, cleepService, $timeout) {
+.directive('parametersConfigComponent', ['toastService', 'parametersService', 'cleepService', '$timeout', '$rootScope',
+function(toast, parametersService, cleepService, $timeout, $rootScope) {
 
     var parametersController = ['$scope', function($scope) {
         var self = this;
@@ -33,6 +33,8 @@ function(toast, parametersService, cleepService, $timeout) {
         };
         self.newAccount = '';
         self.newPassword = '';
+        self.positionJobId = null;
+        self.positionUpdates = {};
 
         /**
          * Init controller
@@ -73,14 +75,54 @@ function(toast, parametersService, cleepService, $timeout) {
             }
 
             toast.loading('Setting localisation...');
+            self.positionUpdates = {};
             parametersService.setPosition(latitude, longitude)
-                .then(() => cleepService.reloadModuleConfig('parameters'))
+                .then(function(resp) {
+                    self.positionJobId = resp.data;
+
+                    // job may have ended before its id is received
+                    const params = self.positionUpdates[self.positionJobId];
+                    if (params) {
+                        self.onPositionUpdate(params);
+                        return;
+                    }
+                    return parametersService.getPositionJob(self.positionJobId)
+                        .then(function(resp) {
+                            self.onPositionUpdate(resp.data);
+                        });
+                });
+        };
+
+        self.onPositionUpdate = function(params) {
+            if (!params) {
+                return;
+            }
+            if (self.positionJobId === null) {
+                // keep updates until set_position returns job id
+                self.positionUpdates[params.job_id] = params;
+                return;
+            }
+            if (params.job_id !== self.positionJobId || (params.status !== 'done' && params.status !== 'failed')) {
+                return;
+            }
+            self.positionJobId = null;
+            self.positionUpdates = {};
+
+            cleepService.reloadModuleConfig('parameters')
                 .then(function(config) {
                     self.updateConfig(config);
-                    toast.success('Localisation saved');
+                    if (params.status === 'done') {
+                        toast.success('Localisation saved');
+                    } else {
+                        toast.error('Error setting localisation: ' + params.error);
+                    }
                 });
         };
 
+        $scope.$on('$destroy', $rootScope.$on('parameters.position.update', function(event, uuid, params) {
+            self.onPositionUpdate(params);
+        }));
+
         /**
          * Auth
          */
@@ -24,9 +24,14 @@ function($rootScope, rpcService, cleepService) {
 
     /**
      * Set position
+     * Position related stuff is updated in background, result is sent through parameters.position.update event
      */
     self.setPosition = function(latitude, longitude) {
-        return rpcService.sendCommand('set_position', 'parameters', { latitude, longitude }, 30);
+        return rpcService.sendCommand('set_position', 'parameters', { latitude, longitude });
+    };
+
+    self.getPositionJob = function(jobId) {
+        return rpcService.sendCommand('get_position_job', 'parameters', { job_id: jobId });
     };
 
     /**
@@ -17,5 +17,5 @@ trap 'echo "\"${last_command}\" command failed with exit code $?."' ERR
 # so we need to force numpy version according to this numpy compatibility matrix  https://numpy.org/neps/nep-0029-deprecation_policy.html
 python3 -m pip install https://github.com/CleepDevice/cleep-libs-prebuild/raw/refs/heads/main/numpy/bullseye/numpy-1.26.4-cp39-cp39-linux_armv7l.whl
 python3 -m pip install https://github.com/CleepDevice/cleep-libs-prebuild/raw/refs/heads/main/scipy/bullseye/scipy-1.13.0-cp39-cp39-linux_armv7l.whl
-python3 -m pip install --trusted-host pypi.org "workalendar==17.0.0" "pycountry-convert>=0.7.2,<0.8.0" "pytz==2024.1" "reverse-geocode==1.4.1" "timezonefinder==5.2.0" "tzlocal==2.1"
+python3 -m pip install --trusted-host pypi.org "workalendar==17.0.0" "pytz==2024.1" "reverse-geocode==1.4.1" "timezonefinder==5.2.0" "tzlocal==2.1"
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 from cleep.libs.tests import session
+from cleep.core import CleepModule
 import unittest
 import logging
 import sys
@@ -8,17 +9,60 @@ sys.path.append('../')
 from backend.parameters import Parameters
 from backend.parameterscountryupdateevent import ParametersCountryUpdateEvent
 from backend.parametershostnameupdateevent import ParametersHostnameUpdateEvent
+from backend.parameterspositionprogressevent import ParametersPositionProgressEvent
+from backend.parameterspositionupdateevent import ParametersPositionUpdateEvent
 from backend.parameterstimenowevent import ParametersTimeNowEvent
+from backend.parameterstimeoffsetchangedevent import ParametersTimeOffsetChangedEvent
+from backend.parameterstimetickevent import ParametersTimeTickEvent
 from backend.parameterstimesunriseevent import ParametersTimeSunriseEvent
 from backend.parameterstimesunsetevent import ParametersTimeSunsetEvent
+from backend.parameterstimeastronomicaldawnevent import ParametersTimeAstronomicalDawnEvent
+from backend.parameterstimenauticaldawnevent import ParametersTimeNauticalDawnEvent
+from backend.parameterstimecivildawnevent import ParametersTimeCivilDawnEvent
+from backend.parameterstimegoldenhourendevent import ParametersTimeGoldenHourEndEvent
+from backend.parameterstimesolarnoonevent import ParametersTimeSolarNoonEvent
+from backend.parameterstimegoldenhourstartevent import ParametersTimeGoldenHourStartEvent
+from backend.parameterstimecivilduskevent import ParametersTimeCivilDuskEvent
+from backend.parameterstimenauticalduskevent import ParametersTimeNauticalDuskEvent
+from backend.parameterstimeastronomicalduskevent import ParametersTimeAstronomicalDuskEvent
 from backend.timetomessageformatter import TimeToMessageFormatter
 from backend.timetoidentifiedmessageformatter import TimeToIdentifiedMessageFormatter
+from backend.lazyimport import LazyImport
+from backend.geoindex import GeoIndex
+from backend.lrucache import LruCache
+from backend.holidaybitsets import HolidayBitsets
+from backend.calendarindex import CALENDARS, WORKALENDAR_VERSION
+from backend.resolutioncache import ResolutionCache
+from backend.frozendict import FrozenDict, freeze
+from backend.configsnapshot import ConfigSnapshot
+from backend.timesnapshot import TimeSnapshot, get_minute_key
+from backend.utcoffsetcache import UtcOffsetCache
+from backend.timestampcheckpoint import TimestampCheckpoint, TimestampFile
+from backend.eventscheduler import EventScheduler
+from backend.timesubscriptions import TimeSubscriptions
+from backend.georesolver import GeoResolver
+from backend.timeticker import TimeTicker
+from backend.positionjobs import PositionJobs
+from backend.workingdays import WorkingDays
+from backend.suntimes import SunTimes
+from backend.solar import (
+    SunTable,
+    SOLAR_EVENTS_NAMES,
+    compute_day_solar_events,
+    compute_positions_solar_events,
+    compute_solar_positions,
+)
 from cleep.exception import InvalidParameter, MissingParameter, CommandError, Unauthorized
 from unittest.mock import patch, MagicMock, Mock, ANY
 from cleep.libs.tests.mockdatetime import mock_datetime
 import datetime
 import pytz
 import time
+import os
+import copy
+import subprocess
+import tempfile
+import threading
 from cleep.libs.tests.common import get_log_level
 
 LOG_LEVEL = get_log_level()
@@ -32,14 +76,10 @@ class TestsParameters(unittest.TestCase):
     def tearDown(self):
         self.session.clean()
 
-    def init_session(self, mock_sun=None, mock_cleepconf=None,
+    def init_session(self, mock_cleepconf=None,
         mock_hostname=None, set_hostname_return_value=True, get_hostname_return_value='dummy',
-        mock_tzfinder=None, tzfinder_timezoneat_side_effect=None, tzfinder_timezoneat_return_value=None, start=True):
-        if mock_sun:
-            local_tz = pytz.timezone('Europe/London')
-            mock_sun.return_value.sunset.return_value = local_tz.localize(datetime.datetime.fromtimestamp(1591735300))
-            mock_sun.return_value.sunrise.return_value = local_tz.localize(datetime.datetime.fromtimestamp(1591735200))
-
+        mock_tzfinder=None, tzfinder_timezoneat_side_effect=None, tzfinder_timezoneat_return_value=None,
+        geoindex_lookup_return_value=None, start=True):
         if mock_hostname:
             mock_hostname.return_value.set_hostname.return_value = set_hostname_return_value
             mock_hostname.return_value.get_hostname.return_value = get_hostname_return_value
@@ -56,9 +96,27 @@ class TestsParameters(unittest.TestCase):
             mock_cleepconf.return_value.get_auth.return_value = get_auth_get_mock
 
         self.module = self.session.setup(Parameters, mock_on_start=False, mock_on_stop=False)
+        # do not depend on shipped geo index
+        self.module.geo_resolver.geoindex = Mock()
+        self.module.geo_resolver.geoindex.lookup.return_value = geoindex_lookup_return_value
+        # do not depend on timestamp file of running device
+        self.module.timestamp_file = Mock()
+        self.module.timestamp_file.read.return_value = None
+        self.module.timestamp_file.write.return_value = True
+        # do not depend on holidays file of running device
+        self.module.holiday_bitsets.load = Mock()
+        self.module.holiday_bitsets.save = Mock(return_value=True)
 
         if start:
             self.session.start_module(self.module)
+            self.wait_holidays_job()
+
+    def wait_holidays_job(self):
+        self.module.holidays_executor.submit(lambda: None).result(timeout=30.0)
+
+    def wait_position_job(self):
+        # position executor has a single worker, so previous jobs are done when this one runs
+        self.module.position_executor.submit(lambda: None).result(timeout=10.0)
 
     def test_configure(self):
         self.init_session(start=False)
@@ -82,15 +140,61 @@ class TestsParameters(unittest.TestCase):
         self.init_session(start=False)
         mock_timer = Mock()
         self.session.task_factory.create_timer = Mock(return_value=mock_timer)
-        mock_task = Mock()
-        self.session.task_factory.create_task = Mock(return_value=mock_task)
 
         self.module._on_start()
 
         # mocked time = 9/12/2020 à 18:34:10, so cleep seconds synchronized with system, it must delay of 50 seconds
-        self.session.task_factory.create_timer.assert_called_with(50, mock_task.start)
+        self.session.task_factory.create_timer.assert_called_with(50.0, self.module.time_ticker.run)
+        mock_timer.start.assert_called()
+
+    @patch('backend.parameters.time.time', Mock(return_value=1607538840))
+    def test_on_start_launch_time_task_on_minute_boundary(self):
+        self.init_session(start=False)
+        self.module._get_config_field = Mock(side_effect=[1607538150])
+        mock_timer = Mock()
+        self.session.task_factory.create_timer = Mock(return_value=mock_timer)
+
+        self.module._on_start()
+
+        self.session.task_factory.create_timer.assert_called_with(60.0, self.module.time_ticker.run)
+        mock_timer.start.assert_called()
+
+    @patch('backend.parameters.time.time')
+    def test_run_time_task_reschedules_on_absolute_minute(self, mock_time):
+        self.init_session(start=False)
+        mock_timer = Mock()
+        self.session.task_factory.create_timer = Mock(return_value=mock_timer)
+        self.module._time_task = Mock()
+        # time task ran late and took some time
+        mock_time.return_value = 1607538842.7
+
+        self.module.time_ticker.run()
+
+        self.module._time_task.assert_called()
+        delay = self.session.task_factory.create_timer.call_args[0][0]
+        self.assertAlmostEqual(delay, 57.3, places=3)
         mock_timer.start.assert_called()
 
+    @patch('backend.parameters.time.time', Mock(return_value=1607538842.7))
+    def test_run_time_task_reschedules_on_failure(self):
+        self.init_session(start=False)
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+        self.module._time_task = Mock(side_effect=Exception('Test exception'))
+
+        self.module.time_ticker.run()
+
+        self.session.task_factory.create_timer.assert_called()
+
+    def test_run_time_task_not_rescheduled_after_stop(self):
+        self.init_session()
+        self.module._on_stop()
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+        self.module._time_task = Mock()
+
+        self.module.time_ticker.run()
+
+        self.session.task_factory.create_timer.assert_not_called()
+
     #@patch('backend.parameters.time.time', Mock(return_value=1607538850))
     #def test_on_start_sync_time_first_launch(self):
     #    self.init_session(start=False)
@@ -113,19 +217,135 @@ class TestsParameters(unittest.TestCase):
         
     #    self.assertEqual(mock_task.call_count, 1)
 
-    @patch('backend.parameters.time.time', Mock(return_value=1607538840))
-    def test_on_start_launch_time_task_without_sync_timer(self):
+    @patch('backend.parameters.time.time', Mock(return_value=1607538842.7))
+    def test_subscribe_time_events_ticks_faster(self):
+        self.init_session()
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+
+        subscription_id = self.module.subscribe_time_events(10)
+
+        self.assertTrue(isinstance(subscription_id, str))
+        delay = self.session.task_factory.create_timer.call_args[0][0]
+        self.assertAlmostEqual(delay, 7.3, places=3)
+
+    def test_subscribe_time_events_invalid_resolution(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter):
+            self.module.subscribe_time_events(5)
+        with self.assertRaises(InvalidParameter):
+            self.module.subscribe_time_events('1')
+
+    def test_unsubscribe_time_events(self):
+        self.init_session()
+        subscription_id = self.module.subscribe_time_events(1)
+
+        self.assertTrue(self.module.unsubscribe_time_events(subscription_id))
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.unsubscribe_time_events(subscription_id)
+        self.assertEqual(str(cm.exception), f'Subscription "{subscription_id}" does not exist')
+
+    def test_renew_time_subscription(self):
+        self.init_session()
+        mock_monotonic = Mock(return_value=1000.0)
+        self.module.time_subscriptions._TimeSubscriptions__clock = mock_monotonic
+        subscription_id = self.module.subscribe_time_events(1)
+
+        mock_monotonic.return_value = 1200.0
+        self.assertTrue(self.module.renew_time_subscription(subscription_id))
+        mock_monotonic.return_value = 1400.0
+        self.assertTrue(self.module.time_subscriptions.has_resolution(1))
+
+        mock_monotonic.return_value = 1500.0
+        self.assertFalse(self.module.time_subscriptions.has_resolution(1))
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.renew_time_subscription(subscription_id)
+        self.assertEqual(str(cm.exception), f'Subscription "{subscription_id}" does not exist')
+
+    @patch('backend.parameters.time.time', Mock(return_value=1607538849.01))
+    def test_run_time_task_drops_expired_subscriptions(self):
         self.init_session(start=False)
-        self.module._get_config_field = Mock(side_effect=[1607538150])
-        mock_timer = Mock()
-        self.session.task_factory.create_timer = Mock(return_value=mock_timer)
-        mock_task = Mock()
-        self.session.task_factory.create_task = Mock(return_value=mock_task)
+        mock_monotonic = Mock(return_value=1000.0)
+        self.module.time_subscriptions._TimeSubscriptions__clock = mock_monotonic
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+        self.module._time_task = Mock()
+        self.module.subscribe_time_events(1)
+        self.module.time_tick_event = Mock()
+
+        mock_monotonic.return_value = 1300.0
+        self.module.time_ticker.run()
+
+        self.assertEqual(len(self.module.time_subscriptions), 1)
+        self.assertFalse(self.module.time_tick_event.send.called)
+        # back to minute resolution
+        delay = self.session.task_factory.create_timer.call_args[0][0]
+        self.assertAlmostEqual(delay, 50.99, places=3)
+
+    @patch('backend.parameters.time.time')
+    def test_run_time_task_sends_subscribed_ticks(self, mock_time):
+        self.init_session(start=False)
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+        self.module._time_task = Mock()
+        self.module.subscribe_time_events(1)
+        self.module.subscribe_time_events(10)
+        self.module.time_tick_event = Mock()
+
+        mock_time.return_value = 1607538849.01
+        self.module.time_ticker.run()
+        mock_time.return_value = 1607538850.01
+        self.module.time_ticker.run()
+        mock_time.return_value = 1607538851.01
+        self.module.time_ticker.run()
+
+        self.assertEqual([call[1]['params']['resolutions'] for call in self.module.time_tick_event.send.call_args_list], [[1, 10], [1, 10], [1]])
+        self.assertEqual(self.module.time_tick_event.send.call_args[1]['params']['timestamp'], 1607538851)
+        # minute task runs only once per minute
+        self.assertEqual(self.module._time_task.call_count, 1)
+        delay = self.session.task_factory.create_timer.call_args[0][0]
+        self.assertAlmostEqual(delay, 0.99, places=3)
+
+    @patch('backend.parameters.time.time')
+    def test_run_time_task_minute_task_on_minute_change(self, mock_time):
+        self.init_session(start=False)
+        self.session.task_factory.create_timer = Mock(return_value=Mock())
+        self.module._time_task = Mock()
 
-        self.module._on_start()
+        mock_time.return_value = 1607538840.01
+        self.module.time_ticker.run()
+        # timer fired a bit early
+        mock_time.return_value = 1607538899.99
+        self.module.time_ticker.run()
+        mock_time.return_value = 1607538900.01
+        self.module.time_ticker.run()
 
-        self.session.task_factory.create_timer.assert_not_called()
-        mock_task.start.assert_called()
+        self.assertEqual(self.module._time_task.call_count, 2)
+
+    def test_time_task_without_time_subscribers(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module.time_subscriptions = TimeSubscriptions()
+
+            self.module._time_task()
+
+        self.assertFalse(self.session.event_called('parameters.time.now'))
+        self.assertEqual(self.module.timestamp_checkpoint.get(), 1591645808)
+
+    @patch.object(Parameters, 'TIME_EVENTS_DEFAULT_RESOLUTION', None)
+    def test_time_task_skips_payload_after_subscriptions_expired(self):
+        self.init_session()
+        mock_monotonic = Mock(return_value=1000.0)
+        self.module.time_subscriptions._TimeSubscriptions__clock = mock_monotonic
+        self.module.time_now_event = Mock()
+        self.module.subscribe_time_events(60)
+        self.module.subscribe_time_events(60)
+
+        self.module._time_task()
+        mock_monotonic.return_value = 1300.0
+        self.module._time_task()
+
+        self.assertEqual(self.module.time_now_event.send.call_count, 1)
+        self.assertIsNotNone(self.module.timestamp_checkpoint.get())
 
     @patch('backend.parameters.time.time', Mock(return_value=1607538840))
     def test_on_start_restore_saved_time(self):
@@ -137,10 +357,51 @@ class TestsParameters(unittest.TestCase):
 
         self.module._set_system_time.assert_called_with(1607539150)
 
-    @patch('backend.parameters.Sun')
+    @patch('backend.parameters.time.time', Mock(return_value=1607538840))
+    def test_on_start_restore_checkpoint_time(self):
+        self.init_session(start=False)
+        self.module._get_config_field = Mock(side_effect=[1607539150])
+        self.module.timestamp_file.read.return_value = 1607539250.0
+        self.module._set_system_time = Mock()
+
+        self.module._on_start()
+
+        self.module._set_system_time.assert_called_with(1607539250.0)
+
+    def test_on_stop_flush_timestamp_checkpoint(self):
+        self.init_session()
+        self.module.timestamp_checkpoint.update(1607539250.0)
+        self.module.timestamp_file.write.assert_not_called()
+
+        self.module._on_stop()
+
+        self.module.timestamp_file.write.assert_called_once_with(1607539250.0)
+
+    def test_time_task_flush_timestamp_checkpoint_after_interval(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module._time_task()
+            self.module.timestamp_file.write.assert_not_called()
+
+            self.module.timestamp_checkpoint.interval = 0
+            self.module._time_task()
+
+        self.module.timestamp_file.write.assert_called_once_with(1591645808.0)
+
+    def test_save_timestamp_checkpoint_in_config_without_file(self):
+        self.init_session()
+        self.module.timestamp_file = None
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.timestamp_checkpoint.update(1607539250.0)
+
+        self.module.timestamp_checkpoint.flush()
+
+        self.module._set_config_field.assert_called_with('timestamp', 1607539250.0)
+
     @patch('backend.parameters.CleepConf')
-    def test_get_module_config_default(self, mock_cleepconf, mock_sun):
-        self.init_session(mock_sun=mock_sun, mock_cleepconf=mock_cleepconf)
+    def test_get_module_config_default(self, mock_cleepconf):
+        self.init_session(mock_cleepconf=mock_cleepconf)
 
         conf = self.module.get_module_config()
         logging.debug('Conf: %s' % conf)
@@ -300,35 +561,294 @@ class TestsParameters(unittest.TestCase):
                 'sunrise': self.module.suns['sunrise'],
                 'minute': 50
             }))
-            self.module._set_config_field.assert_called_with('timestamp', 1591645808)
+            self.assertEqual(self.module.timestamp_checkpoint.get(), 1591645808)
+            self.module._set_config_field.assert_not_called()
 
-    def test_time_task_sunrise_event(self):
-        utc_now = datetime.datetime(2020, 6, 8, 8, 15, 8, 0)
-        with mock_datetime(utc_now, datetime):
-            self.init_session()
-            self.module.sunrise = pytz.utc.localize(utc_now).astimezone(self.module.timezone)
+    def test_get_sun_times(self):
+        self.init_session()
+        self.module._set_config_field('position', {'latitude': 51.4769, 'longitude': -0.0005})
 
-            self.module._time_task()
-            self.assertTrue(self.session.event_called('parameters.time.sunrise'))
+        sun_times = self.module.get_sun_times('2020-06-21', '2020-06-22')
+        logging.debug('Sun times: %s', sun_times)
 
-    def test_time_task_sunset_event(self):
-        utc_now = datetime.datetime(2020, 6, 8, 20, 5, 8, 0)
-        with mock_datetime(utc_now, datetime):
+        self.assertEqual(len(sun_times), 2)
+        self.assertEqual(sun_times[0]['date'], '2020-06-21')
+        self.assertEqual(sun_times[1]['date'], '2020-06-22')
+        # 2020-06-21 04:43 and 21:21 Europe/London
+        self.assertAlmostEqual(sun_times[0]['sunrise'], 1592710980, delta=120)
+        self.assertAlmostEqual(sun_times[0]['sunset'], 1592770860, delta=120)
+        self.assertTrue(sun_times[0]['sunrise_iso'].startswith('2020-06-21T04:4'))
+        self.assertTrue(sun_times[0]['sunrise_iso'].endswith('+01:00'))
+
+    def test_get_sun_times_across_years(self):
+        self.init_session()
+
+        sun_times = self.module.get_sun_times('2020-12-31', '2021-01-01')
+
+        self.assertEqual([day['date'] for day in sun_times], ['2020-12-31', '2021-01-01'])
+        self.assertEqual(len(self.module.sun_tables), 2)
+
+    def test_get_sun_times_reuses_year_table(self):
+        self.init_session()
+        self.module.get_sun_times('2020-01-01', '2020-01-01')
+
+        with patch('backend.suntimes.SunTable') as mock_table:
+            self.module.get_sun_times('2020-06-01', '2020-06-30')
+            mock_table.assert_not_called()
+
+    def test_get_sun_times_polar_day(self):
+        self.init_session()
+        self.module._set_config_field('position', {'latitude': 78.2232, 'longitude': 15.6267})
+
+        sun_times = self.module.get_sun_times('2020-06-21', '2020-06-21')
+
+        self.assertEqual(sun_times[0]['date'], '2020-06-21')
+        self.assertIsNone(sun_times[0]['sunrise'])
+        self.assertIsNone(sun_times[0]['sunrise_iso'])
+        self.assertIsNone(sun_times[0]['sunset'])
+        self.assertIsNone(sun_times[0]['sunset_iso'])
+        self.assertIsNotNone(sun_times[0]['solar_noon'])
+
+    def test_get_sun_times_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_sun_times('2020-06-21', '21/06/2020')
+        self.assertEqual(str(cm.exception), 'Dates must be in iso format (YYYY-MM-DD)')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_sun_times('2020-06-21', '2020-06-20')
+        self.assertEqual(str(cm.exception), 'Parameter "end_date" must be after "start_date"')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_sun_times('2020-01-01', '2021-01-01')
+        self.assertEqual(str(cm.exception), 'Date range must not exceed 366 days')
+
+        with self.assertRaises(InvalidParameter):
+            self.module.get_sun_times(None, '2020-06-20')
+
+    def test_get_solar_position(self):
+        self.init_session()
+        self.module._set_config_field('position', {'latitude': 51.4769, 'longitude': -0.0005})
+
+        # 2020-06-21 12:00 and 2020-03-20 08:00 UTC
+        positions = self.module.get_solar_position([1592740800, 1584691200])
+        logging.debug('Positions: %s', positions)
+
+        self.assertEqual([position['timestamp'] for position in positions], [1592740800, 1584691200])
+        self.assertAlmostEqual(positions[0]['azimuth'], 179.1, delta=0.5)
+        self.assertAlmostEqual(positions[0]['elevation'], 61.95, delta=0.2)
+        self.assertAlmostEqual(positions[1]['azimuth'], 112.7, delta=0.5)
+        self.assertAlmostEqual(positions[1]['elevation'], 17.15, delta=0.2)
+
+    def test_get_solar_position_whole_day(self):
+        self.init_session()
+        timestamps = list(range(1592697600, 1592697600 + 86400, 60))
+
+        positions = self.module.get_solar_position(timestamps)
+
+        self.assertEqual(len(positions), 1440)
+        elevations = [position['elevation'] for position in positions]
+        self.assertTrue(min(elevations) < 0 < max(elevations))
+
+    def test_get_solar_position_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_solar_position([])
+        self.assertEqual(str(cm.exception), 'Parameter "timestamps" must be a list of 1 to 10080 timestamps')
+        with self.assertRaises(InvalidParameter):
+            self.module.get_solar_position([1592740800, 'now'])
+        with self.assertRaises(InvalidParameter):
+            self.module.get_solar_position(list(range(10081)))
+        with self.assertRaises(InvalidParameter):
+            self.module.get_solar_position(None)
+
+    def test_get_solar_position_without_position(self):
+        self.init_session()
+        self.module._set_config_field('position', {'latitude': 0, 'longitude': 0})
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.get_solar_position([1592740800])
+        self.assertEqual(str(cm.exception), 'Position is not configured')
+
+    def test_set_position_clears_sun_tables(self):
+        self.init_session()
+        self.mock_position_job()
+        self.module.get_sun_times('2020-01-01', '2020-01-01')
+
+        self.module.set_position(48.8591554, 2.2907284)
+        self.wait_position_job()
+
+        self.assertEqual(len(self.module.sun_tables), 0)
+
+    # 2020-06-08 02:33 Europe/London
+    @patch('backend.parameters.time.time', Mock(return_value=1591580000))
+    def test_set_sun_schedules_sun_events(self):
+        self.init_session()
+
+        events = self.module.event_scheduler.get_events()
+
+        self.assertAlmostEqual(events['sunrise'], self.module.sunrise.timestamp(), delta=1)
+        self.assertAlmostEqual(events['sunset'], self.module.sunset.timestamp(), delta=1)
+        self.assertIn('civil_dawn', events)
+        self.assertIn('solar_noon', events)
+        self.assertIn('nautical_dusk', events)
+        # nautical dawn already passed, no astronomical twilight in june
+        self.assertNotIn('nautical_dawn', events)
+        self.assertNotIn('astronomical_dawn', events)
+        self.assertNotIn('astronomical_dusk', events)
+        # 2020-06-09 00:05 Europe/London
+        self.assertEqual(events['sun'], 1591657500)
+
+    # 2020-12-21 23:00 Europe/London
+    @patch('backend.parameters.time.time', Mock(return_value=1608591600))
+    def test_set_sun_does_not_schedule_past_sun_events(self):
+        self.init_session()
+
+        events = self.module.event_scheduler.get_events()
+
+        self.assertEqual(list(events.keys()), ['sun'])
+
+    def test_set_sun_without_position_cancels_sun_events(self):
+        self.init_session()
+        self.module.event_scheduler.schedule('sunrise', time.time() + 3600, Mock())
+        self.module._set_config_field('position', {'latitude': 0, 'longitude': 0})
+
+        self.module.set_sun()
+
+        self.assertNotIn('sunrise', self.module.event_scheduler.get_events())
+
+    def test_sunrise_event(self):
+        self.init_session()
+
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000)):
+            self.module.set_sun()
+        with patch('backend.parameters.time.time', Mock(return_value=self.module.sunrise.timestamp() + 1)):
+            self.module.event_scheduler.run_pending()
+
+        self.assertTrue(self.session.event_called('parameters.time.sunrise'))
+        self.assertFalse(self.session.event_called('parameters.time.sunset'))
+
+    def test_sunset_event(self):
+        self.init_session()
+
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000)):
+            self.module.set_sun()
+        with patch('backend.parameters.time.time', Mock(return_value=self.module.sunset.timestamp() + 1)):
+            self.module.event_scheduler.run_pending()
+
+        self.assertTrue(self.session.event_called('parameters.time.sunset'))
+
+    def test_solar_events(self):
+        self.init_session()
+
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000)):
+            self.module.set_sun()
+        suns = self.module.get_sun()
+        with patch('backend.parameters.time.time', Mock(return_value=suns['golden_hour_end'] + 1)):
+            self.module.event_scheduler.run_pending()
+
+        self.assertTrue(self.session.event_called('parameters.time.goldenhourend'))
+        self.assertFalse(self.session.event_called('parameters.time.solarnoon'))
+
+        with patch('backend.parameters.time.time', Mock(return_value=suns['solar_noon'] + 1)):
+            self.module.event_scheduler.run_pending()
+
+        self.assertTrue(self.session.event_called('parameters.time.solarnoon'))
+        self.assertFalse(self.session.event_called('parameters.time.goldenhourstart'))
+
+    # 2020-06-08 08:06 Europe/London
+    @patch('backend.parameters.time.time', Mock(return_value=1591600000))
+    def test_get_sun(self):
+        self.init_session()
+
+        suns = self.module.get_sun()
+        logging.debug('Suns: %s', suns)
+
+        self.assertEqual(sorted(suns.keys()), sorted([
+            'astronomical_dawn', 'astronomical_dawn_iso', 'nautical_dawn', 'nautical_dawn_iso',
+            'civil_dawn', 'civil_dawn_iso', 'sunrise', 'sunrise_iso',
+            'golden_hour_end', 'golden_hour_end_iso', 'solar_noon', 'solar_noon_iso',
+            'golden_hour_start', 'golden_hour_start_iso', 'sunset', 'sunset_iso',
+            'civil_dusk', 'civil_dusk_iso', 'nautical_dusk', 'nautical_dusk_iso',
+            'astronomical_dusk', 'astronomical_dusk_iso',
+        ]))
+        # no astronomical twilight in june at this latitude
+        self.assertEqual(suns['astronomical_dawn'], 0)
+        self.assertEqual(suns['astronomical_dawn_iso'], '')
+        self.assertTrue(suns['nautical_dawn'] < suns['civil_dawn'] < suns['sunrise'] < suns['golden_hour_end'])
+        self.assertTrue(suns['golden_hour_end'] < suns['solar_noon'] < suns['golden_hour_start'] < suns['sunset'])
+        self.assertTrue(suns['sunset'] < suns['civil_dusk'] < suns['nautical_dusk'])
+        self.assertTrue(suns['solar_noon_iso'].startswith('2020-06-08T12:5'))
+        self.assertEqual(suns['sunrise'], int(self.module.sunrise.timestamp()))
+
+    def test_sun_events_scheduled_again_after_clock_jump(self):
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000)):
             self.init_session()
-            self.module.sunset = pytz.utc.localize(utc_now).astimezone(self.module.timezone)
 
-            self.module._time_task()
-            self.assertTrue(self.session.event_called('parameters.time.sunset'))
+        # 2 days later
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000 + 172800)):
+            self.module.event_scheduler.run_pending()
+
+        events = self.module.event_scheduler.get_events()
+        self.assertIn('sunrise', events)
+        self.assertTrue(events['sunrise'] > 1591580000 + 172800)
+        # 2020-06-11 00:05 Europe/London
+        self.assertEqual(events['sun'], 1591830300)
+
+    def test_clock_jump_detected(self):
+        self.init_session()
+        self.module.set_sun = Mock()
+
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000)), patch('backend.parameters.time.monotonic', Mock(return_value=100.0)):
+            self.module.time_ticker._TimeTicker__check_clock_jump()
+        with patch('backend.parameters.time.time', Mock(return_value=1591580060)), patch('backend.parameters.time.monotonic', Mock(return_value=160.0)):
+            self.module.time_ticker._TimeTicker__check_clock_jump()
+        self.module.set_sun.assert_not_called()
+
+        with patch('backend.parameters.time.time', Mock(return_value=1591580000 + 172800)), patch('backend.parameters.time.monotonic', Mock(return_value=220.0)):
+            self.module.time_ticker._TimeTicker__check_clock_jump()
+        self.module.set_sun.assert_called_once_with()
+
+    def test_on_start_schedules_sun_events_after_time_restore(self):
+        self.init_session(start=False)
+        self.module._Parameters__load_timestamp = Mock(return_value=time.time() + 3600)
+        self.module._set_system_time = Mock()
+        self.session.start_module(self.module)
+        self.module.set_sun = Mock()
+
+        self.module._on_start()
+
+        self.module._set_system_time.assert_called()
+        self.module.set_sun.assert_called_once_with()
+
+    @patch('backend.parameters.time.time', Mock(return_value=1591657500))
+    def test_sun_refresh_event(self):
+        self.init_session()
+        self.module.set_sun = Mock()
+
+        self.module._SunMixin__on_sun_refresh()
+
+        self.module.set_sun.assert_called()
 
-    def test_time_task_update_sun_after_midnight(self):
-        utc_now = datetime.datetime(2020, 6, 8, 23, 5, 8, 0)
+    def test_time_task_does_not_poll_sun_events(self):
+        utc_now = datetime.datetime(2020, 6, 8, 8, 15, 8, 0)
         with mock_datetime(utc_now, datetime):
             self.init_session()
-            self.module.set_sun = MagicMock()
+            self.module.sunrise = pytz.utc.localize(utc_now).astimezone(self.module.timezone)
 
             self.module._time_task()
 
-            self.assertTrue(self.module.set_sun.called)
+        self.assertFalse(self.session.event_called('parameters.time.sunrise'))
+
+    def test_on_stop_cancels_scheduled_events(self):
+        self.init_session()
+        self.module.event_scheduler.schedule('sunrise', time.time() + 3600, Mock())
+
+        self.module._on_stop()
+
+        self.assertEqual(self.module.event_scheduler.get_events(), {})
 
     def test_get_time(self):
         utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0) # 1591645808
@@ -350,6 +870,88 @@ class TestsParameters(unittest.TestCase):
                 'weekday_literal': 'monday'
             })
 
+    def test_get_time_reuses_snapshot_during_minute(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module._time_task()
+
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 40, 0)
+        with mock_datetime(utc_now, datetime):
+            first = self.module.get_time()
+            second = self.module.get_time()
+
+        self.assertIs(first, second)
+        self.assertEqual(first['iso'], '2020-06-08T20:50:08+01:00')
+
+    def test_get_time_refreshes_snapshot_on_new_minute(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            first = self.module.get_time()
+
+        utc_now = datetime.datetime(2020, 6, 8, 19, 51, 0, 0)
+        with mock_datetime(utc_now, datetime):
+            second = self.module.get_time()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second['minute'], 51)
+
+    def test_get_time_refreshes_snapshot_on_sun_update(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            devices = self.module.get_module_devices()
+            self.module.suns['sunrise'] = 123
+            devices = self.module.get_module_devices()
+
+        uid = list(devices.keys())[0]
+        self.assertEqual(devices[uid]['sunrise'], 123)
+
+    def test_time_task_shares_snapshot(self):
+        utc_now = datetime.datetime(2020, 6, 8, 19, 50, 8, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module.time_now_event = Mock()
+
+            self.module._time_task()
+            the_time = self.module.get_time()
+
+        params = self.module.time_now_event.send.call_args[1]['params']
+        self.assertEqual(params, dict(the_time, sunrise=self.module.suns['sunrise'], sunset=self.module.suns['sunset']))
+        with self.assertRaises(TypeError):
+            the_time['hour'] = 0
+
+    def test_time_task_offset_changed_event(self):
+        utc_now = datetime.datetime(2021, 3, 28, 0, 59, 0, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module.timezone = pytz.timezone('Europe/Paris')
+            self.module._time_task()
+        self.assertFalse(self.session.event_called('parameters.time.offsetchanged'))
+
+        utc_now = datetime.datetime(2021, 3, 28, 1, 0, 0, 0)
+        with mock_datetime(utc_now, datetime):
+            self.module._time_task()
+
+        self.assertTrue(self.session.event_called_with('parameters.time.offsetchanged', {
+            'timezone': 'Europe/Paris',
+            'offset': 7200,
+            'previous_offset': 3600,
+        }))
+        self.assertEqual(self.module.get_time()['iso'], '2021-03-28T03:00:00+02:00')
+
+    def test_time_task_no_offset_changed_event_on_timezone_change(self):
+        utc_now = datetime.datetime(2021, 3, 28, 0, 59, 0, 0)
+        with mock_datetime(utc_now, datetime):
+            self.init_session()
+            self.module.timezone = pytz.timezone('Europe/Paris')
+            self.module._time_task()
+            self.module.timezone = pytz.timezone('Asia/Tokyo')
+            self.module._time_task()
+
+        self.assertFalse(self.session.event_called('parameters.time.offsetchanged'))
+
     @patch('cleep.libs.configs.hostname.Hostname')
     def test_set_hostname_succeed(self, mock_hostname):
         self.init_session(mock_hostname=mock_hostname)
@@ -361,11 +963,21 @@ class TestsParameters(unittest.TestCase):
 
     @patch('backend.parameters.Hostname')
     def test_set_hostname_failed(self, mock_hostname):
-        self.init_session(mock_hostname=mock_hostname, set_hostname_return_value=False)
+        self.init_session(mock_hostname=mock_hostname, set_hostname_return_value=False, get_hostname_return_value='other')
         
         self.assertFalse(self.module.set_hostname('dummy'))
         self.assertFalse(self.session.event_called('parameters.hostname.update'))
 
+    @patch('backend.parameters.Hostname')
+    def test_set_hostname_unchanged(self, mock_hostname):
+        self.init_session(mock_hostname=mock_hostname, get_hostname_return_value='dummy')
+
+        self.assertTrue(self.module.set_hostname('dummy'))
+
+        mock_hostname.return_value.set_hostname.assert_not_called()
+        self.assertFalse(self.session.event_called('parameters.hostname.update'))
+        self.assertEqual(self.module.get_skipped_updates()['hostname'], 1)
+
     def test_set_hostname_invalid_name(self):
         self.init_session()
 
@@ -390,33 +1002,140 @@ class TestsParameters(unittest.TestCase):
         self.assertTrue('latitude' in position)
         self.assertTrue('longitude' in position)
 
+    def mock_position_job(self, timezone='Europe/Paris', country={'country': 'France', 'alpha2': 'FR'}):
+        self.module.geo_resolver.resolve_timezone = Mock(return_value=timezone)
+        self.module.geo_resolver.resolve_country = Mock(return_value=country)
+        self.module.solar.compute_day = Mock(return_value=dict.fromkeys(SOLAR_EVENTS_NAMES))
+        self.module._PositionMixin__apply_timezone = Mock(return_value=True)
+
     def test_set_position(self):
         self.init_session()
-        self.module.set_timezone = MagicMock()
-        self.module.set_country = MagicMock()
-        self.module.set_sun = MagicMock()
+        self.mock_position_job()
+
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.wait_position_job()
+
+        position = {'latitude': 48.8591554, 'longitude': 2.2907284}
+        self.module.geo_resolver.resolve_timezone.assert_called_with(position)
+        self.module.geo_resolver.resolve_country.assert_called_with(position)
+        self.module.solar.compute_day.assert_called_with(position, pytz.timezone('Europe/Paris'))
+        self.module._PositionMixin__apply_timezone.assert_called_with('Europe/Paris')
+        self.assertEqual(self.module.get_country(), {'country': 'France', 'alpha2': 'FR'})
+        self.assertEqual(self.module.get_position(), position)
+
+        job = self.module.get_position_job(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertIsNone(job['stage'])
+        self.assertEqual(job['position'], position)
+        self.assertEqual(job['timezone'], self.module.get_timezone())
+        self.assertEqual(job['country'], self.module.get_country())
+        self.assertEqual(job['sun'], self.module.get_sun())
+
+    def test_set_position_events(self):
+        self.init_session()
+        self.mock_position_job()
 
-        self.module.set_position(48.8591554, 2.2907284)
-        self.assertTrue(self.module.set_timezone.called)
-        self.assertTrue(self.module.set_country.called)
-        self.assertTrue(self.module.set_sun.called)
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.wait_position_job()
 
-        position = self.module.get_position()
-        self.assertEqual(position['latitude'], 48.8591554)
-        self.assertEqual(position['longitude'], 2.2907284)
+        for stage, progress in [('resolve', 0), ('timezone', 20), ('country', 40), ('sun', 60), ('time', 80)]:
+            self.assertTrue(self.session.event_called_with('parameters.position.progress', {
+                'job_id': job_id,
+                'stage': stage,
+                'progress': progress,
+            }))
+        self.assertTrue(self.session.event_called_with('parameters.position.update', {
+            'job_id': job_id,
+            'status': 'done',
+            'stage': None,
+            'position': {'latitude': 48.8591554, 'longitude': 2.2907284},
+            'timezone': self.module.get_timezone(),
+            'country': self.module.get_country(),
+            'sun': self.module.get_sun(),
+            'error': None,
+        }))
 
-    def test_set_position_exception(self):
+    def test_set_position_resolution_not_found(self):
         self.init_session()
+        self.mock_position_job(timezone=None)
+        self.module.geo_resolver.resolve_country.side_effect = Exception('Test exception')
 
-        with self.assertRaises(MissingParameter) as cm:
-            self.module.set_position(None, 2.2907284)
-        self.assertEqual(str(cm.exception), 'Parameter "latitude" is missing')
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.wait_position_job()
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_position(48, 2.2907284)
-        self.assertEqual(str(cm.exception), 'Parameter "latitude" is invalid')
+        self.assertEqual(self.module.get_position_job(job_id)['status'], 'done')
+        self.module._PositionMixin__apply_timezone.assert_not_called()
+        self.module.solar.compute_day.assert_called_with({'latitude': 48.8591554, 'longitude': 2.2907284}, self.module.timezone)
+        self.assertFalse(self.session.event_called('parameters.country.update'))
 
-        with self.assertRaises(MissingParameter) as cm:
+    def test_set_position_unspecified_position(self):
+        self.init_session()
+        self.mock_position_job()
+
+        self.module.set_position(0.0, 0.0)
+        self.wait_position_job()
+
+        self.module.geo_resolver.resolve_timezone.assert_not_called()
+        self.module.geo_resolver.resolve_country.assert_not_called()
+        self.module.solar.compute_day.assert_called()
+
+    def test_set_position_job_failed(self):
+        self.init_session()
+        self.mock_position_job()
+        self.module._PositionMixin__apply_timezone.side_effect = CommandError('Unable to save timezone')
+
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.wait_position_job()
+
+        job = self.module.get_position_job(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['stage'], 'timezone')
+        self.assertEqual(job['error'], 'Unable to save timezone')
+        self.assertFalse(self.session.event_called('parameters.country.update'))
+        self.assertTrue(self.session.event_called('parameters.position.update'))
+
+    def test_set_position_update_event_failed(self):
+        self.init_session()
+        self.mock_position_job()
+        self.module.position_update_event = Mock()
+        self.module.position_update_event.send.side_effect = Exception('Test exception')
+
+        with patch.object(self.module.position_jobs.logger, 'exception') as mock_exception:
+            job_id = self.module.set_position(48.8591554, 2.2907284)
+            self.wait_position_job()
+
+        mock_exception.assert_called_with('Unable to send position update event for job %s', job_id)
+        self.assertEqual(self.module.get_position_job(job_id)['status'], 'done')
+
+    def test_get_position_job_unknown_job(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_position_job('dummy')
+        self.assertEqual(str(cm.exception), 'Job "dummy" does not exist')
+
+    def test_get_position_job_history(self):
+        self.init_session()
+        self.module.position_jobs.run = Mock()
+
+        job_ids = [self.module.set_position(48.8591554, 2.2907284) for _ in range(11)]
+
+        with self.assertRaises(InvalidParameter):
+            self.module.get_position_job(job_ids[0])
+        self.assertEqual(self.module.get_position_job(job_ids[10])['status'], 'pending')
+
+    def test_set_position_exception(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.set_position(None, 2.2907284)
+        self.assertEqual(str(cm.exception), 'Parameter "latitude" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_position(48, 2.2907284)
+        self.assertEqual(str(cm.exception), 'Parameter "latitude" is invalid')
+
+        with self.assertRaises(MissingParameter) as cm:
             self.module.set_position(48.8591554, None)
         self.assertEqual(str(cm.exception), 'Parameter "longitude" is missing')
 
@@ -429,6 +1148,94 @@ class TestsParameters(unittest.TestCase):
             self.module.set_position(48.8591554, 2.2907284)
         self.assertEqual(str(cm.exception), 'Unable to save position')
 
+    @patch('backend.georesolver.reverse_geocode')
+    @patch('backend.georesolver.TimezoneFinder')
+    @patch('backend.parameters.time.time', Mock(return_value=1591600000))
+    def test_resolve_positions(self, mock_tzfinder, mock_reverse_geo):
+        self.init_session()
+        mock_tzfinder.return_value.timezone_at.side_effect = ['Europe/Paris', 'America/New_York']
+        mock_reverse_geo.search.return_value = [
+            {'country_code': 'FR', 'country': 'France', 'city': 'Paris'},
+            {'country_code': 'US', 'country': 'United States', 'city': 'New York City'},
+        ]
+        self.module._set_config_field = Mock()
+
+        results = self.module.resolve_positions([
+            {'latitude': 48.8591554, 'longitude': 2.2907284},
+            {'latitude': 40.7127, 'longitude': -74.0059},
+        ])
+        logging.debug('Results: %s', results)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['timezone'], 'Europe/Paris')
+        self.assertEqual(results[0]['country'], {'country': 'France', 'alpha2': 'FR'})
+        self.assertEqual(results[1]['timezone'], 'America/New_York')
+        self.assertEqual(results[1]['country'], {'country': 'United States', 'alpha2': 'US'})
+        self.assertEqual(results[1]['latitude'], 40.7127)
+        self.assertEqual(results[1]['longitude'], -74.0059)
+        for result in results:
+            self.assertEqual(len(result['sun']), 22)
+            self.assertIn('sunrise_iso', result['sun'])
+            self.assertIn('sunset_iso', result['sun'])
+            self.assertIn('solar_noon_iso', result['sun'])
+        self.assertTrue(results[0]['sun']['sunrise_iso'].endswith('+02:00'))
+        self.assertTrue(results[1]['sun']['sunrise_iso'].endswith('-04:00'))
+        mock_reverse_geo.search.assert_called_once_with(((48.8591554, 2.2907284), (40.7127, -74.0059)))
+        mock_tzfinder.assert_called_once()
+        self.module._set_config_field.assert_not_called()
+        self.assertFalse(self.session.event_called('parameters.country.update'))
+
+    @patch('backend.georesolver.reverse_geocode')
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_resolve_positions_use_caches(self, mock_tzfinder, mock_reverse_geo):
+        self.init_session(geoindex_lookup_return_value={
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+            'border': False,
+        })
+
+        results = self.module.resolve_positions([{'latitude': 48.8591554, 'longitude': 2.2907284}])
+
+        self.assertEqual(results[0]['timezone'], 'Europe/Paris')
+        self.assertEqual(results[0]['country'], {'country': 'France', 'alpha2': 'FR'})
+        mock_reverse_geo.search.assert_not_called()
+        mock_tzfinder.assert_not_called()
+
+    @patch('backend.georesolver.reverse_geocode')
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_resolve_positions_closest_timezone(self, mock_tzfinder, mock_reverse_geo):
+        self.init_session()
+        mock_tzfinder.return_value.timezone_at.return_value = None
+        mock_tzfinder.return_value.closest_timezone_at.return_value = 'Atlantic/Azores'
+        mock_reverse_geo.search.return_value = [{'country_code': 'PT', 'country': 'Portugal'}]
+
+        results = self.module.resolve_positions([{'latitude': 40.0, 'longitude': -30.0}])
+
+        self.assertEqual(results[0]['timezone'], 'Atlantic/Azores')
+
+    def test_resolve_positions_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': 48.8591554}])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': '48.8', 'longitude': 2.29}])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions(['dummy'])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': 90.5, 'longitude': 2.29}])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': -90.5, 'longitude': 2.29}])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': 48.8, 'longitude': 180.5}])
+        with self.assertRaises(InvalidParameter):
+            self.module.resolve_positions([{'latitude': 48.8, 'longitude': 2.29}, {'latitude': 48.8, 'longitude': -180.5}])
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.resolve_positions([{'latitude': 1.0, 'longitude': 1.0}] * 1001)
+        self.assertEqual(str(cm.exception), 'Parameter "positions" must contain at most 1000 positions')
+
     def test_get_country(self):
         self.init_session()
         country = self.module.get_country()
@@ -437,12 +1244,10 @@ class TestsParameters(unittest.TestCase):
 
     def test_set_country(self):
         self.init_session()
-        original_set_country = self.module.set_country
-        self.module.set_timezone = MagicMock()
-        self.module.set_country = MagicMock()
-        self.module.set_sun = MagicMock()
-        self.module.set_position(48.8591554, 2.2907284)
-        self.module.set_country = original_set_country
+        self.module._set_config_field('position', {
+            'latitude': 48.8591554,
+            'longitude': 2.2907284,
+        })
 
         self.module.set_country()
         country = self.module.get_country()
@@ -454,7 +1259,7 @@ class TestsParameters(unittest.TestCase):
             'country': 'France',
         }))
 
-    @patch('backend.parameters.reverse_geocode')
+    @patch('backend.georesolver.reverse_geocode')
     def test_set_country_geocode_exception(self, mock_reverse_geo):
         mock_reverse_geo.search.side_effect = Exception('Test exception')
         self.init_session()
@@ -463,14 +1268,53 @@ class TestsParameters(unittest.TestCase):
 
         self.assertFalse(self.session.event_called('parameters.country.update'))
 
+    @patch('backend.georesolver.reverse_geocode')
+    def test_set_country_from_geoindex(self, mock_reverse_geo):
+        self.init_session(geoindex_lookup_return_value={
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+            'border': False,
+        })
+
+        self.module.set_country()
+
+        mock_reverse_geo.search.assert_not_called()
+        self.assertTrue(self.session.event_called_with('parameters.country.update', {
+            'alpha2': 'FR',
+            'country': 'France',
+        }))
+
+    @patch('backend.georesolver.reverse_geocode')
+    def test_set_country_from_resolution_cache(self, mock_reverse_geo):
+        self.init_session()
+        self.module.resolution_cache.update(52.204, 0.1208, country={'country': 'France', 'alpha2': 'FR'})
+
+        self.module.set_country()
+
+        mock_reverse_geo.search.assert_not_called()
+        self.assertTrue(self.session.event_called_with('parameters.country.update', {
+            'alpha2': 'FR',
+            'country': 'France',
+        }))
+
+    @patch('backend.georesolver.reverse_geocode')
+    def test_set_country_unchanged(self, mock_reverse_geo):
+        self.init_session()
+        mock_reverse_geo.search.return_value = [{'country_code': 'GB', 'country': 'United Kingdom'}]
+        self.module._set_config_field = Mock()
+
+        self.module.set_country()
+
+        self.module._set_config_field.assert_not_called()
+        self.assertFalse(self.session.event_called('parameters.country.update'))
+        self.assertEqual(self.module.get_skipped_updates(), {'timezone': 0, 'country': 1, 'hostname': 0})
+
     def test_set_country_commanderror(self):
         self.init_session()
-        original_set_country = self.module.set_country
-        self.module.set_timezone = MagicMock()
-        self.module.set_country = MagicMock()
-        self.module.set_sun = MagicMock()
-        self.module.set_position(48.8591554, 2.2907284)
-        self.module.set_country = original_set_country
+        self.module._set_config_field('position', {
+            'latitude': 48.8591554,
+            'longitude': 2.2907284,
+        })
         self.module._set_config_field = Mock(return_value=False)
 
         with self.assertRaises(CommandError) as cm:
@@ -488,12 +1332,10 @@ class TestsParameters(unittest.TestCase):
 
     def test_set_timezone(self):
         self.init_session()
-        original_set_timezone = self.module.set_timezone
-        self.module.set_timezone = MagicMock()
-        self.module.set_country = MagicMock()
-        self.module.set_sun = MagicMock()
-        self.module.set_position(48.8591554, 2.2907284)
-        self.module.set_timezone = original_set_timezone
+        self.module._set_config_field('position', {
+            'latitude': 48.8591554,
+            'longitude': 2.2907284,
+        })
 
         self.assertTrue(self.module.set_timezone())
 
@@ -506,19 +1348,19 @@ class TestsParameters(unittest.TestCase):
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('backend.georesolver.TimezoneFinder')
     def test_set_timezone_timezonefinder_exception(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_side_effect=Exception('Test exception'))
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('backend.georesolver.TimezoneFinder')
     def test_set_timezone_timezonefinder_valueerror(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_side_effect=ValueError('Test exception'))
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('backend.georesolver.TimezoneFinder')
     def test_set_timezone_unable_set_config(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Paris')
 
@@ -527,7 +1369,7 @@ class TestsParameters(unittest.TestCase):
             self.module.set_timezone()
         self.assertEqual(str(cm.exception), 'Unable to save timezone')
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('backend.georesolver.TimezoneFinder')
     def test_set_timezone_invalid_timezone(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Dummy')
 
@@ -537,18 +1379,78 @@ class TestsParameters(unittest.TestCase):
 
     def test_set_timezone_unable_write_system_file(self):
         self.init_session()
+        self.module.timezone = pytz.utc
 
         self.module.cleep_filesystem.write_data = Mock(return_value=False)
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.Console')
+    @patch('backend.systemtimezone.Console')
     def test_set_timezone_command_failed(self, mock_console):
         self.init_session()
+        self.module.timezone = pytz.utc
+        self.module.cleep_filesystem.move = Mock(return_value=False)
 
         mock_console.return_value.command.return_value = {'returncode': 1, 'stderr': 'Test error'}
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('backend.parameters.os.path.realpath', Mock(side_effect=lambda path: '/usr/share/zoneinfo/Europe/London'))
+    @patch('backend.systemtimezone.Console')
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_unchanged(self, mock_tzfinder, mock_console):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London')
+        self.module.cleep_filesystem = self.module.system_timezone.cleep_filesystem = Mock()
+        self.module._set_config_field = Mock()
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module._set_config_field.assert_not_called()
+        self.module.cleep_filesystem.ln.assert_not_called()
+        mock_console.return_value.command.assert_not_called()
+        self.assertEqual(self.module.get_skipped_updates()['timezone'], 1)
+
+    @patch('backend.parameters.os.path.realpath', Mock(side_effect=lambda path: path))
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_system_timezone_differs(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London')
+        self.module.cleep_filesystem = self.module.system_timezone.cleep_filesystem = Mock()
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.cleep_filesystem.ln.assert_called()
+        self.assertEqual(self.module.get_skipped_updates()['timezone'], 0)
+
+    @patch('backend.systemtimezone.Console')
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_switch_system_files(self, mock_tzfinder, mock_console):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Paris')
+        self.module.cleep_filesystem = self.module.system_timezone.cleep_filesystem = Mock()
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.cleep_filesystem.ln.assert_called_with('/usr/share/zoneinfo/Europe/Paris', '/etc/localtime.tmp', force=True)
+        self.module.cleep_filesystem.write_data.assert_called_with('/etc/timezone.tmp', 'Europe/Paris')
+        self.module.cleep_filesystem.move.assert_any_call('/etc/localtime.tmp', '/etc/localtime')
+        self.module.cleep_filesystem.move.assert_any_call('/etc/timezone.tmp', '/etc/timezone')
+        self.module.cleep_filesystem.rm.assert_not_called()
+        mock_console.return_value.command.assert_not_called()
+        self.assertEqual(self.module.timezone.zone, 'Europe/Paris')
+
+    @patch('backend.systemtimezone.Console')
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_switch_failed_fallback_tzdata(self, mock_tzfinder, mock_console):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Paris')
+        self.module.cleep_filesystem = self.module.system_timezone.cleep_filesystem = Mock()
+        self.module.cleep_filesystem.ln.side_effect = Exception('Test exception')
+        mock_console.return_value.command.return_value = {'returncode': 0, 'stderr': ''}
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.cleep_filesystem.rm.assert_called_with('/etc/localtime')
+        self.module.cleep_filesystem.write_data.assert_called_with('/etc/timezone', 'Europe/Paris')
+        mock_console.return_value.command.assert_called_with('dpkg-reconfigure -f noninteractive tzdata', timeout=60.0)
+        self.assertEqual(self.module.timezone.zone, 'Europe/Paris')
+
+    @patch('backend.georesolver.TimezoneFinder')
     def test_set_timezone_timezonefinder_extend_timezone_search(self, mock_tzfinder):
         mock_tzfinder.return_value.closest_timezone_at = Mock(return_value='Europe/Paris')
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value=None)
@@ -558,7 +1460,192 @@ class TestsParameters(unittest.TestCase):
         })
 
         self.assertTrue(self.module.set_timezone())
-        mock_tzfinder.return_value.closest_timezone_at.assert_called_with(lat=52.204, lng=0.1208)
+        mock_tzfinder.return_value.closest_timezone_at.assert_called_with(lat=52.204, lng=0.1208, delta_degree=1)
+
+    def test_search_closest_timezone_widen_radius(self):
+        self.init_session()
+        finder = Mock()
+        finder.closest_timezone_at.side_effect = [None, None, 'Atlantic/Azores']
+
+        result = self.module.geo_resolver.search_closest_timezone(finder, {'latitude': 40.0, 'longitude': -30.0}, 10.0)
+
+        self.assertEqual(result, ('Atlantic/Azores', 3))
+        finder.closest_timezone_at.assert_called_with(lat=40.0, lng=-30.0, delta_degree=3)
+
+    def test_search_closest_timezone_max_radius(self):
+        self.init_session()
+        finder = Mock()
+        finder.closest_timezone_at.return_value = None
+
+        result = self.module.geo_resolver.search_closest_timezone(finder, {'latitude': 40.0, 'longitude': -30.0}, 10.0)
+
+        self.assertEqual(result, (None, 10))
+        self.assertEqual(finder.closest_timezone_at.call_count, 10)
+
+    @patch('backend.parameters.time.monotonic')
+    def test_search_closest_timezone_deadline(self, mock_monotonic):
+        self.init_session()
+        finder = Mock()
+        finder.closest_timezone_at.return_value = None
+        # deadline=10, 1st step lasts 2s, 2nd step estimated to 8s (would end at 10.5s)
+        mock_monotonic.side_effect = [0.0, 0.0, 2.0, 2.5]
+
+        result = self.module.geo_resolver.search_closest_timezone(finder, {'latitude': 40.0, 'longitude': -30.0}, 10.0)
+
+        self.assertEqual(result, (None, 1))
+        self.assertEqual(finder.closest_timezone_at.call_count, 1)
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_from_geoindex(self, mock_tzfinder):
+        self.init_session(geoindex_lookup_return_value={
+            'timezone': 'Europe/London',
+            'country': {'country': 'United Kingdom', 'alpha2': 'GB'},
+            'border': False,
+        })
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.geo_resolver.geoindex.lookup.assert_called_with(52.204, 0.1208)
+        mock_tzfinder.assert_not_called()
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_geoindex_border_tile(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London', geoindex_lookup_return_value={
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+            'border': True,
+        })
+
+        self.assertTrue(self.module.set_timezone())
+
+        mock_tzfinder.return_value.timezone_at.assert_called_with(lat=52.204, lng=0.1208)
+        self.assertEqual(self.module.get_timezone(), 'Europe/London')
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_from_resolution_cache(self, mock_tzfinder):
+        self.init_session()
+        self.module.resolution_cache.update(52.2041, 0.1209, timezone='Europe/London')
+
+        self.assertTrue(self.module.set_timezone())
+
+        mock_tzfinder.assert_not_called()
+        self.module.geo_resolver.geoindex.lookup.assert_not_called()
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_update_resolution_cache(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London')
+
+        self.module.set_timezone()
+
+        self.assertEqual(self.module.resolution_cache.get(52.204, 0.1208), {'timezone': 'Europe/London'})
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_get_timezonefinder_built_on_demand(self, mock_tzfinder):
+        self.init_session()
+        mock_tzfinder.assert_not_called()
+
+        finder = self.module.geo_resolver.get_timezonefinder()
+        self.assertEqual(finder, self.module.geo_resolver.get_timezonefinder())
+
+        mock_tzfinder.assert_called_once_with(in_memory=False)
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_set_timezone_schedules_timezonefinder_release(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London')
+        mock_timer = Mock()
+        self.session.task_factory.create_timer = Mock(return_value=mock_timer)
+
+        self.module.set_timezone()
+
+        self.session.task_factory.create_timer.assert_called_with(300.0, self.module.geo_resolver.release_timezonefinder)
+        mock_timer.start.assert_called()
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_release_timezonefinder(self, mock_tzfinder):
+        self.init_session()
+        self.module.geo_resolver.get_timezonefinder()
+
+        self.module.geo_resolver.release_timezonefinder()
+        self.module.geo_resolver.get_timezonefinder()
+
+        self.assertEqual(mock_tzfinder.call_count, 2)
+
+    def test_config_snapshot_read_without_config_layer(self):
+        self.init_session()
+        self.module._get_config_field('position')
+
+        with patch.object(CleepModule, '_get_config') as mock_get_config:
+            self.module.get_position()
+            self.module.get_country()
+            self.module.get_timezone()
+            mock_get_config.assert_not_called()
+
+    def test_config_snapshot_is_read_only(self):
+        self.init_session()
+
+        position = self.module._get_config_field('position')
+
+        self.assertEqual(position, {'latitude': 52.2040, 'longitude': 0.1208})
+        with self.assertRaises(TypeError):
+            position['latitude'] = 0
+
+    def test_config_snapshot_replaced_after_write(self):
+        self.init_session()
+        version = self.module.get_config_version()
+        previous = self.module._get_config_field('country')
+
+        self.assertTrue(self.module._set_config_field('country', {'country': 'France', 'alpha2': 'FR'}))
+
+        self.assertEqual(self.module.get_config_version(), version + 1)
+        self.assertEqual(self.module._get_config_field('country'), {'country': 'France', 'alpha2': 'FR'})
+        self.assertEqual(previous, {'country': 'United Kingdom', 'alpha2': 'GB'})
+
+    def test_config_snapshot_updated_by_update_config(self):
+        self.init_session()
+        version = self.module.get_config_version()
+
+        self.assertTrue(self.module._update_config({'timezone': 'Europe/Paris', 'timestamp': 123}))
+
+        self.assertGreater(self.module.get_config_version(), version)
+        self.assertEqual(self.module._get_config_field('timezone'), 'Europe/Paris')
+        self.assertEqual(self.module._get_config_field('timestamp'), 123)
+
+    def test_config_snapshot_kept_after_failed_write(self):
+        self.init_session()
+        version = self.module.get_config_version()
+
+        with patch.object(CleepModule, '_set_config_field', return_value=False):
+            self.assertFalse(self.module._set_config_field('timezone', 'Europe/Paris'))
+
+        self.assertEqual(self.module.get_config_version(), version)
+        self.assertEqual(self.module._get_config_field('timezone'), 'Europe/London')
+
+    def test_config_snapshot_refreshed_after_device_write(self):
+        self.init_session()
+        version = self.module.get_config_version()
+
+        device = self.module._add_device({'type': 'dummy', 'name': 'Dummy'})
+
+        self.assertIsNotNone(device)
+        self.assertGreater(self.module.get_config_version(), version)
+        version = self.module.get_config_version()
+        self.module._update_device(device['uuid'], {'type': 'dummy', 'name': 'Renamed'})
+        self.assertGreater(self.module.get_config_version(), version)
+        version = self.module.get_config_version()
+        self.module._delete_device(device['uuid'])
+        self.assertGreater(self.module.get_config_version(), version)
+
+    def test_config_snapshot_not_served_to_devices(self):
+        self.init_session()
+        self.module._add_device({'type': 'dummy', 'name': 'Dummy'})
+
+        devices = self.module._get_config_field('devices')
+        module_devices = self.module.get_module_devices()
+
+        self.assertNotIsInstance(devices, FrozenDict)
+        self.assertEqual(len(module_devices), 2)
+        clock = [device for device in module_devices.values() if device['type'] == 'clock'][0]
+        self.assertIn('timestamp', clock)
 
     def test_get_non_working_days(self):
         self.init_session()
@@ -582,131 +1669,1550 @@ class TestsParameters(unittest.TestCase):
 
     def test_get_non_working_day_unknown_country(self):
         self.init_session()
-        self.module._get_config_field = Mock(return_value={"country": "country", "alpha2": "CO"})
+        self.module._get_config_field = Mock(return_value={"country": "country", "alpha2": "XX"})
 
         holidays = self.module.get_non_working_days(2021)
         logging.debug('Holidays: %s', holidays)
 
         self.assertListEqual(holidays, [])
 
-    def test_is_non_working_day(self):
+    def test_get_non_working_days_country_name_independent(self):
         self.init_session()
+        # country name used to be converted to workalendar class name
+        self.module._get_config_field = Mock(return_value={"country": "Côte d'Ivoire", "alpha2": "CI"})
 
-        self.assertTrue(self.module.is_non_working_day('2021-01-01'))
-        self.assertFalse(self.module.is_non_working_day('2021-01-02'))
+        holidays = self.module.get_non_working_days(2021)
 
-    def test_is_today_non_working_day(self):
+        self.assertIn(('2021-08-07', 'Independence Day'), holidays)
+
+    def test_get_non_working_days_cached(self):
         self.init_session()
+        holidays = self.module.get_non_working_days(2021)
 
-        with patch('backend.parameters.datetime') as datetime_mock:
-            datetime_mock.date.today.return_value = datetime.date.fromisoformat('2021-01-01')
-            self.module.is_non_working_day = Mock()
-            self.assertTrue(self.module.is_today_non_working_day())
-            self.module.is_non_working_day.assert_called_with('2021-01-01')
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.assertListEqual(self.module.get_non_working_days(2021), holidays)
+            self.assertTrue(self.module.is_non_working_day('2021-12-25'))
+            mock_importlib.import_module.assert_not_called()
+        self.assertIn(('GB', 2021), self.module.holidays_cache)
 
-    @patch('backend.parameters.CleepConf')
-    def test_get_auth_accounts(self, mock_cleepconf):
-        accounts = ['account1', 'account2']
-        mock_cleepconf.return_value.get_auth_accounts.return_value = accounts
+    def test_get_non_working_days_cache_cleared_when_country_changes(self):
         self.init_session()
+        self.module.get_non_working_days(2021)
 
-        result = self.module.get_auth_accounts()
+        self.module._PositionMixin__apply_country({'country': 'France', 'alpha2': 'FR'})
+        self.wait_holidays_job()
 
-        self.assertListEqual(result, accounts)
+        self.assertNotIn(('GB', 2021), self.module.holidays_cache)
+        self.assertIn(('2021-07-14', 'Bastille Day'), self.module.get_non_working_days(2021))
 
-    @patch('backend.parameters.CleepConf')
-    def test_add_auth_account(self, mock_cleepconf):
-        account = 'account'
-        password = 'password'
+    def test_apply_country_after_stop(self):
         self.init_session()
-        self.module._Parameters__reload_rpcserver_auth = Mock()
+        self.module._on_stop()
 
-        result = self.module.add_auth_account(account, password)
+        self.module._PositionMixin__apply_country({'country': 'France', 'alpha2': 'FR'})
 
-        mock_cleepconf.return_value.add_auth_account.assert_called_with(account, password)
-        self.module._Parameters__reload_rpcserver_auth.assert_called()
+        self.assertTrue(self.session.event_called('parameters.country.update'))
 
-    @patch('backend.parameters.CleepConf')
-    def test_add_auth_account_invalid_parameters(self, mock_cleepconf):
+    def test_precompute_holidays(self):
         self.init_session()
+        year = datetime.date.today().year
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.add_auth_account(123, 'password')
-        self.assertEqual(str(cm.exception), 'Parameter "account" must be of type "str"')
-
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.add_auth_account('account', 123)
-        self.assertEqual(str(cm.exception), 'Parameter "password" must be of type "str"')
+        self.assertIsNotNone(self.module.holiday_bitsets.get('GB', year))
+        self.assertIsNotNone(self.module.holiday_bitsets.get('GB', year + 1))
+        self.module.holiday_bitsets.save.assert_called()
 
-    @patch('backend.parameters.CleepConf')
-    def test_add_auth_account_failure(self, mock_cleepconf):
-        mock_cleepconf.return_value.add_auth_account = Mock(side_effect=Exception('Test error'))
+    def test_precompute_holidays_drops_previous_country(self):
         self.init_session()
+        year = datetime.date.today().year
+        self.module.holiday_bitsets.set('FR', year, 1)
+        self.module.holiday_bitsets.set('GB', year - 1, 1)
 
-        with self.assertRaises(CommandError) as cm:
-            self.module.add_auth_account('account', 'password')
-        self.assertEqual(str(cm.exception), 'Test error')
+        self.module.working_days.precompute()
 
-    @patch('backend.parameters.CleepConf')
-    def test_delete_auth_account(self, mock_cleepconf):
-        account = 'account'
+        self.assertEqual(len(self.module.holiday_bitsets), 2)
+        self.assertIsNone(self.module.holiday_bitsets.get('FR', year))
+        self.assertIsNone(self.module.holiday_bitsets.get('GB', year - 1))
+
+    def test_precompute_holidays_without_country(self):
         self.init_session()
-        self.module._Parameters__reload_rpcserver_auth = Mock()
+        self.module._get_config_field = Mock(return_value=None)
+        self.module.holiday_bitsets.save.reset_mock()
 
-        result = self.module.delete_auth_account(account)
+        self.module.working_days.precompute()
 
-        mock_cleepconf.return_value.delete_auth_account.assert_called_with(account)
-        self.module._Parameters__reload_rpcserver_auth.assert_called()
+        self.module.holiday_bitsets.save.assert_not_called()
 
-    @patch('backend.parameters.CleepConf')
-    def test_delete_auth_account_invalid_parameters(self, mock_cleepconf):
+    def test_is_non_working_day_uses_stored_bitsets(self):
         self.init_session()
+        # only 2nd january is a holiday
+        self.module.holiday_bitsets.set('GB', 2021, 0b10)
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.delete_auth_account(123)
-        self.assertEqual(str(cm.exception), 'Parameter "account" must be of type "str"')
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.assertFalse(self.module.is_non_working_day('2021-01-01'))
+            self.assertTrue(self.module.is_non_working_day('2021-01-02'))
+            self.assertEqual(self.module.are_non_working_days(['2021-01-01', '2021-01-02']), [False, True])
+            mock_importlib.import_module.assert_not_called()
 
-    @patch('backend.parameters.CleepConf')
-    def test_delete_auth_account_failure(self, mock_cleepconf):
-        mock_cleepconf.return_value.delete_auth_account = Mock(side_effect=Exception('Test error'))
+    def test_is_non_working_day(self):
         self.init_session()
 
-        with self.assertRaises(CommandError) as cm:
-            self.module.delete_auth_account('account')
-        self.assertEqual(str(cm.exception), 'Test error')
+        self.assertTrue(self.module.is_non_working_day('2021-01-01'))
+        self.assertFalse(self.module.is_non_working_day('2021-01-02'))
 
-    @patch('backend.parameters.CleepConf')
-    def test_enable_auth(self, mock_cleepconf):
+    def test_are_non_working_days(self):
         self.init_session()
-        self.module._Parameters__reload_rpcserver_auth = Mock()
-        mock_cleepconf.return_value.get_auth_accounts.return_value = ['accnunt']
 
-        result = self.module.enable_auth()
+        self.assertEqual(
+            self.module.are_non_working_days(['2021-12-25', '2021-12-29', '2022-01-03', '2021-01-01']),
+            [True, False, True, True],
+        )
 
-        mock_cleepconf.return_value.enable_auth.assert_called_with(True)
-        self.module._Parameters__reload_rpcserver_auth.assert_called()
+    def test_are_non_working_days_invalid_parameters(self):
+        self.init_session()
 
-    @patch('backend.parameters.CleepConf')
-    def test_enable_auth_no_account_failure(self, mock_cleepconf):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.are_non_working_days([])
+        self.assertEqual(str(cm.exception), 'Parameter "days" must be a list of 1 to 366 days')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.are_non_working_days(['2021-12-25', '25/12/2021'])
+        self.assertEqual(str(cm.exception), 'Days must be in iso format (YYYY-MM-DD)')
+        with self.assertRaises(InvalidParameter):
+            self.module.are_non_working_days(['2021-12-25', 1])
+
+    def test_get_non_working_days_range(self):
         self.init_session()
-        self.module._Parameters__reload_rpcserver_auth = Mock()
-        mock_cleepconf.return_value.get_auth_accounts.return_value = []
+
+        days = self.module.get_non_working_days_range('2021-12-24', '2022-01-04')
+
+        # christmas, boxing day and shifts, new year and new year shift
+        self.assertEqual(days, [
+            False, True, True, True, True, False, False, False,
+            True, False, True, False,
+        ])
+        self.assertIn(('GB', 2021), self.module.holidays_cache)
+        self.assertIn(('GB', 2022), self.module.holidays_cache)
+
+    def test_get_non_working_days_range_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_non_working_days_range('2021-06-21', '21/06/2021')
+        self.assertEqual(str(cm.exception), 'Dates must be in iso format (YYYY-MM-DD)')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_non_working_days_range('2021-06-21', '2021-06-20')
+        self.assertEqual(str(cm.exception), 'Parameter "end_date" must be after "start_date"')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_non_working_days_range('2021-01-01', '2022-01-01')
+        self.assertEqual(str(cm.exception), 'Date range must not exceed 366 days')
+
+    def test_next_working_day(self):
+        self.init_session()
+
+        # christmas holidays then weekend
+        self.assertEqual(self.module.next_working_day('2021-12-24'), '2021-12-29')
+        # new year shift across years
+        self.assertEqual(self.module.next_working_day('2021-12-31'), '2022-01-04')
+        self.assertEqual(self.module.next_working_day('2021-06-14'), '2021-06-15')
+
+    def test_add_working_days(self):
+        self.init_session()
+
+        self.assertEqual(self.module.add_working_days('2021-12-23', 0), '2021-12-23')
+        self.assertEqual(self.module.add_working_days('2021-12-23', 3), '2021-12-30')
+        self.assertEqual(self.module.add_working_days('2021-01-01', 253), '2021-12-31')
+        self.assertEqual(self.module.add_working_days('2021-01-01', 254), '2022-01-04')
+
+    def test_add_working_days_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_working_days('2021-12-23', -1)
+        self.assertEqual(str(cm.exception), 'Parameter "days" must be between 0 and 3660')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_working_days('23/12/2021', 1)
+        self.assertEqual(str(cm.exception), 'Parameter "day" must be in iso format (YYYY-MM-DD)')
+        with self.assertRaises(InvalidParameter):
+            self.module.next_working_day(None)
+
+    def test_add_working_days_after_max_year(self):
+        self.init_session()
+
+        self.assertEqual(self.module.add_working_days('9999-12-29', 1), '9999-12-30')
+        with self.assertRaises(CommandError) as cm:
+            self.module.add_working_days('9999-12-30', 2)
+        self.assertEqual(str(cm.exception), 'No working day found')
+        with self.assertRaises(CommandError):
+            self.module.next_working_day('9999-12-31')
+
+    def test_count_working_days(self):
+        self.init_session()
+
+        self.assertEqual(self.module.count_working_days('2021-01-01', '2021-12-31'), 253)
+        self.assertEqual(self.module.count_working_days('2021-12-20', '2022-01-07'), 12)
+        self.assertEqual(self.module.count_working_days('2021-12-25', '2021-12-25'), 0)
+        self.assertEqual(self.module.count_working_days('2021-12-29', '2021-12-29'), 1)
+
+    def test_count_working_days_without_calendar(self):
+        self.init_session()
+        self.module._get_config_field = Mock(return_value={"country": "country", "alpha2": "XX"})
+
+        # weekends only
+        self.assertEqual(self.module.count_working_days('2021-01-01', '2021-12-31'), 261)
+
+    def test_count_working_days_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.count_working_days('2021-06-21', '2021-06-20')
+        self.assertEqual(str(cm.exception), 'Parameter "end_date" must be after "start_date"')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.count_working_days('2021-01-01', '2031-12-31')
+        self.assertEqual(str(cm.exception), 'Date range must not exceed 3660 days')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.count_working_days('2021-01-01', '2021/12/31')
+        self.assertEqual(str(cm.exception), 'Parameter "end_date" must be in iso format (YYYY-MM-DD)')
+
+    def test_working_days_not_cached_when_holidays_failed(self):
+        self.init_session()
+
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            mock_importlib.import_module.side_effect = Exception('Test exception')
+            # weekends only
+            self.assertEqual(self.module.count_working_days('2021-01-01', '2021-12-31'), 261)
+        self.assertNotIn(('GB', 2021), self.module.working_days_cache)
+
+        self.assertEqual(self.module.count_working_days('2021-01-01', '2021-12-31'), 253)
+        self.assertIn(('GB', 2021), self.module.working_days_cache)
+
+    def test_working_days_cache_cleared_when_country_changes(self):
+        self.init_session()
+        self.module.count_working_days('2021-01-01', '2021-12-31')
+
+        self.module._PositionMixin__apply_country({'country': 'France', 'alpha2': 'FR'})
+        self.wait_holidays_job()
+
+        self.assertNotIn(('GB', 2021), self.module.working_days_cache)
+        self.assertEqual(self.module.count_working_days('2021-07-12', '2021-07-16'), 4)
+
+    def test_is_today_non_working_day(self):
+        self.init_session()
+
+        with patch('backend.workingdaysmixin.datetime') as datetime_mock:
+            datetime_mock.date.today.return_value = datetime.date.fromisoformat('2021-01-01')
+            self.module.is_non_working_day = Mock()
+            self.assertTrue(self.module.is_today_non_working_day())
+            self.module.is_non_working_day.assert_called_with('2021-01-01')
+
+    @patch('backend.parameters.CleepConf')
+    def test_get_auth_accounts(self, mock_cleepconf):
+        accounts = ['account1', 'account2']
+        mock_cleepconf.return_value.get_auth_accounts.return_value = accounts
+        self.init_session()
+
+        result = self.module.get_auth_accounts()
+
+        self.assertListEqual(result, accounts)
+
+    @patch('backend.parameters.CleepConf')
+    def test_add_auth_account(self, mock_cleepconf):
+        account = 'account'
+        password = 'password'
+        self.init_session()
+        self.module._Parameters__reload_rpcserver_auth = Mock()
+
+        result = self.module.add_auth_account(account, password)
+
+        mock_cleepconf.return_value.add_auth_account.assert_called_with(account, password)
+        self.module._Parameters__reload_rpcserver_auth.assert_called()
+
+    @patch('backend.parameters.CleepConf')
+    def test_add_auth_account_invalid_parameters(self, mock_cleepconf):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_auth_account(123, 'password')
+        self.assertEqual(str(cm.exception), 'Parameter "account" must be of type "str"')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_auth_account('account', 123)
+        self.assertEqual(str(cm.exception), 'Parameter "password" must be of type "str"')
+
+    @patch('backend.parameters.CleepConf')
+    def test_add_auth_account_failure(self, mock_cleepconf):
+        mock_cleepconf.return_value.add_auth_account = Mock(side_effect=Exception('Test error'))
+        self.init_session()
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.add_auth_account('account', 'password')
+        self.assertEqual(str(cm.exception), 'Test error')
+
+    @patch('backend.parameters.CleepConf')
+    def test_delete_auth_account(self, mock_cleepconf):
+        account = 'account'
+        self.init_session()
+        self.module._Parameters__reload_rpcserver_auth = Mock()
+
+        result = self.module.delete_auth_account(account)
+
+        mock_cleepconf.return_value.delete_auth_account.assert_called_with(account)
+        self.module._Parameters__reload_rpcserver_auth.assert_called()
+
+    @patch('backend.parameters.CleepConf')
+    def test_delete_auth_account_invalid_parameters(self, mock_cleepconf):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.delete_auth_account(123)
+        self.assertEqual(str(cm.exception), 'Parameter "account" must be of type "str"')
+
+    @patch('backend.parameters.CleepConf')
+    def test_delete_auth_account_failure(self, mock_cleepconf):
+        mock_cleepconf.return_value.delete_auth_account = Mock(side_effect=Exception('Test error'))
+        self.init_session()
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.delete_auth_account('account')
+        self.assertEqual(str(cm.exception), 'Test error')
+
+    @patch('backend.parameters.CleepConf')
+    def test_enable_auth(self, mock_cleepconf):
+        self.init_session()
+        self.module._Parameters__reload_rpcserver_auth = Mock()
+        mock_cleepconf.return_value.get_auth_accounts.return_value = ['accnunt']
+
+        result = self.module.enable_auth()
+
+        mock_cleepconf.return_value.enable_auth.assert_called_with(True)
+        self.module._Parameters__reload_rpcserver_auth.assert_called()
+
+    @patch('backend.parameters.CleepConf')
+    def test_enable_auth_no_account_failure(self, mock_cleepconf):
+        self.init_session()
+        self.module._Parameters__reload_rpcserver_auth = Mock()
+        mock_cleepconf.return_value.get_auth_accounts.return_value = []
 
         with self.assertRaises(CommandError) as cm:
             result = self.module.enable_auth()
         self.assertEqual(str(cm.exception), 'Please add account before enabling auth')
 
-    @patch('backend.parameters.CleepConf')
-    def test_disable_auth(self, mock_cleepconf):
-        self.init_session()
-        self.module._Parameters__reload_rpcserver_auth = Mock()
+    @patch('backend.parameters.CleepConf')
+    def test_disable_auth(self, mock_cleepconf):
+        self.init_session()
+        self.module._Parameters__reload_rpcserver_auth = Mock()
+
+        result = self.module.disable_auth()
+
+        mock_cleepconf.return_value.enable_auth.assert_called_with(False)
+        self.module._Parameters__reload_rpcserver_auth.assert_called()
+
+
+class TestsParametersImportTime(unittest.TestCase):
+
+    # maximum time to import backend.parameters (cleep modules excluded)
+    IMPORT_TIME_BUDGET_US = 250000
+    HEAVY_MODULES = ['numpy', 'scipy', 'reverse_geocode', 'timezonefinder', 'workalendar']
+    # modules already loaded by cleep when application is imported
+    PRELOADED_MODULES = [
+        'cleep.core',
+        'cleep.exception',
+        'cleep.libs.configs.hostname',
+        'cleep.libs.internals.console',
+        'cleep.libs.configs.cleepconf',
+    ]
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def _run_python(self, code, *options):
+        return subprocess.run(
+            [sys.executable, *options, '-c', code],
+            cwd=self.root_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    def test_heavy_modules_not_imported(self):
+        code = 'import sys, backend.parameters; print(",".join(sys.modules.keys()))'
+        result = self._run_python(code)
+        imported = {name.split('.')[0] for name in result.stdout.strip().split(',')}
+
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(module, imported, f'"{module}" must be lazily imported')
+
+    def test_heavy_modules_not_imported_by_configure(self):
+        # sun times of current day are computed at each boot without numpy. Holidays job
+        # imports workalendar in background, so only numpy and scipy are checked
+        code = (
+            'import sys, unittest\n'
+            'from cleep.libs.tests import session\n'
+            'from backend.parameters import Parameters\n'
+            'test_session = session.TestSession(unittest.TestCase())\n'
+            'module = test_session.setup(Parameters, mock_on_start=False, mock_on_stop=False)\n'
+            'module.holiday_bitsets.load = lambda: None\n'
+            'test_session.start_module(module)\n'
+            'print(",".join(sys.modules.keys()))\n'
+            'test_session.clean()\n'
+        )
+        result = self._run_python(code)
+        imported = {name.split('.')[0] for name in result.stdout.strip().splitlines()[-1].split(',')}
+
+        for module in ['numpy', 'scipy']:
+            self.assertNotIn(module, imported, f'"{module}" must not be imported by configure')
+
+    def test_import_time_budget(self):
+        preload = ';'.join([f'import {module}' for module in self.PRELOADED_MODULES])
+        result = self._run_python(f'{preload}; import backend.parameters', '-X', 'importtime')
+
+        cumulative = None
+        for line in result.stderr.splitlines():
+            columns = line.split('|')
+            if len(columns) == 3 and columns[2].strip() == 'backend.parameters':
+                cumulative = int(columns[1].strip())
+        logging.debug('backend.parameters import time: %sus', cumulative)
+
+        self.assertIsNotNone(cumulative)
+        self.assertLess(cumulative, self.IMPORT_TIME_BUDGET_US)
+
+
+class TestsLazyImport(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_import_on_first_use(self):
+        lazy = LazyImport('json')
+        self.assertFalse(lazy.is_loaded())
+
+        self.assertEqual(lazy.dumps([1]), '[1]')
+        self.assertTrue(lazy.is_loaded())
+
+    def test_import_attribute(self):
+        lazy = LazyImport('collections', 'OrderedDict')
+
+        instance = lazy(a=1)
+
+        self.assertEqual(instance['a'], 1)
+
+    def test_import_invalid_module(self):
+        lazy = LazyImport('dummy_module_that_does_not_exist')
+
+        with self.assertRaises(ImportError):
+            lazy.load()
+        self.assertFalse(lazy.is_loaded())
+
+
+class TestsGeoIndex(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.path = tempfile.mktemp()
+        # 90 degrees tiles: 4 columns x 2 rows, west half in Europe/London, east half in Europe/Paris
+        cells = []
+        for row in range(2):
+            for col in range(4):
+                cells.append((0 if col < 2 else 1, None if row == 1 else col % 2, col == 3))
+        GeoIndex.write(self.path, 90.0, ['Europe/London', 'Europe/Paris'], [('GB', 'United Kingdom'), ('FR', 'France')], cells)
+        self.index = GeoIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_lookup(self):
+        self.assertDictEqual(self.index.lookup(52.204, 0.1208), {
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'United Kingdom', 'alpha2': 'GB'},
+            'border': False,
+        })
+        self.assertDictEqual(self.index.lookup(10.0, -10.0), {
+            'timezone': 'Europe/London',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+            'border': False,
+        })
+
+    def test_lookup_unknown_country(self):
+        result = self.index.lookup(-10.0, -100.0)
+
+        self.assertIsNone(result['country'])
+
+    def test_lookup_border_tile(self):
+        result = self.index.lookup(10.0, 100.0)
+
+        self.assertTrue(result['border'])
+
+    def test_lookup_bounds(self):
+        self.assertEqual(self.index.lookup(90.0, 180.0)['timezone'], 'Europe/Paris')
+        self.assertEqual(self.index.lookup(-90.0, -180.0)['timezone'], 'Europe/London')
+
+    def test_lookup_out_of_bounds(self):
+        self.assertIsNone(self.index.lookup(90.1, 0.0))
+        self.assertIsNone(self.index.lookup(-91.0, 0.0))
+        self.assertIsNone(self.index.lookup(0.0, 180.5))
+        self.assertIsNone(self.index.lookup(0.0, -200.0))
+
+    def test_lookup_missing_file(self):
+        index = GeoIndex(self.path + '.missing')
+
+        self.assertIsNone(index.lookup(52.204, 0.1208))
+        self.assertFalse(index.is_loaded())
+
+    def test_load_invalid_file(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'dummy content')
+
+        with self.assertRaises(Exception):
+            self.index.load()
+
+    def test_write_invalid_cells_count(self):
+        with self.assertRaises(ValueError):
+            GeoIndex.write(self.path, 90.0, [], [], [])
+
+
+class TestsFrozenDict(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.data = FrozenDict({'a': 1}, b=2)
+
+    def test_read(self):
+        self.assertEqual(self.data, {'a': 1, 'b': 2})
+        self.assertEqual(dict(self.data, c=3), {'a': 1, 'b': 2, 'c': 3})
+
+    def test_readonly(self):
+        with self.assertRaises(TypeError):
+            self.data['a'] = 2
+        with self.assertRaises(TypeError):
+            del self.data['a']
+        with self.assertRaises(TypeError):
+            self.data.update({'a': 2})
+        with self.assertRaises(TypeError):
+            self.data.pop('a')
+
+        self.assertEqual(self.data, {'a': 1, 'b': 2})
+
+    def test_copy_returns_same_instance(self):
+        self.assertIs(copy.copy(self.data), self.data)
+        self.assertIs(copy.deepcopy(self.data), self.data)
+
+
+class TestsTimeSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.timezone = pytz.timezone('Europe/London')
+        self.utc_offsets = UtcOffsetCache(self.timezone)
+        self.utc_now = datetime.datetime(2020, 6, 14, 19, 50, 8, 0)
+
+    def test_payloads(self):
+        snapshot = TimeSnapshot(self.utc_now, self.utc_offsets, 10, 20)
+
+        self.assertEqual(snapshot.time, {
+            'timestamp': 1592164208.0,
+            'iso': '2020-06-14T20:50:08+01:00',
+            'year': 2020,
+            'month': 6,
+            'day': 14,
+            'hour': 20,
+            'minute': 50,
+            'weekday': 6,
+            'weekday_literal': 'sunday',
+        })
+        self.assertEqual(snapshot.event, dict(snapshot.time, sunrise=10, sunset=20))
+        self.assertEqual(snapshot.offset, 3600)
+
+    def test_is_valid(self):
+        snapshot = TimeSnapshot(self.utc_now, self.utc_offsets, 10, 20)
+        minute_key = get_minute_key(self.utc_now)
+
+        self.assertTrue(snapshot.is_valid(minute_key, self.utc_offsets, 10, 20))
+        self.assertTrue(snapshot.is_valid(get_minute_key(self.utc_now.replace(second=59)), self.utc_offsets, 10, 20))
+        self.assertFalse(snapshot.is_valid(minute_key + 1, self.utc_offsets, 10, 20))
+        self.assertFalse(snapshot.is_valid(minute_key, UtcOffsetCache(pytz.utc), 10, 20))
+        self.assertFalse(snapshot.is_valid(minute_key, self.utc_offsets, 11, 20))
+
+    def test_slots(self):
+        snapshot = TimeSnapshot(self.utc_now, self.utc_offsets, 10, 20)
+
+        with self.assertRaises(AttributeError):
+            snapshot.dummy = 1
+
+
+class TestsUtcOffsetCache(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_to_local_matches_pytz(self):
+        for timezone_name in ['Europe/Paris', 'America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata', 'UTC']:
+            local_timezone = pytz.timezone(timezone_name)
+            utc_offsets = UtcOffsetCache(local_timezone)
+            # walk backward and forward across several transitions
+            for timestamp in list(range(1600000000, 1640000000, 86400 * 7 + 3600)) + [1500000000, 1700000000, 0]:
+                expected = datetime.datetime.fromtimestamp(timestamp, pytz.utc).astimezone(local_timezone)
+                local_now = utc_offsets.to_local(timestamp)
+
+                self.assertEqual(local_now.isoformat(), expected.isoformat(), timezone_name)
+                self.assertEqual(local_now.tzname(), expected.tzname(), timezone_name)
+
+    def test_get_offset(self):
+        utc_offsets = UtcOffsetCache(pytz.timezone('Europe/Paris'))
+
+        # 2021-03-28 01:00 UTC: switch to summer time
+        self.assertEqual(utc_offsets.get_offset(1616893199), 3600)
+        self.assertEqual(utc_offsets.get_offset(1616893200), 7200)
+
+    def test_get_next_transition(self):
+        utc_offsets = UtcOffsetCache(pytz.timezone('Europe/Paris'))
+
+        self.assertEqual(utc_offsets.get_next_transition(1616800000), 1616893200)
+        self.assertIsNone(UtcOffsetCache(pytz.utc).get_next_transition(1616800000))
+
+    def test_zone(self):
+        self.assertEqual(UtcOffsetCache(pytz.timezone('Europe/Paris')).zone, 'Europe/Paris')
+
+    def test_concurrent_calls(self):
+        utc_offsets = UtcOffsetCache(pytz.timezone('Europe/Paris'))
+        errors = []
+
+        def run(timestamp, expected):
+            for _ in range(2000):
+                if utc_offsets.get_offset(timestamp) != expected:
+                    errors.append(timestamp)
+                    return
+
+        # winter and summer timestamps force window switch on each call
+        threads = [
+            threading.Thread(target=run, args=(1609459200, 3600)),
+            threading.Thread(target=run, args=(1625097600, 7200)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+
+class TestsTimestampCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.writer = Mock(return_value=True)
+        self.checkpoint = TimestampCheckpoint(self.writer, 60.0)
+
+    def test_update_keeps_value_in_memory(self):
+        self.assertFalse(self.checkpoint.update(1000.0))
+        self.assertFalse(self.checkpoint.update(1060.0))
+
+        self.assertEqual(self.checkpoint.get(), 1060.0)
+        self.writer.assert_not_called()
+
+    @patch('backend.timestampcheckpoint.time.monotonic')
+    def test_update_writes_after_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self.checkpoint = TimestampCheckpoint(self.writer, 60.0)
+        self.checkpoint.update(1000.0)
+        mock_monotonic.return_value = 160.0
+
+        self.assertTrue(self.checkpoint.update(1060.0))
+        self.assertFalse(self.checkpoint.update(1120.0))
+
+        self.writer.assert_called_once_with(1060.0)
+
+    def test_flush(self):
+        self.assertTrue(self.checkpoint.flush())
+        self.writer.assert_not_called()
+
+        self.checkpoint.update(1000.0)
+        self.assertTrue(self.checkpoint.flush())
+        self.assertTrue(self.checkpoint.flush())
+
+        self.writer.assert_called_once_with(1000.0)
+
+    def test_flush_failed(self):
+        self.writer.return_value = False
+        self.checkpoint.update(1000.0)
+
+        self.assertFalse(self.checkpoint.flush())
+        self.assertFalse(self.checkpoint.flush())
+        self.assertEqual(self.writer.call_count, 2)
+
+
+class TestsTimestampFile(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'parameters.timestamp')
+        self.fs = Mock()
+        self.fs.open.side_effect = open
+        self.fs.close.side_effect = lambda fd: fd.close()
+        self.file = TimestampFile(self.fs, self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_unknown_file(self):
+        self.assertIsNone(self.file.read())
+
+    def test_write_and_read(self):
+        self.assertTrue(self.file.write(1607539250.5))
+        self.assertTrue(self.file.write(1607539310.5))
+
+        self.assertEqual(self.file.read(), 1607539310.5)
+        self.assertEqual(os.path.getsize(self.path), 8)
+        self.fs.open.assert_called_with(self.path, 'rb')
+        self.assertEqual(self.fs.open.call_args_list[1][0], (self.path, 'r+b'))
+
+    def test_read_invalid_file(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'1')
+
+        self.assertIsNone(self.file.read())
+
+    def test_write_failed(self):
+        self.fs.open.side_effect = Exception('Test exception')
+
+        self.assertFalse(self.file.write(1607539250.5))
+
+
+class TestsCalendarIndex(unittest.TestCase):
+
+    def test_index_matches_workalendar_registry(self):
+        from workalendar.registry import registry
+        import workalendar
+
+        self.assertEqual(WORKALENDAR_VERSION, workalendar.__version__)
+        calendars = {code: calendar for code, calendar in registry.get_calendars().items() if len(code) == 2}
+        self.assertEqual(set(CALENDARS.keys()), set(calendars.keys()))
+        for code, (module_name, class_name, weekend_days) in CALENDARS.items():
+            self.assertEqual((calendars[code].__module__, calendars[code].__name__), (module_name, class_name))
+            self.assertEqual(set(calendars[code]().get_weekend_days()), set(weekend_days))
+
+
+class TestsConfigSnapshot(unittest.TestCase):
+
+    def test_get(self):
+        snapshot = ConfigSnapshot(3, {'position': {'latitude': 1.0}, 'accounts': ['a', 'b']})
+
+        self.assertEqual(snapshot.version, 3)
+        self.assertEqual(snapshot.get('position'), {'latitude': 1.0})
+        self.assertEqual(snapshot.get('accounts'), ('a', 'b'))
+        self.assertIsNone(snapshot.get('unknown'))
+        self.assertEqual(snapshot.get('unknown', 'default'), 'default')
+
+    def test_snapshot_is_deep_copy(self):
+        config = {'position': {'latitude': 1.0}}
+        snapshot = ConfigSnapshot(1, config)
+
+        config['position']['latitude'] = 2.0
+
+        self.assertEqual(snapshot.get('position'), {'latitude': 1.0})
+        with self.assertRaises(TypeError):
+            snapshot.get('position')['latitude'] = 2.0
+
+    def test_freeze(self):
+        frozen = freeze({'a': [{'b': 1}], 'c': 'd'})
+
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIsInstance(frozen['a'], tuple)
+        self.assertIsInstance(frozen['a'][0], FrozenDict)
+        self.assertIs(freeze(frozen), frozen)
+        self.assertEqual(freeze(1), 1)
+
+
+class TestsHolidayBitsets(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'parameters.holidays')
+        self.fs = Mock()
+        self.fs.open.side_effect = open
+        self.fs.close.side_effect = lambda fd: fd.close()
+        self.fs.move.side_effect = lambda src, dst: os.replace(src, dst) is None
+        self.bitsets = HolidayBitsets(self.fs, self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_build_and_is_set(self):
+        days = [datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)]
+
+        bitset = HolidayBitsets.build(days)
+
+        self.assertEqual(bitset, 1 | 1 << 365)
+        self.assertTrue(HolidayBitsets.is_set(bitset, datetime.date(2020, 1, 1)))
+        self.assertFalse(HolidayBitsets.is_set(bitset, datetime.date(2020, 1, 2)))
+        self.assertTrue(HolidayBitsets.is_set(bitset, datetime.date(2020, 12, 31)))
+
+    def test_build_weekdays(self):
+        # 2021-01-01 is a friday
+        bitset = HolidayBitsets.build_weekdays(2021, (5, 6))
+
+        self.assertEqual(bitset & 0b1111111, 0b0000110)
+        self.assertEqual(bin(bitset).count('1'), 104)
+        self.assertTrue(HolidayBitsets.is_set(bitset, datetime.date(2021, 12, 26)))
+        self.assertFalse(HolidayBitsets.is_set(bitset, datetime.date(2021, 12, 31)))
+
+    def test_get_year_size(self):
+        self.assertEqual(HolidayBitsets.get_year_size(2020), 366)
+        self.assertEqual(HolidayBitsets.get_year_size(2021), 365)
+
+    def test_set(self):
+        self.assertTrue(self.bitsets.set('GB', 2021, 5))
+        self.assertFalse(self.bitsets.set('GB', 2021, 5))
+        self.assertEqual(self.bitsets.get('GB', 2021), 5)
+        self.assertIsNone(self.bitsets.get('GB', 2022))
+
+    def test_retain(self):
+        self.bitsets.set('GB', 2021, 1)
+        self.bitsets.set('GB', 2022, 2)
+        self.bitsets.set('FR', 2021, 3)
+
+        self.assertTrue(self.bitsets.retain('GB', [2021, 2022]))
+        self.assertFalse(self.bitsets.retain('GB', [2021, 2022]))
+        self.assertEqual(len(self.bitsets), 2)
+        self.assertNotIn(('FR', 2021), self.bitsets)
+
+    def test_save_and_load(self):
+        self.bitsets.set('GB', 2020, 1 << 365)
+        self.bitsets.set('FR', 2021, 0b101)
+
+        self.assertTrue(self.bitsets.save())
+        bitsets = HolidayBitsets(self.fs, self.path)
+        bitsets.load()
+
+        self.assertEqual(os.path.getsize(self.path), 8 + 2 * 50)
+        self.assertEqual(bitsets.get('GB', 2020), 1 << 365)
+        self.assertEqual(bitsets.get('FR', 2021), 0b101)
+
+    def test_load_unknown_file(self):
+        self.bitsets.load()
+
+        self.assertEqual(len(self.bitsets), 0)
+
+    def test_load_invalid_file(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'1234')
+
+        self.bitsets.load()
+
+        self.assertEqual(len(self.bitsets), 0)
+
+    def test_save_failed(self):
+        self.fs.open.side_effect = Exception('Test exception')
+        self.bitsets.set('GB', 2021, 1)
+
+        self.assertFalse(self.bitsets.save())
+
+    def test_save_writes_temporary_file_under_lock(self):
+        def open_locked(path, mode):
+            self.assertTrue(self.bitsets._HolidayBitsets__lock.locked())
+            return open(path, mode)
+        self.fs.open.side_effect = open_locked
+        self.bitsets.set('GB', 2021, 1)
+
+        self.assertTrue(self.bitsets.save())
+
+        self.fs.open.assert_called_with(f'{self.path}.tmp', 'wb')
+        self.fs.move.assert_called_with(f'{self.path}.tmp', self.path)
+        self.assertFalse(os.path.exists(f'{self.path}.tmp'))
+
+    def test_save_move_failed(self):
+        self.bitsets.set('GB', 2021, 1)
+        self.assertTrue(self.bitsets.save())
+        self.fs.move.side_effect = None
+        self.fs.move.return_value = False
+        self.bitsets.set('GB', 2021, 2)
+
+        self.assertFalse(self.bitsets.save())
+        bitsets = HolidayBitsets(self.fs, self.path)
+        bitsets.load()
+        self.assertEqual(bitsets.get('GB', 2021), 1)
+
+    def test_concurrent_saves(self):
+        self.bitsets.set('GB', 2021, 1)
+        threads = [threading.Thread(target=self.bitsets.save) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        bitsets = HolidayBitsets(self.fs, self.path)
+        bitsets.load()
+        self.assertEqual(bitsets.get('GB', 2021), 1)
+
+
+class TestsEventScheduler(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.now = 1000.0
+        self.timer_factory = Mock()
+        self.scheduler = EventScheduler(self.timer_factory, max_lateness=60.0, max_delay=300.0, clock=lambda: self.now)
+
+    def test_schedule_arms_timer_for_earliest_event(self):
+        self.scheduler.schedule('late', 1200.0, Mock())
+        self.timer_factory.assert_called_with(200.0, self.scheduler.run_pending)
+
+        self.scheduler.schedule('early', 1100.0, Mock())
+        self.timer_factory.assert_called_with(100.0, self.scheduler.run_pending)
+        self.timer_factory.return_value.cancel.assert_called()
+        self.timer_factory.return_value.start.assert_called()
+
+    def test_timer_delay_is_bounded(self):
+        self.scheduler.schedule('event', 5000.0, Mock())
+
+        self.timer_factory.assert_called_with(300.0, self.scheduler.run_pending)
+
+    def test_run_pending_fires_due_events_once(self):
+        first = Mock()
+        second = Mock()
+        third = Mock()
+        self.scheduler.schedule('first', 1010.0, first)
+        self.scheduler.schedule('second', 1020.0, second)
+        self.scheduler.schedule('third', 1100.0, third)
+
+        # timer was late
+        self.now = 1030.0
+        self.scheduler.run_pending()
+        self.scheduler.run_pending()
+
+        first.assert_called_once_with()
+        second.assert_called_once_with()
+        third.assert_not_called()
+        self.assertEqual(self.scheduler.get_events(), {'third': 1100.0})
+        self.timer_factory.assert_called_with(70.0, self.scheduler.run_pending)
+
+    def test_run_pending_drops_too_late_events(self):
+        callback = Mock()
+        self.scheduler.schedule('event', 1010.0, callback)
+
+        self.now = 2000.0
+        self.scheduler.run_pending()
+
+        callback.assert_not_called()
+        self.assertEqual(self.scheduler.get_events(), {})
+
+    def test_run_pending_fires_not_droppable_events(self):
+        callback = Mock()
+        self.scheduler.schedule('event', 1010.0, callback, droppable=False)
+
+        self.now = 2000.0
+        self.scheduler.run_pending()
+
+        callback.assert_called_once_with()
+
+    def test_run_pending_calls_dropped_callback(self):
+        dropped_callback = Mock()
+        scheduler = EventScheduler(self.timer_factory, max_lateness=60.0, clock=lambda: self.now, dropped_callback=dropped_callback)
+        scheduler.schedule('first', 1010.0, Mock())
+        scheduler.schedule('second', 1020.0, Mock())
+        scheduler.schedule('third', 1990.0, Mock())
+
+        self.now = 2000.0
+        scheduler.run_pending()
+
+        dropped_callback.assert_called_once_with(['first', 'second'])
+
+    def test_run_pending_without_dropped_event(self):
+        dropped_callback = Mock()
+        scheduler = EventScheduler(self.timer_factory, max_lateness=60.0, clock=lambda: self.now, dropped_callback=dropped_callback)
+        scheduler.schedule('event', 1010.0, Mock())
+
+        self.now = 1020.0
+        scheduler.run_pending()
+
+        dropped_callback.assert_not_called()
+
+    def test_run_pending_callback_exception(self):
+        callback = Mock()
+        self.scheduler.schedule('failed', 1010.0, Mock(side_effect=Exception('Test exception')))
+        self.scheduler.schedule('event', 1010.0, callback)
+
+        self.now = 1010.0
+        self.scheduler.run_pending()
+
+        callback.assert_called_once_with()
+
+    def test_schedule_replaces_event(self):
+        first = Mock()
+        second = Mock()
+        self.scheduler.schedule('event', 1010.0, first)
+        self.scheduler.schedule('event', 1020.0, second)
+
+        self.now = 1030.0
+        self.scheduler.run_pending()
+
+        first.assert_not_called()
+        second.assert_called_once_with()
+
+    def test_cancel(self):
+        callback = Mock()
+        self.scheduler.schedule('event', 1010.0, callback)
+
+        self.assertTrue(self.scheduler.cancel('event'))
+        self.assertFalse(self.scheduler.cancel('event'))
+        self.now = 1030.0
+        self.scheduler.run_pending()
+
+        callback.assert_not_called()
+
+    def test_stop(self):
+        self.scheduler.schedule('event', 1010.0, Mock())
+
+        self.scheduler.stop()
+
+        self.timer_factory.return_value.cancel.assert_called()
+        self.assertEqual(self.scheduler.get_events(), {})
+
+
+class TestsTimeSubscriptions(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.subscriptions = TimeSubscriptions()
+
+    def test_add_remove(self):
+        first = self.subscriptions.add(60)
+        second = self.subscriptions.add(1)
+        self.subscriptions.add(1)
+
+        self.assertEqual(len(self.subscriptions), 3)
+        self.assertEqual(self.subscriptions.get_resolutions(), {1, 60})
+        self.assertTrue(self.subscriptions.has_resolution(60))
+
+        self.assertTrue(self.subscriptions.remove(first))
+        self.assertFalse(self.subscriptions.remove(first))
+        self.assertFalse(self.subscriptions.has_resolution(60))
+        self.assertTrue(self.subscriptions.remove(second))
+        self.assertEqual(self.subscriptions.get_resolutions(), {1})
+
+    def test_lease(self):
+        clock = Mock(return_value=1000.0)
+        self.subscriptions = TimeSubscriptions(clock=clock)
+        permanent = self.subscriptions.add(60)
+        leased = self.subscriptions.add(1, 10.0)
+
+        clock.return_value = 1009.0
+        self.assertTrue(self.subscriptions.renew(leased))
+        self.assertTrue(self.subscriptions.renew(permanent))
+        clock.return_value = 1018.0
+        self.assertEqual(self.subscriptions.get_resolutions(), {1, 60})
+        self.assertEqual(self.subscriptions.purge(), [])
+
+        clock.return_value = 1019.0
+        self.assertEqual(self.subscriptions.get_resolutions(), {60})
+        self.assertFalse(self.subscriptions.has_resolution(1))
+        self.assertFalse(self.subscriptions.renew(leased))
+        self.assertEqual(self.subscriptions.purge(), [leased])
+        self.assertEqual(len(self.subscriptions), 1)
+        self.assertFalse(self.subscriptions.renew('unknown'))
+
+
+class TestsSunTable(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_sun_times(self):
+        table = SunTable(51.4769, -0.0005, 2020)
+
+        # reference values: 2020-06-21 03:43/20:21 UTC, 2020-12-21 08:03/15:53 UTC
+        summer = table.get_day(datetime.date(2020, 6, 21))
+        self.assertAlmostEqual(summer['sunrise'], 1592710980, delta=120)
+        self.assertAlmostEqual(summer['sunset'], 1592770860, delta=120)
+        winter = table.get_day(datetime.date(2020, 12, 21))
+        self.assertAlmostEqual(winter['sunrise'], 1608537780, delta=120)
+        self.assertAlmostEqual(winter['sunset'], 1608565980, delta=120)
+
+    def test_year_length(self):
+        self.assertEqual(len(SunTable(51.4769, -0.0005, 2020)), 366)
+        self.assertEqual(len(SunTable(51.4769, -0.0005, 2021)), 365)
+
+    def test_twilights(self):
+        table = SunTable(51.4769, -0.0005, 2020)
+
+        # reference values: 2020-03-20 04:07 astronomical dawn, 12:07 solar noon,
+        # 20:07 astronomical dusk UTC
+        equinox = table.get_day(datetime.date(2020, 3, 20))
+        self.assertAlmostEqual(equinox['astronomical_dawn'], 1584677220, delta=120)
+        self.assertAlmostEqual(equinox['solar_noon'], 1584706020, delta=120)
+        self.assertAlmostEqual(equinox['astronomical_dusk'], 1584734820, delta=120)
+        self.assertEqual(list(equinox.keys()), list(SOLAR_EVENTS_NAMES))
+        self.assertEqual(sorted(equinox.values()), list(equinox.values()))
+
+    def test_same_values_as_single_day(self):
+        table = SunTable(51.4769, -0.0005, 2020)
+
+        # single day is computed without numpy, results must be the same
+        for day in [datetime.date(2020, 9, 1), datetime.date(2020, 12, 21)]:
+            single_day = compute_day_solar_events(51.4769, -0.0005, day)
+            for name, value in table.get_day(day).items():
+                self.assertAlmostEqual(single_day[name], value, places=3)
+
+    def test_single_day_polar_night(self):
+        day_events = compute_day_solar_events(78.2232, 15.6267, datetime.date(2020, 12, 21))
+
+        self.assertIsNone(day_events['sunrise'])
+        self.assertIsNone(day_events['sunset'])
+        self.assertIsNotNone(day_events['solar_noon'])
+        self.assertEqual(list(day_events.keys()), list(SOLAR_EVENTS_NAMES))
+
+    def test_positions_same_values_as_single_day(self):
+        latitudes = [48.8591554, -33.8688, 78.2232]
+        longitudes = [2.2945, 151.2093, 15.6267]
+        days = [datetime.date(2020, 6, 21), datetime.date(2020, 6, 22), datetime.date(2020, 12, 21)]
+
+        positions_events = compute_positions_solar_events(latitudes, longitudes, days)
+
+        self.assertEqual(len(positions_events), 3)
+        for latitude, longitude, day, events in zip(latitudes, longitudes, days, positions_events):
+            day_events = compute_day_solar_events(latitude, longitude, day)
+            self.assertEqual(list(events.keys()), list(SOLAR_EVENTS_NAMES))
+            for name in SOLAR_EVENTS_NAMES:
+                if day_events[name] is None:
+                    self.assertIsNone(events[name])
+                else:
+                    self.assertAlmostEqual(events[name], day_events[name], places=3)
+
+    def test_polar_day_and_night(self):
+        table = SunTable(78.2232, 15.6267, 2020)
+
+        polar_day = table.get_day(datetime.date(2020, 6, 21))
+        self.assertIsNone(polar_day['sunrise'])
+        self.assertIsNone(polar_day['sunset'])
+        self.assertIsNotNone(polar_day['solar_noon'])
+        polar_night = table.get_day(datetime.date(2020, 12, 21))
+        self.assertIsNone(polar_night['sunrise'])
+        self.assertIsNone(polar_night['sunset'])
+        self.assertIsNone(polar_night['civil_dawn'])
+        self.assertIsNotNone(polar_night['nautical_dawn'])
+
+    def test_solar_positions(self):
+        # sun crosses meridian at solar noon
+        noon = SunTable(51.4769, -0.0005, 2020).get_day(datetime.date(2020, 6, 21))['solar_noon']
+        azimuths, elevations = compute_solar_positions([noon - 3600, noon, noon + 3600], 51.4769, -0.0005)
+
+        self.assertTrue(azimuths[0] < 180.0 < azimuths[2])
+        self.assertAlmostEqual(azimuths[1], 180.0, delta=0.1)
+        # max elevation is 90 - latitude + declination
+        self.assertAlmostEqual(elevations[1], 90.0 - 51.4769 + 23.44, delta=0.1)
+        self.assertTrue(elevations[0] < elevations[1] > elevations[2])
+
+    def test_day_of_other_year(self):
+        table = SunTable(51.4769, -0.0005, 2020)
+
+        with self.assertRaises(ValueError):
+            table.get_day(datetime.date(2021, 1, 1))
+
+
+class TestsLruCache(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.cache = LruCache(2)
+
+    def test_get_set(self):
+        self.cache.set('a', 1)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('b', 2), 2)
+
+    def test_evict_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.items(), [('a', 1), ('c', 3)])
+
+    def test_pop_and_clear(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+
+        self.assertEqual(self.cache.pop('a'), 1)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LruCache(0)
+
+
+class TestsResolutionCache(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.fs = Mock()
+        self.fs.write_json.return_value = True
+        self.cache = ResolutionCache(self.fs, '/tmp/cache.json', precision=0.01, max_size=2)
+
+    def test_quantized_key(self):
+        self.assertEqual(self.cache.get_key(48.8591554, 2.2907284), '4886:229')
+        self.assertEqual(self.cache.get_key(48.8588, 2.2911), '4886:229')
+        self.assertEqual(self.cache.get_key(-33.8688, 151.2093), '-3387:15121')
+
+    def test_update_and_get(self):
+        self.assertIsNone(self.cache.get(48.8591554, 2.2907284))
+
+        self.assertTrue(self.cache.update(48.8591554, 2.2907284, timezone='Europe/Paris'))
+        self.assertTrue(self.cache.update(48.8588, 2.2911, country={'country': 'France', 'alpha2': 'FR'}))
+
+        self.assertDictEqual(self.cache.get(48.859, 2.291), {
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+        })
+        self.assertEqual(self.fs.write_json.call_count, 2)
+
+    def test_update_unchanged(self):
+        self.cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        self.assertFalse(self.cache.update(48.8591554, 2.2907284, timezone='Europe/Paris'))
+        self.assertEqual(self.fs.write_json.call_count, 1)
+
+    def test_bounded_size(self):
+        self.cache.update(1.0, 1.0, timezone='Etc/GMT')
+        self.cache.update(2.0, 2.0, timezone='Etc/GMT')
+        self.cache.update(3.0, 3.0, timezone='Etc/GMT')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(1.0, 1.0))
+
+    def test_save(self):
+        self.cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        self.fs.write_json.assert_called_with('/tmp/cache.json', {
+            'version': 1,
+            'precision': 0.01,
+            'entries': [('4886:229', {'timezone': 'Europe/Paris'})],
+        })
+
+    def test_load(self):
+        self.fs.read_json.return_value = {
+            'version': 1,
+            'precision': 0.01,
+            'entries': [['4886:229', {'timezone': 'Europe/Paris'}]],
+        }
+
+        self.cache.load()
+
+        self.assertEqual(self.cache.get(48.8591554, 2.2907284), {'timezone': 'Europe/Paris'})
+
+    def test_load_other_precision(self):
+        self.fs.read_json.return_value = {
+            'version': 1,
+            'precision': 0.1,
+            'entries': [['489:23', {'timezone': 'Europe/Paris'}]],
+        }
+
+        self.cache.load()
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_load_invalid_file(self):
+        self.fs.read_json.return_value = None
+        self.cache.load()
+        self.fs.read_json.side_effect = Exception('Test exception')
+        self.cache.load()
+
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestsGeoResolver(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.timer_factory = Mock()
+        self.geoindex = Mock()
+        self.geoindex.lookup.return_value = None
+        self.cache = ResolutionCache(Mock(), '/tmp/cache.json')
+        self.resolver = GeoResolver(self.timer_factory, self.geoindex, self.cache)
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_resolve_timezone(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.return_value = 'Europe/Paris'
+
+        self.assertEqual(self.resolver.resolve_timezone({'latitude': 48.8591554, 'longitude': 2.2907284}), 'Europe/Paris')
+
+        self.assertEqual(self.cache.get(48.8591554, 2.2907284), {'timezone': 'Europe/Paris'})
+        self.timer_factory.assert_called_with(300.0, self.resolver.release_timezonefinder)
+
+    @patch('backend.georesolver.reverse_geocode')
+    def test_resolve_country_from_geoindex(self, mock_reverse_geo):
+        self.geoindex.lookup.return_value = {
+            'timezone': 'Europe/Paris',
+            'country': {'country': 'France', 'alpha2': 'FR'},
+            'border': False,
+        }
+
+        country = self.resolver.resolve_country({'latitude': 48.8591554, 'longitude': 2.2907284})
+
+        self.assertEqual(country, {'country': 'France', 'alpha2': 'FR'})
+        mock_reverse_geo.search.assert_not_called()
+
+    @patch('backend.georesolver.reverse_geocode')
+    def test_resolve_country_not_found(self, mock_reverse_geo):
+        mock_reverse_geo.search.return_value = [{}]
+
+        country = self.resolver.resolve_country({'latitude': 40.0, 'longitude': -30.0})
+
+        self.assertEqual(country, {'country': None, 'alpha2': None})
+        self.assertIsNone(self.cache.get(40.0, -30.0))
+
+    @patch('backend.georesolver.TimezoneFinder')
+    def test_release_timezonefinder(self, mock_tzfinder):
+        self.resolver.get_timezonefinder()
+        self.resolver.get_timezonefinder()
+        self.resolver.release_timezonefinder()
+        self.resolver.get_timezonefinder()
+
+        self.assertEqual(mock_tzfinder.call_count, 2)
+
+
+class TestsTimeTicker(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.timer_factory = Mock()
+        self.subscriptions = TimeSubscriptions()
+        self.minute_callback = Mock()
+        self.tick_callback = Mock()
+        self.clock_jump_callback = Mock()
+        self.ticker = TimeTicker(self.timer_factory, self.subscriptions, self.minute_callback, self.tick_callback, clock_jump_callback=self.clock_jump_callback)
+
+    @patch('backend.timeticker.time.time', Mock(return_value=1607538850))
+    def test_start_schedules_on_minute_boundary(self):
+        self.ticker.start()
+
+        self.timer_factory.assert_called_with(50.0, self.ticker.run)
+        self.timer_factory.return_value.start.assert_called()
+
+    @patch('backend.timeticker.time.time', Mock(return_value=1607538850))
+    def test_stop(self):
+        self.ticker.start()
+        self.ticker.stop()
+        self.timer_factory.reset_mock()
+
+        self.ticker.run()
 
-        result = self.module.disable_auth()
+        self.timer_factory.assert_not_called()
 
-        mock_cleepconf.return_value.enable_auth.assert_called_with(False)
-        self.module._Parameters__reload_rpcserver_auth.assert_called()
+    @patch('backend.timeticker.time.time', Mock(return_value=1607538850.2))
+    def test_subscribed_reschedules_on_smaller_resolution(self):
+        self.ticker.start()
+        self.subscriptions.add(10)
+
+        self.ticker.subscribed(10)
+
+        delay = self.timer_factory.call_args[0][0]
+        self.assertAlmostEqual(delay, 9.8, places=3)
+
+    @patch('backend.timeticker.time.time')
+    def test_run_sends_ticks(self, mock_time):
+        self.subscriptions.add(1)
+        mock_time.return_value = 1607538899.01
+        self.ticker.run()
+        mock_time.return_value = 1607538900.01
+        self.ticker.run()
+
+        self.tick_callback.assert_called_with(1607538900, [1])
+        self.assertEqual(self.minute_callback.call_count, 2)
+
+    @patch('backend.timeticker.time.time', Mock(return_value=1607538850))
+    def test_run_callback_failure_reschedules(self):
+        self.minute_callback.side_effect = Exception('Test exception')
+
+        self.ticker.run()
+
+        self.timer_factory.return_value.start.assert_called()
+
+    def test_clock_jump(self):
+        with patch('backend.timeticker.time.time', Mock(return_value=1000.0)), patch('backend.timeticker.time.monotonic', Mock(return_value=100.0)):
+            self.ticker.run()
+        with patch('backend.timeticker.time.time', Mock(return_value=1060.0)), patch('backend.timeticker.time.monotonic', Mock(return_value=160.0)):
+            self.ticker.run()
+        self.clock_jump_callback.assert_not_called()
+
+        with patch('backend.timeticker.time.time', Mock(return_value=5000.0)), patch('backend.timeticker.time.monotonic', Mock(return_value=220.0)):
+            self.ticker.run()
+        self.clock_jump_callback.assert_called_once_with(3880.0)
+
+
+class TestsPositionJobs(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.executor = Mock()
+        self.executor.submit.side_effect = lambda func, *args: func(*args)
+        self.progress_callback = Mock()
+        self.update_callback = Mock()
+
+    def pipeline(self, position, start_stage):
+        start_stage('first')
+        start_stage('second')
+        return {'timezone': 'Europe/Paris'}
+
+    def test_submit(self):
+        jobs = PositionJobs(self.executor, self.pipeline, ['first', 'second'], progress_callback=self.progress_callback, update_callback=self.update_callback)
+
+        job_id = jobs.submit({'latitude': 48.8591554, 'longitude': 2.2907284})
+
+        job = jobs.get(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertIsNone(job['stage'])
+        self.assertEqual(job['timezone'], 'Europe/Paris')
+        self.progress_callback.assert_called_with({'job_id': job_id, 'stage': 'second', 'progress': 50})
+        self.update_callback.assert_called_once_with(job)
+
+    def test_submit_pipeline_failed(self):
+        pipeline = Mock(side_effect=Exception('Test exception'))
+        jobs = PositionJobs(self.executor, pipeline, ['first'], update_callback=self.update_callback)
+
+        job_id = jobs.submit({'latitude': 48.8591554, 'longitude': 2.2907284})
+
+        job = jobs.get(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'Test exception')
+        self.update_callback.assert_called_once_with(job)
+
+    def test_history(self):
+        jobs = PositionJobs(Mock(), self.pipeline, ['first', 'second'])
+
+        job_ids = [jobs.submit({'latitude': 1.0, 'longitude': 1.0}) for _ in range(PositionJobs.HISTORY + 1)]
+
+        self.assertIsNone(jobs.get(job_ids[0]))
+        self.assertEqual(jobs.get(job_ids[-1])['status'], 'pending')
+
+    def test_get_returns_copy(self):
+        jobs = PositionJobs(Mock(), self.pipeline, ['first', 'second'])
+        job_id = jobs.submit({'latitude': 1.0, 'longitude': 1.0})
+
+        jobs.get(job_id)['position']['latitude'] = 2.0
+
+        self.assertEqual(jobs.get(job_id)['position']['latitude'], 1.0)
+
+
+class TestsWorkingDays(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.country = 'FR'
+        self.holiday_bitsets = HolidayBitsets(Mock(), '/tmp/holidays.json')
+        self.holiday_bitsets.save = Mock()
+        self.working_days = WorkingDays(lambda: self.country, self.holiday_bitsets, LruCache(4), LruCache(4))
+
+    def mock_calendar(self, mock_importlib):
+        calendar = mock_importlib.import_module.return_value.France.return_value
+        calendar.holidays.side_effect = lambda year: [(datetime.date(year, 1, 1), 'New year'), (datetime.date(year, 7, 14), 'Bastille day')]
+
+    def test_get_holidays(self):
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.mock_calendar(mock_importlib)
+            holidays = self.working_days.get_holidays(2021)
+            self.working_days.get_holidays(2021)
+
+        self.assertEqual(holidays[0], (('2021-01-01', 'New year'), ('2021-07-14', 'Bastille day')))
+        self.assertEqual(holidays[1], frozenset(['2021-01-01', '2021-07-14']))
+        mock_importlib.import_module.assert_called_once_with('workalendar.europe.france')
+
+    def test_get_holidays_without_calendar(self):
+        self.country = 'ZZ'
+
+        self.assertEqual(self.working_days.get_holidays(2021), ((), frozenset()))
+        self.assertEqual(self.working_days.get_holidays_bitset(2021), 0)
+
+    def test_get_holidays_calendar_failed(self):
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            mock_importlib.import_module.side_effect = Exception('Test exception')
+
+            self.assertIsNone(self.working_days.get_holidays(2021))
+            self.assertIsNone(self.working_days.get_holidays_bitset(2021))
+
+    def test_check_non_working_days(self):
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.mock_calendar(mock_importlib)
+            days = self.working_days.check_non_working_days([datetime.date(2021, 7, 14), datetime.date(2021, 7, 15)])
+
+        self.assertEqual(days, [True, False])
+        self.assertIsNotNone(self.holiday_bitsets.get('FR', 2021))
+        self.holiday_bitsets.save.assert_called()
+
+    def test_add_and_count_working_days(self):
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.mock_calendar(mock_importlib)
+            # friday 2021-07-09, bastille day on wednesday
+            day = self.working_days.add_working_days(datetime.date(2021, 7, 9), 5)
+            count = self.working_days.count_working_days(datetime.date(2021, 7, 12), datetime.date(2021, 7, 16))
+
+        self.assertEqual(day, datetime.date(2021, 7, 19))
+        self.assertEqual(count, 4)
+        self.assertEqual(self.working_days.add_working_days(datetime.date(2021, 7, 9), 0), datetime.date(2021, 7, 9))
+
+    def test_add_working_days_across_year(self):
+        with patch('backend.workingdays.importlib') as mock_importlib:
+            self.mock_calendar(mock_importlib)
+            day = self.working_days.add_working_days(datetime.date(2021, 12, 31), 1)
+
+        # 2022-01-01 is saturday and holiday
+        self.assertEqual(day, datetime.date(2022, 1, 3))
+
+
+class TestsSunTimes(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.sun_times = SunTimes(LruCache(2))
+        self.position = {'latitude': 52.204, 'longitude': 0.1208}
+
+    def test_is_specified(self):
+        self.assertTrue(SunTimes.is_specified(self.position))
+        self.assertFalse(SunTimes.is_specified({'latitude': 0.0, 'longitude': 0.0}))
+
+    def test_compute_day_unspecified_position(self):
+        self.assertEqual(self.sun_times.compute_day({'latitude': 0.0, 'longitude': 0.0}, pytz.utc), dict.fromkeys(SOLAR_EVENTS_NAMES))
+
+    @patch('backend.suntimes.time.time', Mock(return_value=1591600000))
+    def test_compute_positions_matches_compute_day(self):
+        other = {'latitude': 40.7127, 'longitude': -74.0059}
+        timezones = [pytz.timezone('Europe/London'), pytz.timezone('America/New_York')]
+
+        sun_times = self.sun_times.compute_positions([self.position, {'latitude': 0.0, 'longitude': 0.0}, other], [timezones[0], pytz.utc, timezones[1]])
+
+        self.assertEqual(sun_times[1], dict.fromkeys(SOLAR_EVENTS_NAMES))
+        for computed, position, tz in [(sun_times[0], self.position, timezones[0]), (sun_times[2], other, timezones[1])]:
+            expected = self.sun_times.compute_day(position, tz)
+            for name in SOLAR_EVENTS_NAMES:
+                self.assertAlmostEqual(computed[name], expected[name], delta=1)
+
+    def test_get_days_uses_cached_tables(self):
+        utc_offsets = UtcOffsetCache(pytz.timezone('Europe/London'))
+
+        with patch('backend.suntimes.SunTable', wraps=SunTable) as mock_table:
+            days = self.sun_times.get_days(self.position, datetime.date(2021, 12, 31), datetime.date(2022, 1, 1), utc_offsets)
+            self.sun_times.get_days(self.position, datetime.date(2022, 1, 1), datetime.date(2022, 1, 1), utc_offsets)
 
+        self.assertEqual([day['date'] for day in days], ['2021-12-31', '2022-01-01'])
+        self.assertIn('sunrise_iso', days[0])
+        self.assertEqual(mock_table.call_count, 2)
 
+    def test_format(self):
+        utc_offsets = UtcOffsetCache(pytz.timezone('Europe/Paris'))
+
+        formatted = SunTimes.format({'sunrise': 1591587000.6, 'sunset': None}, utc_offsets)
+
+        self.assertEqual(formatted, {
+            'sunrise': 1591587000,
+            'sunrise_iso': '2020-06-08T05:30:00+02:00',
+            'sunset': None,
+            'sunset_iso': None,
+        })
 
 
 class TestsParametersCountryUpdateEvent(unittest.TestCase):
@@ -745,6 +3251,42 @@ class TestsParametersHostnameUpdateEvent(unittest.TestCase):
 
 
 
+class TestsParametersPositionProgressEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersPositionProgressEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, ['job_id', 'stage', 'progress'])
+
+
+
+
+
+class TestsParametersPositionUpdateEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersPositionUpdateEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, ['job_id', 'status', 'stage', 'position', 'timezone', 'country', 'sun', 'error'])
+
+
+
+
+
 class TestsParametersTimeNowEvent(unittest.TestCase):
 
     def setUp(self):
@@ -763,6 +3305,36 @@ class TestsParametersTimeNowEvent(unittest.TestCase):
 
 
 
+class TestsParametersTimeOffsetChangedEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeOffsetChangedEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, ['timezone', 'offset', 'previous_offset'])
+
+
+class TestsParametersTimeTickEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeTickEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, ['timestamp', 'iso', 'resolutions'])
+
+
 class TestsParametersTimeSunriseEvent(unittest.TestCase):
 
     def setUp(self):
@@ -798,6 +3370,159 @@ class TestsParametersTimeSunsetEvent(unittest.TestCase):
 
 
 
+class TestsParametersTimeAstronomicalDawnEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeAstronomicalDawnEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeNauticalDawnEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeNauticalDawnEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeCivilDawnEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeCivilDawnEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeGoldenHourEndEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeGoldenHourEndEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeSolarNoonEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeSolarNoonEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeGoldenHourStartEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeGoldenHourStartEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeCivilDuskEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeCivilDuskEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeNauticalDuskEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeNauticalDuskEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
+class TestsParametersTimeAstronomicalDuskEvent(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=LOG_LEVEL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        params = { 
+            'internal_bus': Mock(),
+            'formatters_broker': Mock(),
+            'get_external_bus_name': None,
+        }   
+        self.event = ParametersTimeAstronomicalDuskEvent(params)
+
+    def test_event_params(self):
+        self.assertEqual(self.event.EVENT_PARAMS, [])
+
+
+
+
 
 class TestsTimeToMessageFormatter(unittest.TestCase):
 
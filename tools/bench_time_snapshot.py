@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark time payload computation of parameters application
+
+Compare legacy per-call formatting (localize, astimezone, weekday if/elif chain and deepcopy
+of payload for time event) with the per-minute time snapshot shared by time event, get_time
+command and clock device, and pytz conversion with cached UTC offset arithmetic.
+
+Usage:
+    python3 tools/bench_time_snapshot.py [--iterations 100000] [--timezone Europe/Paris]
+"""
+import os
+import sys
+import copy
+import time
+import datetime
+import argparse
+import timeit
+from pytz import utc, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# pylint: disable=wrong-import-position
+from backend.timesnapshot import TimeSnapshot, get_minute_key
+from backend.utcoffsetcache import UtcOffsetCache
+
+SUNS = {"sunrise": 1591588800, "sunset": 1591647300}
+
+
+def legacy_format_time(local_timezone):
+    """
+    Legacy time formatting (previous Parameters.__format_time implementation)
+
+    Args:
+        local_timezone (tzinfo): local timezone
+
+    Returns:
+        dict: time data
+    """
+    utc_now = utc.localize(datetime.datetime.utcnow())
+    local_now = utc_now.astimezone(local_timezone)
+    weekday = local_now.weekday()
+    if weekday == 0:
+        weekday_literal = "monday"
+    elif weekday == 1:
+        weekday_literal = "tuesday"
+    elif weekday == 2:
+        weekday_literal = "wednesday"
+    elif weekday == 3:
+        weekday_literal = "thursday"
+    elif weekday == 4:
+        weekday_literal = "friday"
+    elif weekday == 5:
+        weekday_literal = "saturday"
+    else:
+        weekday_literal = "sunday"
+
+    return {
+        "timestamp": datetime.datetime.timestamp(utc_now),
+        "iso": local_now.isoformat(),
+        "year": local_now.year,
+        "month": local_now.month,
+        "day": local_now.day,
+        "hour": local_now.hour,
+        "minute": local_now.minute,
+        "weekday": weekday,
+        "weekday_literal": weekday_literal,
+    }
+
+
+def legacy_tick(local_timezone):
+    """
+    Legacy time task payload
+    """
+    params = copy.deepcopy(legacy_format_time(local_timezone))
+    params.update({"sunrise": SUNS["sunrise"], "sunset": SUNS["sunset"]})
+    return params
+
+
+def legacy_call(local_timezone):
+    """
+    Legacy get_time/get_module_devices payload
+    """
+    return legacy_format_time(local_timezone)
+
+
+def snapshot_tick(utc_offsets):
+    """
+    Time task payload using snapshot (always rebuilt)
+    """
+    return TimeSnapshot(
+        datetime.datetime.utcnow(), utc_offsets, SUNS["sunrise"], SUNS["sunset"]
+    ).event
+
+
+def snapshot_call(snapshot_holder, utc_offsets):
+    """
+    get_time/get_module_devices payload using snapshot (reused during the minute)
+    """
+    utc_now = datetime.datetime.utcnow()
+    snapshot = snapshot_holder[0]
+    if not snapshot.is_valid(
+        get_minute_key(utc_now), utc_offsets, SUNS["sunrise"], SUNS["sunset"]
+    ):
+        snapshot = TimeSnapshot(utc_now, utc_offsets, SUNS["sunrise"], SUNS["sunset"])
+        snapshot_holder[0] = snapshot
+    return snapshot.time
+
+
+def run(iterations, timezone_name):
+    """
+    Run benchmark
+
+    Args:
+        iterations (int): number of iterations per measure
+        timezone_name (str): local timezone name
+    """
+    local_timezone = timezone(timezone_name)
+    utc_offsets = UtcOffsetCache(local_timezone)
+    holder = [TimeSnapshot(datetime.datetime.utcnow(), utc_offsets, 0, 0)]
+    timestamp = time.time()
+
+    measures = {
+        "tick legacy": lambda: legacy_tick(local_timezone),
+        "tick snapshot": lambda: snapshot_tick(utc_offsets),
+        "call legacy": lambda: legacy_call(local_timezone),
+        "call snapshot": lambda: snapshot_call(holder, utc_offsets),
+        "local pytz": lambda: datetime.datetime.fromtimestamp(
+            timestamp, utc
+        ).astimezone(local_timezone),
+        "local offsets": lambda: utc_offsets.to_local(timestamp),
+    }
+    results = {}
+    for name, func in measures.items():
+        duration = min(timeit.repeat(func, number=iterations, repeat=3))
+        results[name] = duration / iterations * 1000000
+        print(f"{name:<15} {results[name]:8.2f} us")
+
+    print(f"tick speedup    {results['tick legacy'] / results['tick snapshot']:8.1f}x")
+    print(f"call speedup    {results['call legacy'] / results['call snapshot']:8.1f}x")
+    print(f"local speedup   {results['local pytz'] / results['local offsets']:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark time snapshot")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--timezone", default="Europe/Paris")
+    args = parser.parse_args()
+    run(args.iterations, args.timezone)
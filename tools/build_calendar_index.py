@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Build country calendars index used by parameters application (backend/calendarindex.py)
+
+Index maps each ISO alpha2 country code to the workalendar module and class of its
+calendar, so parameters application imports only the needed calendar module. Weekend days
+of each calendar are also stored, so working days are computed without importing calendar.
+Index is built from workalendar ISO registry and must be rebuilt when workalendar is
+upgraded.
+
+Usage:
+    python3 tools/build_calendar_index.py [--output backend/calendarindex.py]
+"""
+import os
+import argparse
+import workalendar
+from workalendar.registry import registry
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "backend", "calendarindex.py"
+)
+HEADER = '''#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# generated by tools/build_calendar_index.py, do not edit
+
+WORKALENDAR_VERSION = "{version}"
+# country alpha2: (workalendar module, calendar class, weekend days (0 is monday))
+CALENDARS = {{
+'''
+
+
+def build(output):
+    """
+    Build index file
+
+    Args:
+        output (str): index file path
+    """
+    calendars = {
+        code: (
+            calendar.__module__,
+            calendar.__name__,
+            tuple(sorted(calendar().get_weekend_days())),
+        )
+        for code, calendar in registry.get_calendars().items()
+        # subdivisions (US-CA...) are not handled
+        if len(code) == 2
+    }
+
+    content = HEADER.format(version=workalendar.__version__)
+    for code in sorted(calendars):
+        module_name, class_name, weekend_days = calendars[code]
+        content += f'    "{code}": ("{module_name}", "{class_name}", {weekend_days}),\n'
+    content += "}\n"
+
+    with open(output, "w", encoding="utf-8") as index_file:
+        index_file.write(content)
+    print(f"Index written to {output} ({len(calendars)} countries)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build parameters calendar index")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Index file path")
+    args = parser.parse_args()
+
+    build(args.output)
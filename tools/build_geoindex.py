@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Build geographic grid index used by parameters application (backend/geoindex.bin)
+
+Each tile is sampled at its center and near its corners with timezonefinder and
+reverse_geocode. Tile is flagged as border tile if samples do not agree, in this case
+parameters application falls back to polygon search at runtime.
+
+An accuracy report comparing index results with timezonefinder and reverse_geocode on
+random positions is displayed at end of build.
+
+Usage:
+    python3 tools/build_geoindex.py [--resolution 0.25] [--output backend/geoindex.bin]
+                                    [--samples 20000] [--report report.json]
+"""
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import reverse_geocode
+from timezonefinder import TimezoneFinder
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.geoindex import GeoIndex  # pylint: disable=wrong-import-position
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "backend", "geoindex.bin"
+)
+# sample offsets inside a tile (ratio of tile size): center and near corners
+SAMPLE_OFFSETS = [(0.5, 0.5), (0.1, 0.1), (0.1, 0.9), (0.9, 0.1), (0.9, 0.9)]
+
+
+def tile_samples(row, col, resolution):
+    """
+    Return sample positions of specified tile
+
+    Args:
+        row (int): tile row (0 is north)
+        col (int): tile column (0 is west)
+        resolution (float): tile size in degrees
+
+    Returns:
+        list: list of (latitude, longitude) tuples
+    """
+    north = 90.0 - row * resolution
+    west = -180.0 + col * resolution
+    return [
+        (north - lat_ratio * resolution, west + lng_ratio * resolution)
+        for lat_ratio, lng_ratio in SAMPLE_OFFSETS
+    ]
+
+
+def build(resolution, output):
+    """
+    Build index file
+
+    Args:
+        resolution (float): tile size in degrees
+        output (str): index file path
+    """
+    finder = TimezoneFinder(in_memory=True)
+    cols = int(round(360.0 / resolution))
+    rows = int(round(180.0 / resolution))
+    timezones = {}
+    countries = {}
+    cells = []
+    borders = 0
+
+    start = time.time()
+    for row in range(rows):
+        samples = [
+            sample for col in range(cols) for sample in tile_samples(row, col, resolution)
+        ]
+        geos = reverse_geocode.search(samples)
+
+        for col in range(cols):
+            first = col * len(SAMPLE_OFFSETS)
+            tile_timezones = [
+                finder.timezone_at(lat=latitude, lng=longitude)
+                for latitude, longitude in samples[first : first + len(SAMPLE_OFFSETS)]
+            ]
+            tile_countries = [
+                (geo["country_code"], geo["country"])
+                for geo in geos[first : first + len(SAMPLE_OFFSETS)]
+            ]
+
+            # first sample is tile center
+            center_timezone = tile_timezones[0]
+            center_country = tile_countries[0]
+            border = (
+                len(set(tile_timezones)) > 1
+                or len(set(tile_countries)) > 1
+                or center_timezone is None
+            )
+            borders += 1 if border else 0
+
+            timezone_index = None
+            if center_timezone is not None:
+                timezone_index = timezones.setdefault(center_timezone, len(timezones))
+            country_index = countries.setdefault(center_country, len(countries))
+            cells.append((timezone_index, country_index, border))
+
+        if row % 20 == 0:
+            print(f"Row {row}/{rows} ({time.time() - start:.0f}s)")
+
+    GeoIndex.write(
+        output,
+        resolution,
+        sorted(timezones, key=timezones.get),
+        sorted(countries, key=countries.get),
+        cells,
+    )
+    print(
+        f"Index written to {output} ({os.path.getsize(output)} bytes, "
+        f"{borders}/{len(cells)} border tiles) in {time.time() - start:.0f}s"
+    )
+
+
+def report(index_path, samples_count, report_path=None):
+    """
+    Compare index results with timezonefinder and reverse_geocode on random positions
+
+    Args:
+        index_path (str): index file path
+        samples_count (int): number of random positions to check
+        report_path (str, optional): json file to write report to
+    """
+    finder = TimezoneFinder(in_memory=True)
+    index = GeoIndex(index_path)
+    index.load()
+    rand = random.Random(0)
+    positions = [
+        (rand.uniform(-89.9, 89.9), rand.uniform(-179.9, 179.9))
+        for _ in range(samples_count)
+    ]
+
+    start = time.perf_counter()
+    results = [index.lookup(latitude, longitude) for latitude, longitude in positions]
+    index_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    geos = reverse_geocode.search(positions)
+    expected_timezones = [
+        finder.timezone_at(lat=latitude, lng=longitude)
+        for latitude, longitude in positions
+    ]
+    libs_duration = time.perf_counter() - start
+
+    stats = {
+        "samples": samples_count,
+        "border": 0,
+        "timezone_match": 0,
+        "timezone_mismatch": 0,
+        "country_match": 0,
+        "country_mismatch": 0,
+    }
+    for result, geo, expected_timezone in zip(results, geos, expected_timezones):
+        if result["border"]:
+            stats["border"] += 1
+            continue
+        key = "match" if result["timezone"] == expected_timezone else "mismatch"
+        stats[f"timezone_{key}"] += 1
+        alpha2 = result["country"]["alpha2"] if result["country"] else None
+        key = "match" if alpha2 == geo["country_code"] else "mismatch"
+        stats[f"country_{key}"] += 1
+
+    resolved = samples_count - stats["border"]
+    stats["border_ratio"] = stats["border"] / samples_count
+    stats["timezone_accuracy"] = stats["timezone_match"] / resolved if resolved else 0
+    stats["country_accuracy"] = stats["country_match"] / resolved if resolved else 0
+    stats["index_lookup_us"] = index_duration / samples_count * 1000000
+    stats["libs_lookup_us"] = libs_duration / samples_count * 1000000
+
+    print(json.dumps(stats, indent=4))
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(stats, report_file, indent=4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build parameters geo index")
+    parser.add_argument(
+        "--resolution", type=float, default=0.25, help="Tile size in degrees"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Index file path")
+    parser.add_argument(
+        "--samples", type=int, default=20000, help="Number of positions for report"
+    )
+    parser.add_argument("--report", default=None, help="Write report to json file")
+    parser.add_argument(
+        "--report-only", action="store_true", help="Only check existing index"
+    )
+    args = parser.parse_args()
+
+    if not args.report_only:
+        build(args.resolution, args.output)
+    report(args.output, args.samples, args.report)